@@ -4,12 +4,12 @@ from alembic import context
 import os
 import sys
 
-# Add the app directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "src")))
 
-from app.models.base import Base  # noqa: E402
+from tikethet.models.base import Base  # noqa: E402
 # Import all models to ensure they're registered with SQLAlchemy metadata
-from app.models import *  # noqa: E402, F403
+from tikethet.models import *  # noqa: E402, F403
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
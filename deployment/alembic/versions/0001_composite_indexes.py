@@ -0,0 +1,69 @@
+"""Composite and partial indexes for hot ticket/message queries
+
+Таблицы создаются через Base.metadata.create_all, поэтому миграция
+использует IF NOT EXISTS и безопасна для уже развернутых баз.
+Индексы строятся CONCURRENTLY, чтобы не блокировать запись в таблицы.
+
+Revision ID: 0001_composite_indexes
+Revises:
+Create Date: 2024-09-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_composite_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+ACTIVE_STATUSES = "status IN ('OPEN', 'IN_PROGRESS', 'WAITING_RESPONSE')"
+
+# (имя индекса, таблица, колонки, условие частичного индекса)
+INDEXES = [
+    # get_user_tickets: WHERE user_id = ? ORDER BY created_at DESC
+    ("ix_tickets_user_id_created_at", "tickets", "user_id, created_at DESC", None),
+    # get_assigned_tickets: WHERE assigned_to = ? [AND status = ?] ORDER BY priority, created_at
+    (
+        "ix_tickets_assigned_status_priority_created",
+        "tickets",
+        "assigned_to, status, priority, created_at",
+        None,
+    ),
+    # Очередь персонала: только активные тикеты, ORDER BY priority DESC, created_at DESC
+    (
+        "ix_tickets_active_priority_created",
+        "tickets",
+        "priority DESC, created_at DESC",
+        ACTIVE_STATUSES,
+    ),
+    # Счетчики активных тикетов пользователя (/status)
+    ("ix_tickets_active_user_status", "tickets", "user_id, status", ACTIVE_STATUSES),
+    # get_ticket_messages: WHERE ticket_id = ? ORDER BY created_at
+    ("ix_messages_ticket_id_created_at", "messages", "ticket_id, created_at", None),
+    # Непрочитанные уведомления пользователя
+    (
+        "ix_notifications_user_unread",
+        "notifications",
+        "user_id, created_at DESC",
+        "is_read = false",
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            sql = f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            op.execute(sa.text(sql))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _table, _columns, _where in reversed(INDEXES):
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
@@ -0,0 +1,49 @@
+"""Hot/cold split for tickets: active staff queue and archive indexes
+
+Очередь персонала и get_assigned_tickets читают только активные тикеты
+через частичные индексы, история (RESOLVED/CLOSED) - через отдельный
+архивный индекс по closed_at.
+
+Revision ID: 0002_active_queue_indexes
+Revises: 0001_composite_indexes
+Create Date: 2024-09-21 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_active_queue_indexes'
+down_revision = '0001_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    (
+        "ix_tickets_active_assigned",
+        "assigned_to, priority DESC, created_at DESC",
+        "status IN ('OPEN', 'IN_PROGRESS', 'WAITING_RESPONSE')",
+    ),
+    (
+        "ix_tickets_archive_closed_at",
+        "closed_at DESC",
+        "status IN ('RESOLVED', 'CLOSED')",
+    ),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.execute(sa.text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON tickets ({columns}) WHERE {where}"
+            ))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _columns, _where in reversed(INDEXES):
+            op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
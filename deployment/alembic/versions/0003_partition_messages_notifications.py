@@ -0,0 +1,142 @@
+"""Monthly range partitioning of messages and notifications by created_at
+
+Таблицы пересоздаются как партиционированные (PARTITION BY RANGE created_at),
+данные переносятся в месячные партиции. Первичный ключ становится
+(id, created_at) - ключ партиционирования обязан входить в уникальные
+ограничения. Дальнейшие партиции создает PartitionService при старте
+приложения и раз в сутки.
+
+Миграция переписывает таблицы целиком - выполняйте в окно обслуживания.
+
+Revision ID: 0003_partition_messages
+Revises: 0002_active_queue_indexes
+Create Date: 2024-09-25 12:00:00.000000
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_partition_messages'
+down_revision = '0002_active_queue_indexes'
+branch_labels = None
+depends_on = None
+
+
+# Сколько месяцев вперед создавать партиции сразу
+MONTHS_AHEAD = 3
+
+TABLES = {
+    "messages": {
+        "foreign_keys": [
+            ("messages_ticket_id_fkey", "ticket_id", "tickets", "CASCADE"),
+            ("messages_user_id_fkey", "user_id", "users", "CASCADE"),
+        ],
+        "indexes": [
+            ("ix_messages_id", "id", None),
+            ("ix_messages_ticket_id", "ticket_id", None),
+            ("ix_messages_user_id", "user_id", None),
+            ("ix_messages_created_at", "created_at", None),
+            ("ix_messages_ticket_id_created_at", "ticket_id, created_at", None),
+        ],
+    },
+    "notifications": {
+        "foreign_keys": [
+            ("notifications_user_id_fkey", "user_id", "users", "CASCADE"),
+            ("notifications_ticket_id_fkey", "ticket_id", "tickets", "CASCADE"),
+        ],
+        "indexes": [
+            ("ix_notifications_id", "id", None),
+            ("ix_notifications_user_id", "user_id", None),
+            ("ix_notifications_ticket_id", "ticket_id", None),
+            ("ix_notifications_type", "type", None),
+            ("ix_notifications_is_read", "is_read", None),
+            ("ix_notifications_created_at", "created_at", None),
+            ("ix_notifications_user_unread", "user_id, created_at DESC", "is_read = false"),
+        ],
+    },
+}
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    """Начало месяца, смещенного на months от moment."""
+    month_index = moment.year * 12 + (moment.month - 1) + months
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _create_month_partitions(table: str, first_month: datetime, last_month: datetime) -> None:
+    """Создание месячных партиций от first_month до last_month включительно."""
+    month = first_month
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(sa.text(
+            f"CREATE TABLE IF NOT EXISTS {table}_y{month:%Y}m{month:%m} "
+            f"PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        ))
+        month = next_month
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    current_month = _add_months(datetime.now(timezone.utc), 0)
+
+    for table, spec in TABLES.items():
+        legacy = f"{table}_legacy"
+
+        op.execute(sa.text(f"ALTER TABLE {table} RENAME TO {legacy}"))
+        op.execute(sa.text(
+            f"CREATE TABLE {table} (LIKE {legacy} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS) "
+            f"PARTITION BY RANGE (created_at)"
+        ))
+
+        # Партиции покрывают всю существующую историю и несколько месяцев вперед
+        oldest = conn.execute(sa.text(f"SELECT min(created_at) FROM {legacy}")).scalar()
+        first_month = _add_months(oldest.astimezone(timezone.utc), 0) if oldest else current_month
+        _create_month_partitions(table, first_month, _add_months(current_month, MONTHS_AHEAD))
+
+        op.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {legacy}"))
+        op.execute(sa.text(f"DROP TABLE {legacy}"))
+
+        op.execute(sa.text(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, created_at)"
+        ))
+        for name, column, ref_table, on_delete in spec["foreign_keys"]:
+            op.execute(sa.text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {ref_table} (id) ON DELETE {on_delete}"
+            ))
+        for name, columns, where in spec["indexes"]:
+            sql = f"CREATE INDEX {name} ON {table} ({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            op.execute(sa.text(sql))
+
+
+def downgrade() -> None:
+    for table, spec in TABLES.items():
+        partitioned = f"{table}_partitioned"
+
+        op.execute(sa.text(f"ALTER TABLE {table} RENAME TO {partitioned}"))
+        op.execute(sa.text(
+            f"CREATE TABLE {table} (LIKE {partitioned} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)"
+        ))
+        op.execute(sa.text(f"INSERT INTO {table} SELECT * FROM {partitioned}"))
+        op.execute(sa.text(f"DROP TABLE {partitioned} CASCADE"))
+
+        op.execute(sa.text(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)"))
+        for name, column, ref_table, on_delete in spec["foreign_keys"]:
+            op.execute(sa.text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {ref_table} (id) ON DELETE {on_delete}"
+            ))
+        for name, columns, where in spec["indexes"]:
+            sql = f"CREATE INDEX {name} ON {table} ({columns})"
+            if where:
+                sql += f" WHERE {where}"
+            op.execute(sa.text(sql))
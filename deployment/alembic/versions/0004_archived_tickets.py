@@ -0,0 +1,39 @@
+"""Cold-storage archive index for closed tickets
+
+Revision ID: 0004_archived_tickets
+Revises: 0003_partition_messages
+Create Date: 2024-09-28 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_archived_tickets'
+down_revision = '0003_partition_messages'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_tickets",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False, comment="ID автора тикета"),
+        sa.Column("assigned_to", postgresql.UUID(as_uuid=True), nullable=True, comment="ID назначенного сотрудника"),
+        sa.Column("closed_at", sa.DateTime(timezone=True), nullable=True, comment="Дата закрытия тикета"),
+        sa.Column("segment", sa.String(255), nullable=False, comment="Имя файла сегмента"),
+        sa.Column("offset", sa.BigInteger(), nullable=False, comment="Смещение gzip-записи в сегменте"),
+        sa.Column("length", sa.Integer(), nullable=False, comment="Длина gzip-записи в байтах"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_archived_tickets_id", "archived_tickets", ["id"])
+    op.create_index("ix_archived_tickets_user_id", "archived_tickets", ["user_id"])
+    op.create_index("ix_archived_tickets_created_at", "archived_tickets", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("archived_tickets")
@@ -0,0 +1,39 @@
+"""Materialized support metrics summary
+
+Revision ID: 0005_metrics_summary
+Revises: 0004_archived_tickets
+Create Date: 2024-10-05 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_metrics_summary'
+down_revision = '0004_archived_tickets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metrics_summary",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("name", sa.String(64), nullable=False, comment="Имя метрики (first_response_minutes_p50, backlog, ...)"),
+        sa.Column("dimension", sa.String(32), nullable=False, comment="Разрез: total, assignee"),
+        sa.Column("dimension_value", sa.String(64), nullable=True, comment="Значение разреза (ID сотрудника)"),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=True, comment="Начало дня для временных рядов"),
+        sa.Column("value", sa.Float(), nullable=False, comment="Значение метрики"),
+        sa.Column("window_days", sa.Integer(), nullable=False, comment="Окно расчета в днях"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_metrics_summary_id", "metrics_summary", ["id"])
+    op.create_index("ix_metrics_summary_created_at", "metrics_summary", ["created_at"])
+    op.create_index("ix_metrics_summary_name_dimension", "metrics_summary", ["name", "dimension", "bucket"])
+
+
+def downgrade() -> None:
+    op.drop_table("metrics_summary")
@@ -0,0 +1,50 @@
+"""Hourly and daily ticket rollups
+
+Revision ID: 0006_ticket_rollups
+Revises: 0005_metrics_summary
+Create Date: 2024-10-06 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_ticket_rollups'
+down_revision = '0005_metrics_summary'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticket_rollups",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("granularity", sa.String(8), nullable=False, comment="Гранулярность корзины: hour, day"),
+        sa.Column("bucket", sa.DateTime(timezone=True), nullable=False, comment="Начало корзины (UTC)"),
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), nullable=False, comment="ID категории"),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(name="ticketpriority", create_type=False),
+            nullable=False,
+            comment="Приоритет тикета"
+        ),
+        sa.Column("assigned_to", postgresql.UUID(as_uuid=True), nullable=False, comment="ID исполнителя (UNASSIGNED_ID - не назначен)"),
+        sa.Column("created_count", sa.Integer(), nullable=False, server_default="0", comment="Создано тикетов"),
+        sa.Column("resolved_count", sa.Integer(), nullable=False, server_default="0", comment="Решено тикетов"),
+        sa.Column("closed_count", sa.Integer(), nullable=False, server_default="0", comment="Закрыто тикетов"),
+        sa.Column("reopened_count", sa.Integer(), nullable=False, server_default="0", comment="Открыто повторно"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint(
+            "granularity", "bucket", "category_id", "priority", "assigned_to",
+            name="uq_ticket_rollups_key"
+        ),
+    )
+    op.create_index("ix_ticket_rollups_id", "ticket_rollups", ["id"])
+    op.create_index("ix_ticket_rollups_created_at", "ticket_rollups", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("ticket_rollups")
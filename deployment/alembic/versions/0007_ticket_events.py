@@ -0,0 +1,98 @@
+"""Append-only ticket event history
+
+Revision ID: 0007_ticket_events
+Revises: 0006_ticket_rollups
+Create Date: 2024-10-08 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_ticket_events'
+down_revision = '0006_ticket_rollups'
+branch_labels = None
+depends_on = None
+
+
+EVENT_TYPES = ("CREATED", "STATUS_CHANGED", "ASSIGNED", "FIRST_RESPONSE")
+
+
+def upgrade() -> None:
+    event_type = postgresql.ENUM(*EVENT_TYPES, name="ticketeventtype")
+    event_type.create(op.get_bind(), checkfirst=True)
+
+    ticket_status = postgresql.ENUM(name="ticketstatus", create_type=False)
+
+    op.create_table(
+        "ticket_events",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("ticket_id", postgresql.UUID(as_uuid=True), nullable=False, comment="ID тикета"),
+        sa.Column(
+            "event_type",
+            postgresql.ENUM(name="ticketeventtype", create_type=False),
+            nullable=False,
+            comment="Тип события"
+        ),
+        sa.Column("from_status", ticket_status, nullable=True, comment="Статус до события"),
+        sa.Column("to_status", ticket_status, nullable=True, comment="Статус после события"),
+        sa.Column("actor_id", postgresql.UUID(as_uuid=True), nullable=True, comment="ID пользователя, вызвавшего событие"),
+        sa.Column("assigned_to", postgresql.UUID(as_uuid=True), nullable=True, comment="ID исполнителя после события"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_ticket_events_id", "ticket_events", ["id"])
+    op.create_index("ix_ticket_events_created_at", "ticket_events", ["created_at"])
+    op.create_index("ix_ticket_events_ticket_created", "ticket_events", ["ticket_id", "created_at"])
+    op.create_index("ix_ticket_events_type_created", "ticket_events", ["event_type", "created_at"])
+    op.create_index(
+        "uq_ticket_events_first_response",
+        "ticket_events",
+        ["ticket_id"],
+        unique=True,
+        postgresql_where=sa.text("event_type = 'FIRST_RESPONSE'")
+    )
+
+    # Начальная история существующих тикетов: создание, текущий статус
+    # и первый ответ персонала
+    op.execute(
+        """
+        INSERT INTO ticket_events (id, ticket_id, event_type, to_status, actor_id, created_at, updated_at)
+        SELECT gen_random_uuid(), t.id, 'CREATED', 'OPEN', t.user_id, t.created_at, t.created_at
+        FROM tickets t
+        """
+    )
+    # Промежуточные переходы неизвестны: текущий статус считается
+    # установленным в момент завершения (или последнего изменения)
+    op.execute(
+        """
+        INSERT INTO ticket_events (id, ticket_id, event_type, from_status, to_status, created_at, updated_at)
+        SELECT
+            gen_random_uuid(), t.id, 'STATUS_CHANGED', 'OPEN', t.status,
+            GREATEST(COALESCE(t.closed_at, t.updated_at), t.created_at),
+            GREATEST(COALESCE(t.closed_at, t.updated_at), t.created_at)
+        FROM tickets t
+        WHERE t.status <> 'OPEN'
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO ticket_events (id, ticket_id, event_type, actor_id, created_at, updated_at)
+        SELECT DISTINCT ON (m.ticket_id)
+            gen_random_uuid(), m.ticket_id, 'FIRST_RESPONSE', m.user_id, m.created_at, m.created_at
+        FROM messages m
+        JOIN tickets t ON t.id = m.ticket_id
+        JOIN users u ON u.id = m.user_id
+        WHERE NOT m.is_internal
+          AND m.user_id <> t.user_id
+          AND u.role <> 'USER'
+        ORDER BY m.ticket_id, m.created_at
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ticket_events")
+    postgresql.ENUM(name="ticketeventtype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,36 @@
+"""SLA breach ticket event
+
+Revision ID: 0008_sla_breach_event
+Revises: 0007_ticket_events
+Create Date: 2024-10-09 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_sla_breach_event'
+down_revision = '0007_ticket_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Новое значение enum нельзя использовать в транзакции, которая его добавила
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE ticketeventtype ADD VALUE IF NOT EXISTS 'SLA_BREACHED'")
+
+    op.create_index(
+        "uq_ticket_events_sla_breach",
+        "ticket_events",
+        ["ticket_id"],
+        unique=True,
+        postgresql_where=sa.text("event_type = 'SLA_BREACHED'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_ticket_events_sla_breach", table_name="ticket_events")
+    op.execute("DELETE FROM ticket_events WHERE event_type = 'SLA_BREACHED'")
+    # Значение enum в PostgreSQL не удаляется; неиспользуемое значение безвредно
@@ -0,0 +1,48 @@
+"""Staff category skills for automatic ticket routing
+
+Revision ID: 0009_staff_category_skills
+Revises: 0008_sla_breach_event
+Create Date: 2024-10-10 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_staff_category_skills'
+down_revision = '0008_sla_breach_event'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "staff_category_skills",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+            comment="ID сотрудника"
+        ),
+        sa.Column(
+            "category_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("categories.id", ondelete="CASCADE"),
+            nullable=False,
+            comment="ID категории"
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("user_id", "category_id", name="uq_staff_category_skills_user_category"),
+    )
+    op.create_index("ix_staff_category_skills_id", "staff_category_skills", ["id"])
+    op.create_index("ix_staff_category_skills_created_at", "staff_category_skills", ["created_at"])
+    op.create_index("ix_staff_category_skills_category_id", "staff_category_skills", ["category_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("staff_category_skills")
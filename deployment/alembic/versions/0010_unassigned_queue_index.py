@@ -0,0 +1,38 @@
+"""Partial index for claiming the next unassigned ticket
+
+claim-next выбирает самый приоритетный и самый старый тикет без
+исполнителя; частичный индекс содержит только такие строки и
+позволяет FOR UPDATE SKIP LOCKED пройти по нему без сортировки.
+
+Revision ID: 0010_unassigned_queue_index
+Revises: 0009_staff_category_skills
+Create Date: 2024-10-11 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_unassigned_queue_index'
+down_revision = '0009_staff_category_skills'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = "ix_tickets_unassigned_priority_created"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            f"ON tickets (priority DESC, created_at) "
+            f"WHERE assigned_to IS NULL "
+            f"AND status IN ('OPEN', 'IN_PROGRESS', 'WAITING_RESPONSE')"
+        ))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
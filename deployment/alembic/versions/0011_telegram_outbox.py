@@ -0,0 +1,46 @@
+"""Telegram outbox for rate-limited notification delivery
+
+Revision ID: 0011_telegram_outbox
+Revises: 0010_unassigned_queue_index
+Create Date: 2024-10-12 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_telegram_outbox'
+down_revision = '0010_unassigned_queue_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "telegram_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("chat_id", sa.BigInteger(), nullable=False, comment="Telegram chat ID получателя"),
+        sa.Column("text", sa.Text(), nullable=False, comment="Текст сообщения (HTML)"),
+        sa.Column("lane", sa.SmallInteger(), nullable=False, server_default="1", comment="Полоса приоритета: 0 - critical, 1 - normal, 2 - bulk"),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending", comment="Статус: pending, sent, failed"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0", comment="Количество попыток отправки"),
+        sa.Column("not_before", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False, comment="Не отправлять раньше (повтор, retry-after, аренда)"),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True, comment="Время доставки"),
+        sa.Column("last_error", sa.Text(), nullable=True, comment="Последняя ошибка отправки"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_telegram_outbox_id", "telegram_outbox", ["id"])
+    op.create_index("ix_telegram_outbox_created_at", "telegram_outbox", ["created_at"])
+    op.create_index(
+        "ix_telegram_outbox_pending",
+        "telegram_outbox",
+        ["lane", "not_before"],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("telegram_outbox")
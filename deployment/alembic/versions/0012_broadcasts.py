@@ -0,0 +1,49 @@
+"""Resumable mass broadcasts
+
+Revision ID: 0012_broadcasts
+Revises: 0011_telegram_outbox
+Create Date: 2024-10-13 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_broadcasts'
+down_revision = '0011_telegram_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "broadcasts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), nullable=True, comment="ID администратора"),
+        sa.Column("admin_chat_id", sa.BigInteger(), nullable=False, comment="Чат для отчета о прогрессе"),
+        sa.Column("progress_message_id", sa.BigInteger(), nullable=True, comment="ID сообщения с прогрессом (редактируется)"),
+        sa.Column("text", sa.Text(), nullable=False, comment="Текст рассылки (HTML)"),
+        sa.Column("status", sa.String(16), nullable=False, server_default="running", comment="Статус: running, completed, cancelled"),
+        sa.Column("last_user_id", postgresql.UUID(as_uuid=True), nullable=True, comment="Контрольная точка: последний обработанный users.id"),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0", comment="Получателей на момент запуска"),
+        sa.Column("sent_count", sa.Integer(), nullable=False, server_default="0", comment="Доставлено"),
+        sa.Column("failed_count", sa.Integer(), nullable=False, server_default="0", comment="Не доставлено"),
+        sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True, comment="Последняя контрольная точка исполнителя (аренда)"),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True, comment="Время завершения"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_broadcasts_id", "broadcasts", ["id"])
+    op.create_index("ix_broadcasts_created_at", "broadcasts", ["created_at"])
+    op.create_index(
+        "ix_broadcasts_running",
+        "broadcasts",
+        ["heartbeat_at"],
+        postgresql_where=sa.text("status = 'running'")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("broadcasts")
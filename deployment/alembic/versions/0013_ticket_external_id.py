@@ -0,0 +1,43 @@
+"""Idempotency key for tickets created from bot messages
+
+Тикет быстрого обращения создается из сообщения Telegram; повторная
+доставка того же обновления находит существующий тикет по
+external_id вместо создания дубликата.
+
+Revision ID: 0013_ticket_external_id
+Revises: 0012_broadcasts
+Create Date: 2024-10-14 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_ticket_external_id'
+down_revision = '0012_broadcasts'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = "uq_tickets_external_id"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tickets",
+        sa.Column("external_id", sa.String(64), nullable=True, comment="Ключ дедупликации тикетов из бота"),
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} "
+            f"ON tickets (external_id) WHERE external_id IS NOT NULL"
+        ))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}"))
+
+    op.drop_column("tickets", "external_id")
@@ -0,0 +1,62 @@
+"""Deduplicated attachment storage
+
+Файлы вложений хранятся по SHA-256 содержимого; идентификаторы
+Telegram позволяют не скачивать известный файл повторно и отправлять
+его по file_id. Исходящее сообщение outbox может ссылаться на файл.
+
+Revision ID: 0014_stored_files
+Revises: 0013_ticket_external_id
+Create Date: 2024-10-15 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0014_stored_files'
+down_revision = '0013_ticket_external_id'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "stored_files",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("sha256", sa.String(64), nullable=False, comment="SHA-256 содержимого (hex)"),
+        sa.Column("size", sa.BigInteger(), nullable=False, comment="Размер в байтах"),
+        sa.Column("content_type", sa.String(100), nullable=False, server_default="application/octet-stream", comment="MIME тип"),
+        sa.Column("path", sa.String(255), nullable=False, comment="Путь относительно каталога загрузок"),
+        sa.Column("telegram_file_id", sa.String(255), nullable=True, comment="file_id для повторной отправки ботом"),
+        sa.Column("telegram_file_unique_id", sa.String(64), nullable=True, comment="file_unique_id Telegram (постоянный для содержимого)"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint("sha256", name="stored_files_sha256_key"),
+    )
+    op.create_index("ix_stored_files_id", "stored_files", ["id"])
+    op.create_index("ix_stored_files_created_at", "stored_files", ["created_at"])
+    op.create_index(
+        "uq_stored_files_telegram_file_unique_id",
+        "stored_files",
+        ["telegram_file_unique_id"],
+        unique=True,
+        postgresql_where=sa.text("telegram_file_unique_id IS NOT NULL")
+    )
+
+    op.add_column(
+        "telegram_outbox",
+        sa.Column(
+            "stored_file_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("stored_files.id", ondelete="SET NULL"),
+            nullable=True,
+            comment="Отправляемый файл (вместо текстового сообщения)"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("telegram_outbox", "stored_file_id")
+    op.drop_table("stored_files")
@@ -0,0 +1,37 @@
+"""Uploader of stored attachment files
+
+Отправка сохраненного файла ботом разрешена только для файлов,
+загруженных участниками тикета; uploaded_by записывает сервер.
+
+Revision ID: 0015_stored_file_uploader
+Revises: 0014_stored_files
+Create Date: 2024-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0015_stored_file_uploader'
+down_revision = '0014_stored_files'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "stored_files",
+        sa.Column(
+            "uploaded_by",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+            comment="Пользователь, впервые загрузивший содержимое"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("stored_files", "uploaded_by")
@@ -0,0 +1,42 @@
+"""Archive index by completion time
+
+Решенные (RESOLVED) тикеты не имеют closed_at и при сортировке
+closed_at DESC попадали в начало архива в произвольном порядке. Архив
+сортируется по coalesce(closed_at, updated_at) DESC, id DESC;
+индекс заменяется на соответствующий.
+
+Revision ID: 0016_archive_finished_at_index
+Revises: 0015_stored_file_uploader
+Create Date: 2024-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0016_archive_finished_at_index'
+down_revision = '0015_stored_file_uploader'
+branch_labels = None
+depends_on = None
+
+
+ARCHIVE_WHERE = "status IN ('RESOLVED', 'CLOSED')"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_archive_finished_at "
+            f"ON tickets ((coalesce(closed_at, updated_at)) DESC, id DESC) WHERE {ARCHIVE_WHERE}"
+        ))
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_tickets_archive_closed_at"))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tickets_archive_closed_at "
+            f"ON tickets (closed_at DESC) WHERE {ARCHIVE_WHERE}"
+        ))
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_tickets_archive_finished_at"))
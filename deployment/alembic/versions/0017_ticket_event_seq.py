@@ -0,0 +1,58 @@
+"""Monotonic order of ticket events
+
+События одной транзакции (ASSIGNED и STATUS_CHANGED) получают одинаковый
+now(); при сортировке по случайному UUID их порядок в хронологии
+менялся. seq (identity) задает порядок записи, индекс хронологии
+дополняется им.
+
+Revision ID: 0017_ticket_event_seq
+Revises: 0016_archive_finished_at_index
+Create Date: 2024-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0017_ticket_event_seq'
+down_revision = '0016_archive_finished_at_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "ticket_events",
+        sa.Column(
+            "seq",
+            sa.BigInteger(),
+            sa.Identity(),
+            nullable=False,
+            comment="Порядок записи (при равном created_at)"
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ticket_events_ticket_created_seq "
+            "ON ticket_events (ticket_id, created_at, seq)"
+        ))
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_ticket_events_ticket_created"))
+        op.execute(sa.text(
+            "ALTER INDEX ix_ticket_events_ticket_created_seq RENAME TO ix_ticket_events_ticket_created"
+        ))
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(sa.text(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_ticket_events_ticket_created_old "
+            "ON ticket_events (ticket_id, created_at)"
+        ))
+        op.execute(sa.text("DROP INDEX CONCURRENTLY IF EXISTS ix_ticket_events_ticket_created"))
+        op.execute(sa.text(
+            "ALTER INDEX ix_ticket_events_ticket_created_old RENAME TO ix_ticket_events_ticket_created"
+        ))
+
+    op.drop_column("ticket_events", "seq")
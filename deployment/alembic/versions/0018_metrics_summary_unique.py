@@ -0,0 +1,35 @@
+"""Unique key for metrics summary rows
+
+Параллельные пересчеты аналитики оставляли в metrics_summary по набору
+строк от каждого воркера. Уникальный индекс (NULLS NOT DISTINCT,
+PostgreSQL 15+) исключает дубли; существующая сводка удаляется и
+пересчитывается ближайшим запуском задачи.
+
+Revision ID: 0018_metrics_summary_unique
+Revises: 0017_ticket_event_seq
+Create Date: 2024-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0018_metrics_summary_unique'
+down_revision = '0017_ticket_event_seq'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("DELETE FROM metrics_summary"))
+    op.execute(sa.text(
+        "CREATE UNIQUE INDEX uq_metrics_summary_key "
+        "ON metrics_summary (name, dimension, dimension_value, bucket) NULLS NOT DISTINCT"
+    ))
+    op.drop_index("ix_metrics_summary_name_dimension", table_name="metrics_summary")
+
+
+def downgrade() -> None:
+    op.create_index("ix_metrics_summary_name_dimension", "metrics_summary", ["name", "dimension", "bucket"])
+    op.drop_index("uq_metrics_summary_key", table_name="metrics_summary")
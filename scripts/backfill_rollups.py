@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Скрипт пересчета почасовых и дневных счетчиков тикетов (ticket_rollups).
+
+Нужен после применения миграции 0006_ticket_rollups (счетчики копятся
+только с момента развертывания) и для исправления расхождений. Пересчет
+приближенный - см. RollupService.backfill.
+
+Использование:
+python scripts/backfill_rollups.py            # последние 90 дней
+python scripts/backfill_rollups.py --days 365
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Добавляем src в Python path (как в run_bot.py)
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute() / "src"))
+
+from tikethet.database import AsyncSessionLocal, engine  # noqa: E402
+from tikethet.services.rollup_service import RollupService  # noqa: E402
+
+
+async def backfill(days: int) -> None:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+
+    async with AsyncSessionLocal() as session:
+        written = await RollupService(session).backfill(since)
+
+    await engine.dispose()
+    print(f"✅ Пересчитано строк счетчиков: {written} (с {since:%Y-%m-%d})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пересчет счетчиков тикетов")
+    parser.add_argument("--days", type=int, default=90, help="Глубина пересчета в днях")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.days))
+
+
+if __name__ == "__main__":
+    main()
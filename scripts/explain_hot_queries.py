@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Скрипт проверки планов выполнения "горячих" запросов TiketHet.
+
+Строит те же запросы, что выполняют TicketService и MessageService,
+прогоняет их через EXPLAIN и показывает, какие индексы использует
+PostgreSQL. Последовательное сканирование больших таблиц помечается
+предупреждением (на почти пустой базе планировщик может выбрать Seq Scan
+и при наличии индексов - проверяйте на данных, близких к продакшену).
+
+Использование:
+python scripts/explain_hot_queries.py            # EXPLAIN
+python scripts/explain_hot_queries.py --analyze  # EXPLAIN (ANALYZE, BUFFERS)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Добавляем src в Python path (как в run_bot.py)
+sys.path.insert(0, str(Path(__file__).parent.parent.absolute() / "src"))
+
+from sqlalchemy import select, func, and_, text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+
+from tikethet.database import engine  # noqa: E402
+from tikethet.models.ticket import Ticket, TicketStatus, ACTIVE_TICKET_STATUSES  # noqa: E402
+from tikethet.models.message import Message  # noqa: E402
+
+
+# Таблицы, для которых Seq Scan считается проблемой
+LARGE_TABLES = ("tickets", "messages", "notifications")
+
+
+def build_queries(user_id, staff_id, ticket_id) -> dict:
+    """
+    Построение запросов в форме, которую используют сервисы.
+
+    Args:
+        user_id: ID автора тикетов
+        staff_id: ID назначенного сотрудника
+        ticket_id: ID тикета с сообщениями
+
+    Returns:
+        dict: {название: SQLAlchemy запрос}
+    """
+    return {
+        "get_user_tickets": (
+            select(Ticket)
+            .where(Ticket.user_id == user_id)
+            .order_by(Ticket.created_at.desc())
+            .limit(20)
+        ),
+        "get_assigned_tickets": (
+            select(Ticket)
+            .where(and_(
+                Ticket.assigned_to == staff_id,
+                Ticket.status == TicketStatus.IN_PROGRESS
+            ))
+            .order_by(Ticket.priority.desc(), Ticket.created_at.desc())
+        ),
+        "staff_queue (active)": (
+            select(Ticket)
+            .where(Ticket.status.in_(ACTIVE_TICKET_STATUSES))
+            .order_by(Ticket.priority.desc(), Ticket.created_at.desc())
+            .limit(20)
+        ),
+        "count_active_by_user": (
+            select(Ticket.status, func.count())
+            .where(and_(
+                Ticket.user_id == user_id,
+                Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+            ))
+            .group_by(Ticket.status)
+        ),
+        "get_ticket_messages": (
+            select(Message)
+            .where(Message.ticket_id == ticket_id)
+            .order_by(Message.created_at.asc())
+        ),
+    }
+
+
+def compile_query(query) -> str:
+    """Компиляция запроса в SQL для PostgreSQL с подставленными параметрами."""
+    return str(query.compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True}
+    ))
+
+
+async def pick_sample_ids(conn) -> tuple:
+    """Выбор реальных ID из базы, чтобы планы соответствовали данным."""
+    row = (await conn.execute(text(
+        "SELECT user_id, assigned_to, id FROM tickets "
+        "ORDER BY assigned_to IS NULL, created_at DESC LIMIT 1"
+    ))).first()
+
+    if row is None:
+        return None
+
+    user_id, staff_id, ticket_id = row
+    return user_id, staff_id or user_id, ticket_id
+
+
+async def explain_all(analyze: bool) -> bool:
+    """
+    Вывод планов выполнения для всех горячих запросов.
+
+    Args:
+        analyze: Выполнять ли запросы (EXPLAIN ANALYZE)
+
+    Returns:
+        bool: True если ни один запрос не сканирует большие таблицы целиком
+    """
+    explain_prefix = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+    all_good = True
+
+    async with engine.connect() as conn:
+        sample = await pick_sample_ids(conn)
+        if sample is None:
+            print("❌ Таблица tickets пуста - нечего проверять")
+            return False
+
+        for name, query in build_queries(*sample).items():
+            sql = compile_query(query)
+            result = await conn.execute(text(f"{explain_prefix} {sql}"))
+            plan = [row[0] for row in result]
+
+            seq_scans = [
+                line for line in plan
+                if "Seq Scan" in line and any(t in line for t in LARGE_TABLES)
+            ]
+
+            print(f"=== {name} ===")
+            for line in plan:
+                print(f"  {line}")
+
+            if seq_scans:
+                all_good = False
+                print("⚠️ Последовательное сканирование большой таблицы!")
+            else:
+                print("[OK] Используются индексы")
+            print("")
+
+    await engine.dispose()
+    return all_good
+
+
+def main():
+    """Основная функция скрипта."""
+    analyze = "--analyze" in sys.argv[1:]
+
+    if not asyncio.run(explain_all(analyze)):
+        print("Проверьте, применены ли миграции: alembic -c deployment/config/alembic.ini upgrade head")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Предварительное сжатие статики frontend (.br/.gz).
+
+Сжимает frontend/js/*.js и frontend/css/*.css максимальным уровнем,
+чтобы PrecompressedStaticFiles отдавал готовые варианты без сжатия на
+каждый запрос. С --hash дополнительно создает копии с хешем содержимого
+в имени (main.3f2a9c1b.js) и asset-manifest.json; такие файлы отдаются
+с Cache-Control: immutable. --rewrite-html записывает index.build.html -
+копию index.html с хешированными именами, которую сервер отдает вместо
+исходной страницы. Исходный index.html не изменяется.
+
+Brotli используется, если установлен пакет brotli; иначе создаются
+только .gz варианты.
+
+Использование:
+python scripts/precompress_assets.py [--hash] [--rewrite-html] [--root frontend]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+ASSET_PATTERNS = ("js/*.js", "css/*.css")
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}$")
+MANIFEST_NAME = "asset-manifest.json"
+BUILT_INDEX_NAME = "index.build.html"
+
+
+def is_hashed(path: Path) -> bool:
+    """Является ли файл уже хешированной копией."""
+    return bool(HASHED_NAME_RE.search(path.stem))
+
+
+def content_hash(data: bytes) -> str:
+    """Короткий хеш содержимого для имени файла."""
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def compress_file(path: Path) -> list:
+    """
+    Создание .gz и .br вариантов файла.
+
+    Вариант сохраняется только если он меньше исходного файла.
+
+    Args:
+        path: Путь к исходному файлу
+
+    Returns:
+        list: Созданные варианты (имя, размер)
+    """
+    data = path.read_bytes()
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+
+    written = []
+    for suffix, compressed in variants:
+        target = path.with_name(path.name + suffix)
+        if len(compressed) >= len(data):
+            target.unlink(missing_ok=True)
+            continue
+        target.write_bytes(compressed)
+        written.append((target.name, len(compressed)))
+
+    return written
+
+
+def write_hashed_copy(path: Path) -> Path:
+    """
+    Создание копии файла с хешем содержимого в имени.
+
+    Старые хешированные копии этого файла удаляются.
+
+    Args:
+        path: Путь к исходному файлу
+
+    Returns:
+        Path: Путь к хешированной копии
+    """
+    data = path.read_bytes()
+    hashed = path.with_name(f"{path.stem}.{content_hash(data)}{path.suffix}")
+
+    for stale in path.parent.glob(f"{path.stem}.*{path.suffix}*"):
+        base = stale.name.removesuffix(".gz").removesuffix(".br")
+        if base != hashed.name and is_hashed(Path(base)):
+            stale.unlink()
+
+    hashed.write_bytes(data)
+    return hashed
+
+
+def rewrite_html(html_path: Path, target_path: Path, manifest: dict) -> int:
+    """
+    Запись копии HTML с хешированными именами в href/src.
+
+    Args:
+        html_path: Путь к исходному HTML файлу (не изменяется)
+        target_path: Путь к собранной копии
+        manifest: Соответствие исходных имен хешированным
+
+    Returns:
+        int: Количество замен
+    """
+    content = html_path.read_text(encoding="utf-8")
+    replaced = 0
+
+    for original, hashed in manifest.items():
+        # Учитываем уже переписанные ссылки: js/main.<hash>.js
+        stem, dot, ext = original.rpartition(".")
+        pattern = re.compile(
+            r'((?:src|href)=")' + re.escape(stem) + r'(?:\.[0-9a-f]{8,})?' + re.escape(dot + ext) + r'(")'
+        )
+        content, count = pattern.subn(lambda m: m.group(1) + hashed + m.group(2), content)
+        replaced += count
+
+    target_path.write_text(content, encoding="utf-8")
+    return replaced
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Предварительное сжатие статики frontend")
+    parser.add_argument("--root", default="frontend", help="Каталог frontend")
+    parser.add_argument("--hash", action="store_true", help="Создать копии с хешем в имени")
+    parser.add_argument("--rewrite-html", action="store_true", help="Записать index.build.html с хешированными именами")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.exists():
+        print(f"❌ Каталог {root} не найден!")
+        return 1
+
+    if brotli is None:
+        print("⚠️ Пакет brotli не установлен - создаются только .gz варианты")
+
+    manifest = {}
+    sources = [
+        path
+        for pattern in ASSET_PATTERNS
+        for path in sorted(root.glob(pattern))
+        if not is_hashed(path)
+    ]
+
+    for path in sources:
+        targets = [path]
+        if args.hash:
+            hashed = write_hashed_copy(path)
+            manifest[path.relative_to(root).as_posix()] = hashed.relative_to(root).as_posix()
+            targets.append(hashed)
+
+        for target in targets:
+            written = compress_file(target)
+            sizes = ", ".join(f"{name} {size} B" for name, size in written) or "сжатие не выгодно"
+            print(f"✅ {target.relative_to(root)} ({target.stat().st_size} B): {sizes}")
+
+    if args.hash:
+        manifest_path = root / MANIFEST_NAME
+        manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📄 Манифест: {manifest_path}")
+
+        if args.rewrite_html:
+            index_path = root / "index.html"
+            built_path = root / BUILT_INDEX_NAME
+            replaced = rewrite_html(index_path, built_path, manifest)
+            compress_file(built_path)
+            print(f"🔁 {built_path}: заменено ссылок - {replaced}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Сжатие ответов и раздача предварительно сжатой статики.
+
+Динамические ответы сжимаются gzip на лету (выше порога размера).
+Статика (frontend) сжимается заранее скриптом scripts/precompress_assets.py:
+рядом с файлом лежат варианты .br/.gz, которые отдаются без сжатия
+на каждый запрос.
+"""
+
+import os
+import re
+from mimetypes import guess_type
+from typing import Iterable, Tuple
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+# Ответы меньше порога не сжимаются - выигрыш не окупает CPU и заголовки
+COMPRESSION_MINIMUM_SIZE = 1024
+
+# Уровень gzip для сжатия на лету (9 заметно дороже по CPU при малом выигрыше)
+COMPRESSION_LEVEL = 6
+
+# Предварительно сжатые варианты в порядке предпочтения
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Имена с хешем содержимого: main.3f2a9c1b.js
+HASHED_NAME_RE = re.compile(r"\.[0-9a-f]{8,}\.[A-Za-z0-9]+$")
+
+# Собранные страницы со ссылками на хешированные файлы (не в git):
+# отдаются вместо исходных, если собраны
+BUILT_PAGES = {"index.html": "index.build.html"}
+
+# Кэширование статики
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "public, no-cache"
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZip middleware с порогом размера и исключением путей.
+
+    Пути со статикой исключаются: StaticFiles отдает готовые .br/.gz
+    варианты, повторное сжатие испортило бы ответ.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MINIMUM_SIZE,
+        compresslevel: int = COMPRESSION_LEVEL,
+        exclude_prefixes: Iterable[str] = ()
+    ):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_prefixes: Tuple[str, ...] = tuple(exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
+
+
+def _accepted_encodings(scope: Scope) -> set:
+    """Кодировки из Accept-Encoding (без учета q=0)."""
+    accepted = set()
+    for item in Headers(scope=scope).get("accept-encoding", "").split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(coding.lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles с отдачей предварительно сжатых вариантов файлов.
+
+    Если клиент принимает br/gzip и рядом с файлом есть .br/.gz,
+    отдается сжатый вариант с исходным Content-Type; все ответы для
+    таких файлов несут Vary: Accept-Encoding. Файлы с хешем
+    содержимого в имени кэшируются на год как immutable, остальные -
+    с обязательной перепроверкой по ETag. Вместо исходной страницы
+    отдается ее собранный вариант из BUILT_PAGES, если он есть.
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        built = BUILT_PAGES.get(path)
+        if built is not None:
+            full_path, stat_result = self.lookup_path(built)
+            if stat_result is not None and os.path.isfile(full_path):
+                path = built
+
+        response = await self._get_precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        if response.status_code in (200, 304):
+            if "cache-control" not in response.headers:
+                response.headers["Cache-Control"] = (
+                    CACHE_IMMUTABLE if HASHED_NAME_RE.search(path) else CACHE_REVALIDATE
+                )
+            # Несжатый ответ тоже зависит от Accept-Encoding: без Vary общий
+            # кэш отдал бы его всем клиентам
+            if self._has_precompressed(path):
+                response.headers["Vary"] = "Accept-Encoding"
+
+        return response
+
+    def _has_precompressed(self, path: str) -> bool:
+        """Есть ли у файла сжатые варианты (.br/.gz)."""
+        for _, suffix in PRECOMPRESSED_ENCODINGS:
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is not None and os.path.isfile(full_path):
+                return True
+        return False
+
+    async def _get_precompressed_response(self, path: str, scope: Scope):
+        """
+        Поиск и отдача сжатого варианта файла.
+
+        Returns:
+            Optional[Response]: Ответ или None, если варианта нет
+        """
+        if scope["method"] not in ("GET", "HEAD"):
+            return None
+
+        accepted = _accepted_encodings(scope)
+        if not accepted:
+            return None
+
+        for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding not in accepted:
+                continue
+
+            full_path, stat_result = self.lookup_path(path + suffix)
+            if stat_result is None or not os.path.isfile(full_path):
+                continue
+
+            response = FileResponse(
+                full_path,
+                stat_result=stat_result,
+                media_type=guess_type(path)[0] or "text/plain",
+                headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+            )
+            if self.is_not_modified(response.headers, Headers(scope=scope)):
+                return NotModifiedResponse(response.headers)
+            return response
+
+        return None
@@ -0,0 +1,135 @@
+"""
+HTTP conditional requests (ETag / Last-Modified) для read endpoints.
+
+ETag вычисляется из версий строк (см. tikethet.schemas.versions), поэтому
+при совпадении If-None-Match ответ 304 отдается без сериализации тела.
+"""
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+
+from tikethet.api.serializers import FastJSONResponse
+
+
+# Политики Cache-Control по типам данных
+# Персональные данные: кэшировать можно, но перед использованием - перепроверить
+CACHE_PRIVATE_REVALIDATE = "private, no-cache"
+# Справочники (категории): минуту без запросов, затем перепроверка
+CACHE_PRIVATE_CATALOG = "private, max-age=60, must-revalidate"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Слабое сравнение ETag из заголовка If-None-Match."""
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Проверка условных заголовков запроса.
+
+    If-None-Match имеет приоритет; If-Modified-Since учитывается
+    только при его отсутствии (RFC 9110).
+
+    Args:
+        request: Входящий запрос
+        etag: Текущий ETag ресурса
+        last_modified: Время последнего изменения ресурса
+
+    Returns:
+        bool: True если клиентская копия актуальна
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def _cache_headers(
+    etag: str,
+    last_modified: Optional[datetime],
+    cache_control: str
+) -> dict:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Authorization",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified_response(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = CACHE_PRIVATE_REVALIDATE
+) -> Response:
+    """
+    Ответ 304 Not Modified с заголовками валидации.
+
+    Args:
+        etag: ETag ресурса
+        last_modified: Время последнего изменения ресурса
+        cache_control: Политика Cache-Control
+
+    Returns:
+        Response: Пустой ответ 304
+    """
+    return Response(status_code=304, headers=_cache_headers(etag, last_modified, cache_control))
+
+
+def conditional_json(
+    request: Request,
+    etag: str,
+    build_content: Callable[[], Any],
+    last_modified: Optional[datetime] = None,
+    cache_control: str = CACHE_PRIVATE_REVALIDATE,
+    status_code: int = 200
+) -> Response:
+    """
+    JSON ответ с поддержкой условных запросов.
+
+    Args:
+        request: Входящий запрос
+        etag: ETag ресурса
+        build_content: Функция построения тела (вызывается только при 200)
+        last_modified: Время последнего изменения ресурса
+        cache_control: Политика Cache-Control
+        status_code: Код ответа при изменившемся ресурсе
+
+    Returns:
+        Response: 304 без тела или FastJSONResponse
+    """
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified, cache_control)
+
+    return FastJSONResponse(
+        build_content(),
+        status_code=status_code,
+        headers=_cache_headers(etag, last_modified, cache_control)
+    )
@@ -0,0 +1,123 @@
+"""
+Потоковое кодирование выгрузок в NDJSON и CSV.
+
+Строки кодируются по мере чтения из курсора и отправляются клиенту
+порциями (chunked transfer), не накапливаясь в памяти.
+"""
+
+import csv
+import enum
+import io
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterable, Mapping
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+
+# Размер порции ответа (байт), после которого буфер отправляется клиенту
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def encode_ndjson(rows: AsyncIterator[Mapping[str, Any]]) -> AsyncIterator[bytes]:
+    """
+    Кодирование строк в NDJSON (один JSON объект на строку).
+
+    Args:
+        rows: Асинхронный поток строк
+
+    Yields:
+        bytes: Порции ответа
+    """
+    buffer = bytearray()
+    async for row in rows:
+        buffer += orjson.dumps(dict(row), option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE)
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def _csv_value(value: Any) -> Any:
+    """Приведение значения к виду для CSV ячейки."""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+async def encode_csv(
+    rows: AsyncIterator[Mapping[str, Any]],
+    fields: Iterable[str]
+) -> AsyncIterator[bytes]:
+    """
+    Кодирование строк в CSV с заголовком.
+
+    Args:
+        rows: Асинхронный поток строк
+        fields: Порядок колонок
+
+    Yields:
+        bytes: Порции ответа
+    """
+    fields = tuple(fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM - чтобы Excel открывал UTF-8 без искажений кириллицы
+    buffer.write("\ufeff")
+    writer.writerow(fields)
+
+    async for row in rows:
+        writer.writerow([_csv_value(row[field]) for field in fields])
+        if buffer.tell() >= EXPORT_CHUNK_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def export_response(
+    rows: AsyncIterator[Mapping[str, Any]],
+    fields: Iterable[str],
+    export_format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Потоковый ответ с выгрузкой.
+
+    Args:
+        rows: Асинхронный поток строк
+        fields: Порядок колонок (для CSV)
+        export_format: ndjson или csv
+        filename: Имя файла без расширения
+
+    Returns:
+        StreamingResponse: Ответ с Content-Disposition: attachment
+    """
+    if export_format == "csv":
+        body = encode_csv(rows, fields)
+    else:
+        body = encode_ndjson(rows)
+
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format}"',
+            "Cache-Control": "no-store",
+        }
+    )
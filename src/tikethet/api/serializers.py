@@ -0,0 +1,22 @@
+"""
+Быстрое кодирование JSON ответов API.
+
+Тела ответов строятся сериализаторами tikethet.schemas.serialization и
+кодируются через orjson (TicketResponse/MessageResponse остаются в
+response_model для документации OpenAPI).
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSON ответ с датами в UTC формате "Z", как у Pydantic."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
@@ -2,29 +2,37 @@
 API endpoints для работы с категориями тикетов.
 """
 
+import uuid
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tikethet.database import get_db_session
 from tikethet.models.user import User
-from tikethet.schemas.category import CategoryResponse
-from tikethet.services.category_service import CategoryService
+from tikethet.schemas.category import CategoryResponse, CategoryStaffUpdate
+from tikethet.services.category_service import CategoryService, category_cache
+from tikethet.services.assignment_service import AssignmentService
+from tikethet.schemas.serialization import serialize_user
 from tikethet.api.dependencies import require_user, require_admin
+from tikethet.api.conditional import conditional_json, CACHE_PRIVATE_CATALOG
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[CategoryResponse])
 async def get_categories(
+    request: Request,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_db_session)
 ):
     """
     Получение списка активных категорий.
     
+    Поддерживает If-None-Match / If-Modified-Since (ответ 304).
+    
     Args:
+        request: HTTP запрос
         current_user: Текущий пользователь
         db: Сессия базы данных
         
@@ -33,23 +41,15 @@ async def get_categories(
     """
     category_service = CategoryService(db)
     
-    categories = await category_service.get_active_categories()
+    categories = await category_service.get_cached_active_categories()
     
-    return [
-        CategoryResponse(
-            id=category.id,
-            name=category.name,
-            description=category.description,
-            icon=category.icon,
-            color=category.color,
-            is_active=category.is_active,
-            sort_order=category.sort_order,
-            created_at=category.created_at,
-            updated_at=category.updated_at,
-            display_name=category.display_name
-        )
-        for category in categories
-    ]
+    return conditional_json(
+        request,
+        category_cache.active_etag,
+        lambda: categories,
+        last_modified=category_cache.active_last_modified,
+        cache_control=CACHE_PRIVATE_CATALOG
+    )
 
 
 @router.post("/init-defaults")
@@ -82,4 +82,65 @@ async def initialize_default_categories(
             }
             for category in created_categories
         ]
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/{category_id}/staff")
+async def get_category_staff(
+    category_id: uuid.UUID,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Профильные сотрудники категории (автоматическая маршрутизация).
+    
+    Args:
+        category_id: ID категории
+        current_user: Текущий пользователь (должен быть админом)
+        db: Сессия базы данных
+        
+    Returns:
+        dict: Список сотрудников
+    """
+    staff = await AssignmentService(db).get_category_staff(category_id)
+    
+    return {"success": True, "data": [serialize_user(user) for user in staff]}
+
+
+@router.put("/{category_id}/staff")
+async def set_category_staff(
+    category_id: uuid.UUID,
+    staff_data: CategoryStaffUpdate,
+    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Замена профильных сотрудников категории.
+    
+    Новые тикеты категории назначаются на наименее загруженного из них;
+    пустой список передает категорию универсальным сотрудникам.
+    
+    Args:
+        category_id: ID категории
+        staff_data: ID сотрудников
+        current_user: Текущий пользователь (должен быть админом)
+        db: Сессия базы данных
+        
+    Returns:
+        dict: Список сотрудников после изменения
+    """
+    if await category_cache.get(db, category_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Категория не найдена"
+        )
+    
+    try:
+        staff = await AssignmentService(db).set_category_staff(category_id, staff_data.user_ids)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return {"success": True, "data": [serialize_user(user) for user in staff]}
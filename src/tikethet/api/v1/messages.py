@@ -5,22 +5,28 @@ API endpoints для работы с сообщениями в тикетах.
 import uuid
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tikethet.database import get_db_session
-from tikethet.models.user import User
+from tikethet.models.user import User, UserRole
 from tikethet.schemas.message import MessageCreate, MessageUpdate, MessageResponse
 from tikethet.schemas.common import SuccessResponse
 from tikethet.services.ticket_service import TicketService
 from tikethet.services.message_service import MessageService
+from tikethet.services.archive_service import ArchiveService
 from tikethet.api.dependencies import require_user
+from tikethet.schemas.serialization import serialize_message, serialize_messages
+from tikethet.schemas.versions import make_etag, rows_etag, message_version, latest_modified
+from tikethet.api.serializers import FastJSONResponse
+from tikethet.api.conditional import conditional_json, not_modified_response, is_not_modified
 
 router = APIRouter()
 
 
 @router.get("/{ticket_id}/messages", response_model=List[MessageResponse])
 async def get_ticket_messages(
+    request: Request,
     ticket_id: uuid.UUID,
     include_internal: bool = Query(None, description="Включать внутренние сообщения"),
     current_user: User = Depends(require_user),
@@ -30,6 +36,7 @@ async def get_ticket_messages(
     Получение сообщений тикета.
     
     Args:
+        request: HTTP запрос
         ticket_id: ID тикета
         include_internal: Включать ли внутренние сообщения (автоопределение по роли)
         current_user: Текущий пользователь
@@ -44,10 +51,7 @@ async def get_ticket_messages(
     # Проверяем существование тикета и права доступа
     ticket = await ticket_service.get_ticket_by_id(ticket_id, load_relations=False)
     if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Тикет не найден"
-        )
+        return await _get_archived_messages(request, ticket_id, include_internal, current_user, db)
     
     if not ticket.can_be_viewed_by(current_user):
         raise HTTPException(
@@ -57,25 +61,68 @@ async def get_ticket_messages(
     
     # Получаем сообщения
     messages = await message_service.get_ticket_messages(
-        ticket_id, current_user, include_internal
+        ticket_id, current_user, include_internal, since=ticket.created_at
     )
     
-    return [
-        MessageResponse(
-            id=message.id,
-            ticket_id=message.ticket_id,
-            user_id=message.user_id,
-            content=message.content,
-            attachments=message.attachments,
-            is_internal=message.is_internal,
-            created_at=message.created_at,
-            user=message.user,
-            has_attachments=message.has_attachments,
-            attachment_count=message.attachment_count,
-            short_content=message.short_content
+    # Удаление сообщения меняет набор строк, поэтому ETag тоже изменится
+    return conditional_json(
+        request,
+        rows_etag(message_version(message) for message in messages),
+        lambda: serialize_messages(messages),
+        last_modified=latest_modified(messages)
+    )
+
+
+async def _get_archived_messages(
+    request: Request,
+    ticket_id: uuid.UUID,
+    include_internal: bool,
+    current_user: User,
+    db: AsyncSession
+) -> Response:
+    """
+    Чтение сообщений тикета из холодного архива.
+    
+    Args:
+        request: HTTP запрос
+        ticket_id: ID тикета
+        include_internal: Включать ли внутренние сообщения
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+        
+    Returns:
+        Response: Список сообщений архивного тикета или 304
+    """
+    archive_service = ArchiveService(db)
+    
+    entry = await archive_service.get_archive_entry(ticket_id)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Тикет не найден"
         )
-        for message in messages
+    
+    if not entry.can_be_viewed_by(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Недостаточно прав для просмотра сообщений тикета"
+        )
+    
+    if include_internal is None or not current_user.role.can_access(UserRole.HELPER):
+        include_internal = current_user.role.can_access(UserRole.HELPER)
+    
+    # Архив неизменен: версия - положение записи и видимость внутренних сообщений
+    etag = make_etag(entry.segment, entry.offset, include_internal)
+    if is_not_modified(request, etag, entry.closed_at):
+        return not_modified_response(etag, entry.closed_at)
+    
+    record = await archive_service.load_archived_ticket(entry)
+    messages = [
+        message for message in record["messages"]
+        if include_internal or not message["is_internal"]
     ]
+    
+    return conditional_json(request, etag, lambda: messages, last_modified=entry.closed_at)
 
 
 @router.post("/{ticket_id}/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
@@ -117,18 +164,9 @@ async def create_message(
     # Создаем сообщение
     message = await message_service.create_message(ticket, current_user, message_data)
     
-    return MessageResponse(
-        id=message.id,
-        ticket_id=message.ticket_id,
-        user_id=message.user_id,
-        content=message.content,
-        attachments=message.attachments,
-        is_internal=message.is_internal,
-        created_at=message.created_at,
-        user=message.user,
-        has_attachments=message.has_attachments,
-        attachment_count=message.attachment_count,
-        short_content=message.short_content
+    return FastJSONResponse(
+        serialize_message(message),
+        status_code=status.HTTP_201_CREATED
     )
 
 
@@ -170,19 +208,7 @@ async def update_message(
             detail="Недостаточно прав для редактирования сообщения"
         )
     
-    return MessageResponse(
-        id=message.id,
-        ticket_id=message.ticket_id,
-        user_id=message.user_id,
-        content=message.content,
-        attachments=message.attachments,
-        is_internal=message.is_internal,
-        created_at=message.created_at,
-        user=message.user,
-        has_attachments=message.has_attachments,
-        attachment_count=message.attachment_count,
-        short_content=message.short_content
-    )
+    return FastJSONResponse(serialize_message(message))
 
 
 @router.delete("/messages/{message_id}", response_model=SuccessResponse)
@@ -5,10 +5,10 @@ API endpoints для работы с тикетами.
 import uuid
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from tikethet.database import get_db_session
+from tikethet.database import get_db_session, AsyncSessionLocal
 from tikethet.models.user import User, UserRole
 from tikethet.models.ticket import TicketStatus, TicketPriority
 from tikethet.schemas.ticket import (
@@ -16,13 +16,46 @@ from tikethet.schemas.ticket import (
     TicketFilter, TicketAssign, TicketStatusUpdate
 )
 from tikethet.schemas.common import PaginationParams, SuccessResponse
-from tikethet.services.ticket_service import TicketService
+from tikethet.services.ticket_service import (
+    TicketService, TICKET_EXPORT_FIELDS, MESSAGE_EXPORT_FIELDS
+)
 from tikethet.services.category_service import CategoryService
+from tikethet.services.archive_service import ArchiveService
+from tikethet.services.analytics_service import AnalyticsService
+from tikethet.services.event_service import TicketEventService
 from tikethet.api.dependencies import AuthDependencies, require_user, require_helper
+from tikethet.schemas.serialization import (
+    serialize_ticket, serialize_ticket_page, serialize_ticket_event
+)
+from tikethet.schemas.versions import make_etag, rows_etag, ticket_version, latest_modified
+from tikethet.api.serializers import FastJSONResponse
+from tikethet.api.export import export_response
+from tikethet.api.conditional import conditional_json, not_modified_response, is_not_modified
 
 router = APIRouter()
 
 
+def _page_response(
+    request: Request,
+    tickets: List,
+    total: int,
+    skip: int,
+    limit: int
+) -> Response:
+    """
+    Условный ответ со страницей тикетов.
+    
+    ETag строится из версий строк страницы и total, поэтому при
+    совпадении If-None-Match страница не сериализуется.
+    """
+    return conditional_json(
+        request,
+        rows_etag((ticket_version(ticket) for ticket in tickets), total, skip, limit),
+        lambda: serialize_ticket_page(tickets, total, skip, limit),
+        last_modified=latest_modified(tickets)
+    )
+
+
 @router.post("/", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
     ticket_data: TicketCreate,
@@ -44,8 +77,8 @@ async def create_ticket(
     category_service = CategoryService(db)
     
     # Проверяем существование категории
-    category = await category_service.get_category_by_id(ticket_data.category_id)
-    if not category or not category.is_active:
+    category = await category_service.get_cached_category(ticket_data.category_id)
+    if not category or not category["is_active"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Указанная категория не найдена или неактивна"
@@ -54,35 +87,22 @@ async def create_ticket(
     # Создаем тикет
     ticket = await ticket_service.create_ticket(ticket_data, current_user)
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
+    return FastJSONResponse(
+        serialize_ticket(ticket),
+        status_code=status.HTTP_201_CREATED
     )
 
 
 @router.get("/", response_model=TicketListResponse)
 async def get_tickets(
+    request: Request,
     status_filter: Optional[TicketStatus] = Query(None, alias="status"),
     priority_filter: Optional[TicketPriority] = Query(None, alias="priority"),
     category_id: Optional[uuid.UUID] = Query(None),
     assigned_to: Optional[uuid.UUID] = Query(None),
     user_id: Optional[uuid.UUID] = Query(None),
     search: Optional[str] = Query(None),
+    active_only: bool = Query(False),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_user),
@@ -92,12 +112,14 @@ async def get_tickets(
     Получение списка тикетов с фильтрами и пагинацией.
     
     Args:
+        request: HTTP запрос
         status_filter: Фильтр по статусу
         priority_filter: Фильтр по приоритету
         category_id: Фильтр по категории
         assigned_to: Фильтр по назначенному пользователю
         user_id: Фильтр по автору тикета
         search: Поиск по заголовку и описанию
+        active_only: Только активные тикеты
         skip: Количество элементов для пропуска
         limit: Максимальное количество элементов
         current_user: Текущий пользователь
@@ -114,48 +136,20 @@ async def get_tickets(
         category_id=category_id,
         assigned_to=assigned_to,
         user_id=user_id,
-        search=search
+        search=search,
+        active_only=active_only
     )
     
     pagination = PaginationParams(skip=skip, limit=limit)
     
     tickets, total = await ticket_service.get_tickets(filters, pagination, current_user)
     
-    # Преобразуем тикеты в response модели
-    ticket_responses = [
-        TicketResponse(
-            id=ticket.id,
-            title=ticket.title,
-            description=ticket.description,
-            category_id=ticket.category_id,
-            priority=ticket.priority,
-            user_id=ticket.user_id,
-            assigned_to=ticket.assigned_to,
-            status=ticket.status,
-            created_at=ticket.created_at,
-            updated_at=ticket.updated_at,
-            closed_at=ticket.closed_at,
-            user=ticket.user,
-            assigned_user=ticket.assigned_user,
-            category=ticket.category,
-            is_active=ticket.is_active,
-            is_assigned=ticket.is_assigned,
-            display_title=ticket.display_title,
-            short_description=ticket.short_description
-        )
-        for ticket in tickets
-    ]
-    
-    return TicketListResponse.create(
-        items=ticket_responses,
-        total=total,
-        skip=skip,
-        limit=limit
-    )
+    return _page_response(request, tickets, total, skip, limit)
 
 
 @router.get("/my", response_model=TicketListResponse)
 async def get_my_tickets(
+    request: Request,
     status_filter: Optional[TicketStatus] = Query(None, alias="status"),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -166,6 +160,7 @@ async def get_my_tickets(
     Получение тикетов текущего пользователя.
     
     Args:
+        request: HTTP запрос
         status_filter: Фильтр по статусу
         skip: Количество элементов для пропуска
         limit: Максимальное количество элементов
@@ -182,40 +177,245 @@ async def get_my_tickets(
         current_user, status_filter, pagination
     )
     
-    # Преобразуем в response модели
-    ticket_responses = [
-        TicketResponse(
-            id=ticket.id,
-            title=ticket.title,
-            description=ticket.description,
-            category_id=ticket.category_id,
-            priority=ticket.priority,
-            user_id=ticket.user_id,
-            assigned_to=ticket.assigned_to,
-            status=ticket.status,
-            created_at=ticket.created_at,
-            updated_at=ticket.updated_at,
-            closed_at=ticket.closed_at,
-            category=ticket.category,
-            assigned_user=ticket.assigned_user,
-            is_active=ticket.is_active,
-            is_assigned=ticket.is_assigned,
-            display_title=ticket.display_title,
-            short_description=ticket.short_description
-        )
-        for ticket in tickets
-    ]
-    
-    return TicketListResponse.create(
-        items=ticket_responses,
-        total=total,
-        skip=skip,
-        limit=limit
+    return _page_response(request, tickets, total, skip, limit)
+
+
+@router.get("/queue", response_model=TicketListResponse)
+async def get_active_queue(
+    request: Request,
+    status_filter: Optional[TicketStatus] = Query(None, alias="status"),
+    priority_filter: Optional[TicketPriority] = Query(None, alias="priority"),
+    category_id: Optional[uuid.UUID] = Query(None),
+    assigned_to: Optional[uuid.UUID] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_helper),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Рабочая очередь персонала: только активные тикеты.
+    
+    Args:
+        request: HTTP запрос
+        status_filter: Фильтр по активному статусу
+        priority_filter: Фильтр по приоритету
+        category_id: Фильтр по категории
+        assigned_to: Фильтр по назначенному пользователю
+        skip: Количество элементов для пропуска
+        limit: Максимальное количество элементов
+        current_user: Текущий пользователь (должен быть персоналом)
+        db: Сессия базы данных
+        
+    Returns:
+        TicketListResponse: Активные тикеты по приоритету
+    """
+    ticket_service = TicketService(db)
+    
+    filters = TicketFilter(
+        status=status_filter,
+        priority=priority_filter,
+        category_id=category_id,
+        assigned_to=assigned_to
+    )
+    pagination = PaginationParams(skip=skip, limit=limit)
+    
+    tickets, total = await ticket_service.get_active_queue(filters, pagination, current_user)
+    
+    return _page_response(request, tickets, total, skip, limit)
+
+
+@router.get("/archive", response_model=TicketListResponse)
+async def get_archived_tickets(
+    request: Request,
+    status_filter: Optional[TicketStatus] = Query(None, alias="status"),
+    category_id: Optional[uuid.UUID] = Query(None),
+    user_id: Optional[uuid.UUID] = Query(None),
+    search: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_user),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Архив: решенные и закрытые тикеты.
+    
+    Args:
+        request: HTTP запрос
+        status_filter: RESOLVED или CLOSED
+        category_id: Фильтр по категории
+        user_id: Фильтр по автору тикета
+        search: Поиск по заголовку и описанию
+        skip: Количество элементов для пропуска
+        limit: Максимальное количество элементов
+        current_user: Текущий пользователь
+        db: Сессия базы данных
+        
+    Returns:
+        TicketListResponse: Завершенные тикеты, новые закрытия первыми
+    """
+    ticket_service = TicketService(db)
+    
+    filters = TicketFilter(
+        status=status_filter,
+        category_id=category_id,
+        user_id=user_id,
+        search=search
+    )
+    pagination = PaginationParams(skip=skip, limit=limit)
+    
+    tickets, total = await ticket_service.get_archived_tickets(filters, pagination, current_user)
+    
+    return _page_response(request, tickets, total, skip, limit)
+
+
+async def _stream_export(method_name: str, filters: TicketFilter, user: User):
+    """
+    Поток строк выгрузки в собственной сессии.
+    
+    Сессия из Depends(get_db_session) закрывается до отправки тела
+    StreamingResponse, поэтому курсор открывается внутри генератора.
+    """
+    async with AsyncSessionLocal() as session:
+        rows = getattr(TicketService(session), method_name)(filters, user)
+        async for row in rows:
+            yield row
+
+
+@router.get("/export")
+async def export_tickets(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    status_filter: Optional[TicketStatus] = Query(None, alias="status"),
+    priority_filter: Optional[TicketPriority] = Query(None, alias="priority"),
+    category_id: Optional[uuid.UUID] = Query(None),
+    assigned_to: Optional[uuid.UUID] = Query(None),
+    user_id: Optional[uuid.UUID] = Query(None),
+    search: Optional[str] = Query(None),
+    active_only: bool = Query(False),
+    current_user: User = Depends(require_helper)
+):
+    """
+    Потоковая выгрузка тикетов в NDJSON или CSV.
+    
+    Принимает те же фильтры, что и список тикетов. Строки читаются
+    серверным курсором и отправляются порциями - размер выгрузки
+    не ограничен памятью.
+    
+    Args:
+        export_format: ndjson или csv
+        status_filter: Фильтр по статусу
+        priority_filter: Фильтр по приоритету
+        category_id: Фильтр по категории
+        assigned_to: Фильтр по назначенному пользователю
+        user_id: Фильтр по автору тикета
+        search: Поиск по заголовку и описанию
+        active_only: Только активные тикеты
+        current_user: Текущий пользователь (должен быть персоналом)
+        
+    Returns:
+        StreamingResponse: Файл выгрузки
+    """
+    filters = TicketFilter(
+        status=status_filter,
+        priority=priority_filter,
+        category_id=category_id,
+        assigned_to=assigned_to,
+        user_id=user_id,
+        search=search,
+        active_only=active_only
+    )
+    
+    return export_response(
+        _stream_export("stream_tickets_for_export", filters, current_user),
+        TICKET_EXPORT_FIELDS,
+        export_format,
+        "tickets"
     )
 
 
+@router.get("/export/messages")
+async def export_ticket_messages(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    status_filter: Optional[TicketStatus] = Query(None, alias="status"),
+    priority_filter: Optional[TicketPriority] = Query(None, alias="priority"),
+    category_id: Optional[uuid.UUID] = Query(None),
+    assigned_to: Optional[uuid.UUID] = Query(None),
+    user_id: Optional[uuid.UUID] = Query(None),
+    search: Optional[str] = Query(None),
+    active_only: bool = Query(False),
+    current_user: User = Depends(require_helper)
+):
+    """
+    Потоковая выгрузка сообщений тикетов, подходящих под фильтры.
+    
+    Args:
+        export_format: ndjson или csv
+        status_filter: Фильтр по статусу
+        priority_filter: Фильтр по приоритету
+        category_id: Фильтр по категории
+        assigned_to: Фильтр по назначенному пользователю
+        user_id: Фильтр по автору тикета
+        search: Поиск по заголовку и описанию
+        active_only: Только активные тикеты
+        current_user: Текущий пользователь (должен быть персоналом)
+        
+    Returns:
+        StreamingResponse: Файл выгрузки
+    """
+    filters = TicketFilter(
+        status=status_filter,
+        priority=priority_filter,
+        category_id=category_id,
+        assigned_to=assigned_to,
+        user_id=user_id,
+        search=search,
+        active_only=active_only
+    )
+    
+    return export_response(
+        _stream_export("stream_messages_for_export", filters, current_user),
+        MESSAGE_EXPORT_FIELDS,
+        export_format,
+        "messages"
+    )
+
+
+@router.post("/claim-next", response_model=TicketResponse)
+async def claim_next_ticket(
+    category_id: Optional[uuid.UUID] = Query(None),
+    current_user: User = Depends(require_helper),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Взять в работу следующий тикет.
+    
+    Сначала - самый приоритетный еще не начатый тикет, автоматически
+    назначенный на текущего сотрудника, затем - тикет без исполнителя
+    (FOR UPDATE SKIP LOCKED). Тикет переводится в работу; параллельные
+    запросы получают разные тикеты.
+    
+    Args:
+        category_id: Ограничение по категории
+        current_user: Текущий пользователь (должен быть персоналом)
+        db: Сессия базы данных
+        
+    Returns:
+        TicketResponse: Назначенный тикет или 204, если очередь пуста
+    """
+    ticket_service = TicketService(db)
+    
+    ticket = await ticket_service.claim_next_ticket(current_user, category_id)
+    if not ticket:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    
+    # Загружаем связанные объекты для ответа
+    ticket = await ticket_service.get_ticket_by_id(ticket.id)
+    
+    return FastJSONResponse(serialize_ticket(ticket))
+
+
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(
+    request: Request,
     ticket_id: uuid.UUID,
     current_user: User = Depends(require_user),
     db: AsyncSession = Depends(get_db_session)
@@ -224,6 +424,7 @@ async def get_ticket(
     Получение тикета по ID.
     
     Args:
+        request: HTTP запрос
         ticket_id: ID тикета
         current_user: Текущий пользователь
         db: Сессия базы данных
@@ -235,10 +436,30 @@ async def get_ticket(
     
     ticket = await ticket_service.get_ticket_by_id(ticket_id)
     if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Тикет не найден"
-        )
+        # Тикет мог быть перенесен в холодный архив
+        archive_service = ArchiveService(db)
+        entry = await archive_service.get_archive_entry(ticket_id)
+        if not entry:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Тикет не найден"
+            )
+        
+        if not entry.can_be_viewed_by(current_user):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Недостаточно прав для просмотра тикета"
+            )
+        
+        # Архивная запись неизменна - версия определяется положением в сегменте,
+        # поэтому 304 отдается без чтения сегмента с диска
+        etag = make_etag(entry.segment, entry.offset)
+        if is_not_modified(request, etag, entry.closed_at):
+            return not_modified_response(etag, entry.closed_at)
+        
+        record = await archive_service.load_archived_ticket(entry)
+        record.pop("messages", None)
+        return conditional_json(request, etag, lambda: record, last_modified=entry.closed_at)
     
     # Проверяем права доступа
     if not ticket.can_be_viewed_by(current_user):
@@ -247,28 +468,50 @@ async def get_ticket(
             detail="Недостаточно прав для просмотра тикета"
         )
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        assigned_user=ticket.assigned_user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
+    return conditional_json(
+        request,
+        make_etag(ticket_version(ticket)),
+        lambda: serialize_ticket(ticket),
+        last_modified=ticket.updated_at
     )
 
 
+@router.get("/{ticket_id}/history")
+async def get_ticket_history(
+    ticket_id: uuid.UUID,
+    current_user: User = Depends(require_helper),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    История событий тикета и время в каждом статусе.
+    
+    Доступна и для тикетов в холодном архиве - история хранится отдельно.
+    
+    Args:
+        ticket_id: ID тикета
+        current_user: Текущий пользователь (должен быть персоналом)
+        db: Сессия базы данных
+        
+    Returns:
+        dict: События и время в статусах (секунды)
+    """
+    event_service = TicketEventService(db)
+    
+    events = await event_service.get_timeline(ticket_id)
+    if not events:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="История тикета не найдена"
+        )
+    
+    time_in_status = await event_service.get_time_in_status(ticket_id)
+    
+    return FastJSONResponse({
+        "events": [serialize_ticket_event(event) for event in events],
+        "time_in_status": time_in_status,
+    })
+
+
 @router.put("/{ticket_id}", response_model=TicketResponse)
 async def update_ticket(
     ticket_id: uuid.UUID,
@@ -305,31 +548,12 @@ async def update_ticket(
         )
     
     # Обновляем тикет
-    ticket = await ticket_service.update_ticket(ticket, ticket_data)
+    ticket = await ticket_service.update_ticket(ticket, ticket_data, actor=current_user)
     
     # Загружаем связанные объекты для ответа
     ticket = await ticket_service.get_ticket_by_id(ticket.id)
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        assigned_user=ticket.assigned_user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
-    )
+    return FastJSONResponse(serialize_ticket(ticket))
 
 
 @router.post("/{ticket_id}/assign", response_model=TicketResponse)
@@ -379,31 +603,12 @@ async def assign_ticket(
             )
     
     # Назначаем тикет
-    ticket = await ticket_service.assign_ticket(ticket, assigned_user)
+    ticket = await ticket_service.assign_ticket(ticket, assigned_user, actor=current_user)
     
     # Загружаем связанные объекты для ответа
     ticket = await ticket_service.get_ticket_by_id(ticket.id)
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        assigned_user=ticket.assigned_user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
-    )
+    return FastJSONResponse(serialize_ticket(ticket))
 
 
 @router.post("/{ticket_id}/close", response_model=TicketResponse)
@@ -440,31 +645,12 @@ async def close_ticket(
         )
     
     # Закрываем тикет
-    ticket = await ticket_service.close_ticket(ticket)
+    ticket = await ticket_service.close_ticket(ticket, actor=current_user)
     
     # Загружаем связанные объекты для ответа
     ticket = await ticket_service.get_ticket_by_id(ticket.id)
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        assigned_user=ticket.assigned_user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
-    )
+    return FastJSONResponse(serialize_ticket(ticket))
 
 
 @router.post("/{ticket_id}/reopen", response_model=TicketResponse)
@@ -494,31 +680,12 @@ async def reopen_ticket(
         )
     
     # Открываем тикет заново
-    ticket = await ticket_service.reopen_ticket(ticket)
+    ticket = await ticket_service.reopen_ticket(ticket, actor=current_user)
     
     # Загружаем связанные объекты для ответа
     ticket = await ticket_service.get_ticket_by_id(ticket.id)
     
-    return TicketResponse(
-        id=ticket.id,
-        title=ticket.title,
-        description=ticket.description,
-        category_id=ticket.category_id,
-        priority=ticket.priority,
-        user_id=ticket.user_id,
-        assigned_to=ticket.assigned_to,
-        status=ticket.status,
-        created_at=ticket.created_at,
-        updated_at=ticket.updated_at,
-        closed_at=ticket.closed_at,
-        user=ticket.user,
-        assigned_user=ticket.assigned_user,
-        category=ticket.category,
-        is_active=ticket.is_active,
-        is_assigned=ticket.is_assigned,
-        display_title=ticket.display_title,
-        short_description=ticket.short_description
-    )
+    return FastJSONResponse(serialize_ticket(ticket))
 
 
 @router.get("/stats/overview")
@@ -543,4 +710,37 @@ async def get_tickets_statistics(
     return {
         "success": True,
         "data": stats
+    }
+
+
+@router.get("/stats/metrics")
+async def get_support_metrics(
+    current_user: User = Depends(require_helper),
+    db: AsyncSession = Depends(get_db_session)
+):
+    """
+    Получение материализованных метрик поддержки.
+    
+    Время первого ответа, время решения, бэклог по дням и пропускная
+    способность исполнителей из последнего пакетного расчета.
+    
+    Args:
+        current_user: Текущий пользователь (должен быть персоналом)
+        db: Сессия базы данных
+        
+    Returns:
+        dict: Сводка метрик
+    """
+    analytics_service = AnalyticsService(db)
+    
+    summary = await analytics_service.get_summary()
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Метрики еще не рассчитаны"
+        )
+    
+    return {
+        "success": True,
+        "data": summary
     }
\ No newline at end of file
@@ -4,8 +4,9 @@
 FastAPI приложение для управления системой поддержки через Telegram Mini App.
 """
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, Request
@@ -16,11 +17,16 @@ from fastapi.staticfiles import StaticFiles
 import uvicorn
 
 from tikethet.config import get_settings
+from tikethet.api.compression import CompressionMiddleware, PrecompressedStaticFiles
+from tikethet.telegram.runtime import create_bot_runtime, create_webhook_router
 
 
 # Инициализация настроек
 settings = get_settings()
 
+# Telegram бот в webhook режиме (None - бот запущен отдельно или выключен)
+bot_runtime = create_bot_runtime(settings)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -50,10 +56,51 @@ async def lifespan(app: FastAPI):
     logger.info(f"Application started in {settings.environment} mode")
     logger.info(f"Debug mode: {settings.debug}")
     
+    from tikethet.database import AsyncSessionLocal, engine
+    from tikethet.services.category_service import category_cache
+    
+    # Прогрев справочника категорий
+    try:
+        async with AsyncSessionLocal() as session:
+            await category_cache.ensure_loaded(session)
+        logger.info("Category cache warmed")
+    except Exception as e:
+        logger.warning(f"Category cache warm-up failed: {e}")
+    
+    # Фоновые задачи обслуживания
+    from tikethet.services.partition_service import partition_maintenance_loop
+    from tikethet.services.archive_service import archive_loop
+    from tikethet.services.analytics_service import analytics_loop
+    from tikethet.services.sla_service import sla_monitor
+    from tikethet.telegram.leader import run_as_leader, MAINTENANCE_LOCK_KEY
+
+    # Архивация и пересчет аналитики - в одном воркере (advisory lock)
+    def maintenance_jobs() -> list:
+        return [archive_loop(AsyncSessionLocal), analytics_loop(AsyncSessionLocal)]
+
+    background_tasks = [
+        asyncio.create_task(partition_maintenance_loop(AsyncSessionLocal)),
+        asyncio.create_task(run_as_leader(engine, maintenance_jobs, key=MAINTENANCE_LOCK_KEY)),
+        asyncio.create_task(sla_monitor.run(AsyncSessionLocal)),
+    ]
+    
+    # Бот в процессе API: общие движок БД, кэши и лимитер Telegram
+    if bot_runtime is not None:
+        try:
+            await bot_runtime.start()
+        except Exception as e:
+            logger.error(f"Embedded bot startup failed: {e}", exc_info=True)
+    
     yield
     
     # Shutdown
     logger.info("Application shutting down")
+    if bot_runtime is not None:
+        await bot_runtime.stop()
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     print("Application shutting down")
 
 
@@ -85,10 +132,15 @@ async def add_ngrok_header(request, call_next):
     response = await call_next(request)
     response.headers["ngrok-skip-browser-warning"] = "true"
     
-    # Для мобильных браузеров - добавляем дополнительные заголовки
+    # Для мобильных браузеров - обязательная перепроверка кэша, если маршрут
+    # не задал собственную политику. no-cache (а не no-store) сохраняет
+    # условные запросы: при совпадении ETag клиент получает 304 без тела
     user_agent = request.headers.get("user-agent", "").lower()
-    if any(mobile in user_agent for mobile in ["mobile", "android", "iphone", "telegram"]):
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    if (
+        "cache-control" not in response.headers
+        and any(mobile in user_agent for mobile in ["mobile", "android", "iphone", "telegram"])
+    ):
+        response.headers["Cache-Control"] = "no-cache, must-revalidate"
         response.headers["Pragma"] = "no-cache"
     
     return response
@@ -101,15 +153,23 @@ app.add_middleware(
 )
 
 
+# Сжатие ответов API. Статика отдает заранее сжатые .br/.gz варианты
+# (scripts/precompress_assets.py), загрузки - уже сжатые форматы
+app.add_middleware(
+    CompressionMiddleware,
+    exclude_prefixes=("/static", "/app", "/uploads")
+)
+
+
 # Статические файлы
 static_path = Path("static")
 if static_path.exists():
-    app.mount("/static", StaticFiles(directory="static"), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 # Frontend файлы
 frontend_path = Path("frontend")
 if frontend_path.exists():
-    app.mount("/app", StaticFiles(directory="frontend"), name="frontend")
+    app.mount("/app", PrecompressedStaticFiles(directory="frontend"), name="frontend")
 
 
 # Uploads
@@ -196,6 +256,10 @@ app.include_router(tickets.router, prefix="/api/v1/tickets", tags=["tickets"])
 app.include_router(categories.router, prefix="/api/v1/categories", tags=["categories"])
 app.include_router(messages.router, prefix="/api/v1/tickets", tags=["messages"])
 
+# Webhook Telegram бота
+if bot_runtime is not None:
+    app.include_router(create_webhook_router(bot_runtime), tags=["telegram"])
+
 
 if __name__ == "__main__":
     """Запуск приложения для разработки."""
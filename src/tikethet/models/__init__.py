@@ -5,9 +5,17 @@ SQLAlchemy модели для Telegram Ticket Bot.
 from .base import BaseModel, Base
 from .user import User, UserRole
 from .category import Category  
-from .ticket import Ticket, TicketStatus, TicketPriority
+from .ticket import Ticket, TicketStatus, TicketPriority, ACTIVE_TICKET_STATUSES, INACTIVE_TICKET_STATUSES
 from .message import Message
 from .notification import Notification, NotificationType
+from .archived_ticket import ArchivedTicket
+from .metrics_summary import MetricsSummary
+from .ticket_rollup import TicketRollup, UNASSIGNED_ID
+from .ticket_event import TicketEvent, TicketEventType
+from .staff_skill import StaffCategorySkill
+from .outbox import OutboxMessage, OutboxStatus, DeliveryLane
+from .broadcast import Broadcast, BroadcastStatus
+from .stored_file import StoredFile
 
 # Экспорт всех моделей для использования в других модулях
 __all__ = [
@@ -19,7 +27,22 @@ __all__ = [
     "Ticket", 
     "TicketStatus",
     "TicketPriority",
+    "ACTIVE_TICKET_STATUSES",
+    "INACTIVE_TICKET_STATUSES",
     "Message",
     "Notification",
-    "NotificationType"
+    "NotificationType",
+    "ArchivedTicket",
+    "MetricsSummary",
+    "TicketRollup",
+    "UNASSIGNED_ID",
+    "TicketEvent",
+    "TicketEventType",
+    "StaffCategorySkill",
+    "OutboxMessage",
+    "OutboxStatus",
+    "DeliveryLane",
+    "Broadcast",
+    "BroadcastStatus",
+    "StoredFile"
 ]
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Модель индекса архивированных тикетов.
+"""
+
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import String, Integer, BigInteger, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class ArchivedTicket(BaseModel):
+    """
+    Запись индекса холодного архива.
+
+    Сам тикет с сообщениями хранится в сжатом сегменте под storage/data,
+    здесь - только координаты записи и поля для проверки прав доступа.
+    ID записи совпадает с ID архивированного тикета.
+    """
+
+    __tablename__ = "archived_tickets"
+
+    # Поля для проверки прав без чтения сегмента
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        index=True,
+        comment="ID автора тикета"
+    )
+
+    assigned_to: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID назначенного сотрудника"
+    )
+
+    closed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Дата закрытия тикета"
+    )
+
+    # Координаты записи в сегменте
+    segment: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Имя файла сегмента"
+    )
+
+    offset: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Смещение gzip-записи в сегменте"
+    )
+
+    length: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Длина gzip-записи в байтах"
+    )
+
+    def can_be_viewed_by(self, user: "User") -> bool:
+        """
+        Проверка, может ли пользователь просматривать архивный тикет.
+
+        Правила совпадают с Ticket.can_be_viewed_by.
+
+        Args:
+            user: Пользователь для проверки
+
+        Returns:
+            True если может просматривать
+        """
+        if self.user_id == user.id or self.assigned_to == user.id:
+            return True
+
+        from .user import UserRole
+        return user.role.can_access(UserRole.HELPER)
+
+    def __str__(self) -> str:
+        return f"ArchivedTicket #{self.id} in {self.segment}"
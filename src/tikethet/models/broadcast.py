@@ -0,0 +1,115 @@
+"""
+Модель массовой рассылки с сохранением прогресса.
+"""
+
+import enum
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class BroadcastStatus(str, enum.Enum):
+    """Статусы рассылки."""
+
+    RUNNING = "running"         # Выполняется (или прервана и ждет возобновления)
+    COMPLETED = "completed"     # Завершена
+    CANCELLED = "cancelled"     # Остановлена администратором
+
+    def __str__(self):
+        return self.value
+
+
+class Broadcast(BaseModel):
+    """
+    Массовая рассылка администратора.
+
+    Получатели обходятся по возрастанию users.id; last_user_id - контрольная
+    точка, до которой (включительно) все отправки завершены. Прерванная
+    рассылка продолжается с нее, повторно получить сообщение может только
+    последний незафиксированный пакет.
+    """
+
+    __tablename__ = "broadcasts"
+
+    created_by: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID администратора"
+    )
+
+    admin_chat_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Чат для отчета о прогрессе"
+    )
+
+    progress_message_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        nullable=True,
+        comment="ID сообщения с прогрессом (редактируется)"
+    )
+
+    text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="Текст рассылки (HTML)"
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=BroadcastStatus.RUNNING.value,
+        comment="Статус: running, completed, cancelled"
+    )
+
+    last_user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="Контрольная точка: последний обработанный users.id"
+    )
+
+    total: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Получателей на момент запуска"
+    )
+
+    sent_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Доставлено"
+    )
+
+    failed_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Не доставлено"
+    )
+
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Последняя контрольная точка исполнителя (аренда)"
+    )
+
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Время завершения"
+    )
+
+    @property
+    def processed(self) -> int:
+        """Обработано получателей."""
+        return self.sent_count + self.failed_count
+
+    def __str__(self) -> str:
+        return f"Broadcast {self.id} ({self.status}, {self.processed}/{self.total})"
+
+
+# Поиск прерванных рассылок для возобновления
+Index(
+    "ix_broadcasts_running",
+    Broadcast.heartbeat_at,
+    postgresql_where=Broadcast.status == BroadcastStatus.RUNNING.value
+)
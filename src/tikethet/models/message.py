@@ -5,7 +5,7 @@
 from typing import List, Dict, Any, Optional
 import uuid
 
-from sqlalchemy import String, Text, Boolean, JSON, ForeignKey
+from sqlalchemy import String, Text, Boolean, JSON, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -173,7 +173,8 @@ class Message(BaseModel):
         size: int, 
         content_type: str, 
         url: str,
-        file_id: Optional[str] = None
+        file_id: Optional[str] = None,
+        stored_file_id: Optional[uuid.UUID] = None
     ) -> Dict[str, Any]:
         """
         Создать данные вложения.
@@ -184,6 +185,7 @@ class Message(BaseModel):
             content_type: MIME тип файла
             url: URL для доступа к файлу
             file_id: ID файла в Telegram (опционально)
+            stored_file_id: ID сохраненного содержимого (опционально)
             
         Returns:
             Словарь с данными вложения
@@ -195,10 +197,15 @@ class Message(BaseModel):
             "content_type": content_type,
             "url": url,
             "telegram_file_id": file_id,
+            "stored_file_id": str(stored_file_id) if stored_file_id else None,
             "uploaded_at": __import__('datetime').datetime.now().isoformat()
         }
     
     def __str__(self) -> str:
         author_name = self.user.display_name if hasattr(self, 'user') and self.user else "Unknown"
         prefix = "[Internal] " if self.is_internal else ""
-        return f"{prefix}Message from {author_name}: {self.short_content}"
\ No newline at end of file
+        return f"{prefix}Message from {author_name}: {self.short_content}"
+
+
+# Лента сообщений тикета: WHERE ticket_id = ? ORDER BY created_at
+Index("ix_messages_ticket_id_created_at", Message.ticket_id, Message.created_at)
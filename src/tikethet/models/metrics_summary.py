@@ -0,0 +1,75 @@
+"""
+Модель материализованных метрик поддержки.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, Float, DateTime, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class MetricsSummary(BaseModel):
+    """
+    Строка сводки метрик, рассчитанной пакетной аналитикой.
+
+    Таблица небольшая и полностью перезаписывается при каждом расчете,
+    дашборд читает ее без обращения к тикетам и сообщениям.
+    """
+
+    __tablename__ = "metrics_summary"
+
+    name: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        comment="Имя метрики (first_response_minutes_p50, backlog, ...)"
+    )
+
+    dimension: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        default="total",
+        comment="Разрез: total, assignee"
+    )
+
+    dimension_value: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Значение разреза (ID сотрудника)"
+    )
+
+    bucket: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Начало дня для временных рядов"
+    )
+
+    value: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Значение метрики"
+    )
+
+    window_days: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Окно расчета в днях"
+    )
+
+    def __str__(self) -> str:
+        return f"{self.name}[{self.dimension}={self.dimension_value}] = {self.value}"
+
+
+# Одна строка на метрику, разрез и день: повторная вставка сводки
+# (параллельный пересчет) завершается ошибкой, а не дублями
+Index(
+    "uq_metrics_summary_key",
+    MetricsSummary.name,
+    MetricsSummary.dimension,
+    MetricsSummary.dimension_value,
+    MetricsSummary.bucket,
+    unique=True,
+    postgresql_nulls_not_distinct=True,
+)
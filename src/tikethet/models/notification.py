@@ -6,7 +6,7 @@ import enum
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, Text, Boolean, Enum, ForeignKey
+from sqlalchemy import String, Text, Boolean, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -285,4 +285,13 @@ class Notification(BaseModel):
         }
     
     def __str__(self) -> str:
-        return f"Notification {self.type.display_name} for user {self.user_id}"
\ No newline at end of file
+        return f"Notification {self.type.display_name} for user {self.user_id}"
+
+
+# Непрочитанные уведомления пользователя (частичный индекс)
+Index(
+    "ix_notifications_user_unread",
+    Notification.user_id,
+    Notification.created_at.desc(),
+    postgresql_where=Notification.is_read == False
+)
@@ -0,0 +1,117 @@
+"""
+Модель очереди исходящих сообщений Telegram (transactional outbox).
+"""
+
+import enum
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, SmallInteger, Integer, String, Text, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class DeliveryLane(enum.IntEnum):
+    """Полосы приоритета доставки (меньше - раньше)."""
+
+    CRITICAL = 0    # Алерты SLA и критические тикеты
+    NORMAL = 1      # Ответы и изменения по тикетам
+    BULK = 2        # Массовые рассылки
+
+
+class OutboxStatus(str, enum.Enum):
+    """Статусы исходящего сообщения."""
+
+    PENDING = "pending"     # Ожидает отправки (или повтора после not_before)
+    SENT = "sent"           # Доставлено
+    FAILED = "failed"       # Окончательно не доставлено
+
+    def __str__(self):
+        return self.value
+
+
+class OutboxMessage(BaseModel):
+    """
+    Исходящее сообщение бота.
+
+    Добавляется в той же транзакции, что и событие, которое его вызвало,
+    поэтому перезапуск процесса не теряет отправки. Диспетчер забирает
+    строки с истекшим not_before и продлевает его на время отправки
+    (аренда): строка, чей отправитель упал, будет отправлена повторно.
+    """
+
+    __tablename__ = "telegram_outbox"
+
+    chat_id: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Telegram chat ID получателя"
+    )
+
+    text: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        comment="Текст сообщения (HTML); для файла - подпись"
+    )
+
+    stored_file_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("stored_files.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Отправляемый файл (вместо текстового сообщения)"
+    )
+
+    lane: Mapped[int] = mapped_column(
+        SmallInteger,
+        nullable=False,
+        default=DeliveryLane.NORMAL,
+        comment="Полоса приоритета: 0 - critical, 1 - normal, 2 - bulk"
+    )
+
+    status: Mapped[str] = mapped_column(
+        String(16),
+        nullable=False,
+        default=OutboxStatus.PENDING.value,
+        comment="Статус: pending, sent, failed"
+    )
+
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        comment="Количество попыток отправки"
+    )
+
+    not_before: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        comment="Не отправлять раньше (повтор, retry-after, аренда)"
+    )
+
+    sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Время доставки"
+    )
+
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text,
+        nullable=True,
+        comment="Последняя ошибка отправки"
+    )
+
+    def __str__(self) -> str:
+        return f"OutboxMessage to {self.chat_id} ({self.status})"
+
+
+# Выборка готовых к отправке: только pending, по полосе и сроку
+Index(
+    "ix_telegram_outbox_pending",
+    OutboxMessage.lane,
+    OutboxMessage.not_before,
+    postgresql_where=OutboxMessage.status == OutboxStatus.PENDING.value
+)
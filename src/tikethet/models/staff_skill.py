@@ -0,0 +1,44 @@
+"""
+Модель специализации сотрудника по категориям тикетов.
+"""
+
+import uuid
+
+from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class StaffCategorySkill(BaseModel):
+    """
+    Категория, которую обслуживает сотрудник.
+
+    Сотрудник без строк специализации считается универсальным и
+    получает тикеты категорий, для которых нет профильных сотрудников.
+    """
+
+    __tablename__ = "staff_category_skills"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="ID сотрудника"
+    )
+
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+        comment="ID категории"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "category_id", name="uq_staff_category_skills_user_category"),
+    )
+
+    def __str__(self) -> str:
+        return f"StaffCategorySkill {self.user_id} -> {self.category_id}"
@@ -0,0 +1,83 @@
+"""
+Модель сохраненного файла вложения.
+"""
+
+import uuid
+from typing import Optional
+
+from sqlalchemy import BigInteger, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class StoredFile(BaseModel):
+    """
+    Содержимое вложения на диске.
+
+    Один файл хранится один раз на каждое уникальное содержимое
+    (sha256) - одинаковые вложения разных сообщений ссылаются на одну
+    строку. Идентификаторы Telegram позволяют не скачивать уже
+    известный файл повторно и отправлять его по file_id без загрузки
+    байтов.
+    """
+
+    __tablename__ = "stored_files"
+
+    sha256: Mapped[str] = mapped_column(
+        String(64),
+        nullable=False,
+        unique=True,
+        comment="SHA-256 содержимого (hex)"
+    )
+
+    size: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        comment="Размер в байтах"
+    )
+
+    content_type: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        default="application/octet-stream",
+        comment="MIME тип"
+    )
+
+    path: Mapped[str] = mapped_column(
+        String(255),
+        nullable=False,
+        comment="Путь относительно каталога загрузок"
+    )
+
+    telegram_file_id: Mapped[Optional[str]] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="file_id для повторной отправки ботом"
+    )
+
+    telegram_file_unique_id: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="file_unique_id Telegram (постоянный для содержимого)"
+    )
+
+    uploaded_by: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        comment="Пользователь, впервые загрузивший содержимое"
+    )
+
+    def __str__(self) -> str:
+        return f"StoredFile {self.sha256[:12]} ({self.size} bytes)"
+
+
+# Поиск уже скачанного файла по идентификатору Telegram
+Index(
+    "uq_stored_files_telegram_file_unique_id",
+    StoredFile.telegram_file_unique_id,
+    unique=True,
+    postgresql_where=StoredFile.telegram_file_unique_id.isnot(None)
+)
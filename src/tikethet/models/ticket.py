@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 import uuid
 
-from sqlalchemy import String, Text, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import String, Text, Boolean, DateTime, Enum, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -53,7 +53,21 @@ class TicketStatus(enum.Enum):
     @property
     def is_active(self) -> bool:
         """Является ли статус активным (не закрытым)."""
-        return self in [TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING_RESPONSE]
+        return self in ACTIVE_TICKET_STATUSES
+
+
+# Статусы "живой" работы персонала (используются в частичных индексах)
+ACTIVE_TICKET_STATUSES = (
+    TicketStatus.OPEN,
+    TicketStatus.IN_PROGRESS,
+    TicketStatus.WAITING_RESPONSE,
+)
+
+# Завершенные тикеты - читаются только через архивный путь
+INACTIVE_TICKET_STATUSES = (
+    TicketStatus.RESOLVED,
+    TicketStatus.CLOSED,
+)
 
 
 class TicketPriority(enum.Enum):
@@ -180,6 +194,13 @@ class Ticket(BaseModel):
         comment="Дата закрытия тикета"
     )
     
+    # Ключ идемпотентности внешнего источника (tg:<chat_id>:<message_id>)
+    external_id: Mapped[Optional[str]] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Ключ дедупликации тикетов из бота"
+    )
+    
     # Связи с другими моделями (lazy loading)
     user = relationship("User", foreign_keys=[user_id], back_populates="tickets")
     assigned_user = relationship("User", foreign_keys=[assigned_to], back_populates="assigned_tickets")
@@ -268,4 +289,51 @@ class Ticket(BaseModel):
         return user.role.can_access(UserRole.MODERATOR)
     
     def __str__(self) -> str:
-        return f"Ticket #{self.id} - {self.title} ({self.status.display_name})"
\ No newline at end of file
+        return f"Ticket #{self.id} - {self.title} ({self.status.display_name})"
+
+
+# Составные и частичные индексы под реальные запросы TicketService
+# (миграция: deployment/alembic/versions/0001_composite_indexes.py)
+Index(
+    "ix_tickets_user_id_created_at",
+    Ticket.user_id,
+    Ticket.created_at.desc()
+)
+Index(
+    "ix_tickets_assigned_status_priority_created",
+    Ticket.assigned_to,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.created_at
+)
+Index(
+    "ix_tickets_active_priority_created",
+    Ticket.priority.desc(),
+    Ticket.created_at.desc(),
+    postgresql_where=Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+)
+Index(
+    "ix_tickets_active_user_status",
+    Ticket.user_id,
+    Ticket.status,
+    postgresql_where=Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+)
+Index(
+    "ix_tickets_active_assigned",
+    Ticket.assigned_to,
+    Ticket.priority.desc(),
+    Ticket.created_at.desc(),
+    postgresql_where=Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+)
+Index(
+    "ix_tickets_archive_finished_at",
+    func.coalesce(Ticket.closed_at, Ticket.updated_at).desc(),
+    Ticket.id.desc(),
+    postgresql_where=Ticket.status.in_(INACTIVE_TICKET_STATUSES)
+)
+Index(
+    "uq_tickets_external_id",
+    Ticket.external_id,
+    unique=True,
+    postgresql_where=Ticket.external_id.isnot(None)
+)
@@ -0,0 +1,119 @@
+"""
+Модель истории событий тикета.
+"""
+
+import enum
+from typing import Optional
+import uuid
+
+from sqlalchemy import BigInteger, Enum, Identity, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+from .ticket import TicketStatus
+
+
+class TicketEventType(enum.Enum):
+    """Типы событий тикета."""
+
+    CREATED = "CREATED"                     # Тикет создан
+    STATUS_CHANGED = "STATUS_CHANGED"       # Статус изменен
+    ASSIGNED = "ASSIGNED"                   # Назначен (или снят) исполнитель
+    FIRST_RESPONSE = "FIRST_RESPONSE"       # Первый публичный ответ персонала
+    SLA_BREACHED = "SLA_BREACHED"           # Нарушен срок первого ответа
+
+    def __str__(self):
+        return self.value
+
+
+class TicketEvent(BaseModel):
+    """
+    Событие в истории тикета (только добавление, без изменений).
+
+    Время события - created_at. События одной транзакции получают
+    одинаковый now(), поэтому порядок внутри момента задает
+    монотонный seq. Внешнего ключа на tickets нет: история
+    сохраняется после переноса тикета в холодный архив.
+    """
+
+    __tablename__ = "ticket_events"
+
+    ticket_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        comment="ID тикета"
+    )
+
+    event_type: Mapped[TicketEventType] = mapped_column(
+        Enum(TicketEventType),
+        nullable=False,
+        comment="Тип события"
+    )
+
+    from_status: Mapped[Optional[TicketStatus]] = mapped_column(
+        Enum(TicketStatus),
+        nullable=True,
+        comment="Статус до события"
+    )
+
+    to_status: Mapped[Optional[TicketStatus]] = mapped_column(
+        Enum(TicketStatus),
+        nullable=True,
+        comment="Статус после события"
+    )
+
+    actor_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID пользователя, вызвавшего событие"
+    )
+
+    assigned_to: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=True,
+        comment="ID исполнителя после события"
+    )
+
+    seq: Mapped[int] = mapped_column(
+        BigInteger,
+        Identity(),
+        nullable=False,
+        comment="Порядок записи (при равном created_at)"
+    )
+
+    def __str__(self) -> str:
+        return f"TicketEvent {self.event_type} for ticket {self.ticket_id}"
+
+
+# Хронология тикета и время в статусе (LEAD по ticket_id)
+Index(
+    "ix_ticket_events_ticket_created",
+    TicketEvent.ticket_id,
+    TicketEvent.created_at,
+    TicketEvent.seq,
+)
+
+# SLA отчеты по типу события за период
+Index(
+    "ix_ticket_events_type_created",
+    TicketEvent.event_type,
+    TicketEvent.created_at,
+)
+
+# Не более одного первого ответа на тикет (ON CONFLICT DO NOTHING)
+Index(
+    "uq_ticket_events_first_response",
+    TicketEvent.ticket_id,
+    unique=True,
+    postgresql_where=TicketEvent.event_type == TicketEventType.FIRST_RESPONSE
+)
+
+# Не более одного нарушения SLA на тикет: уведомление отправляет только
+# процесс, чья вставка прошла
+Index(
+    "uq_ticket_events_sla_breach",
+    TicketEvent.ticket_id,
+    unique=True,
+    postgresql_where=TicketEvent.event_type == TicketEventType.SLA_BREACHED
+)
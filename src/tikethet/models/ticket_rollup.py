@@ -0,0 +1,89 @@
+"""
+Модель предагрегированных счетчиков тикетов по временным корзинам.
+"""
+
+from datetime import datetime
+import uuid
+
+from sqlalchemy import String, Integer, DateTime, Enum, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+from .ticket import TicketPriority
+
+
+# Значение assigned_to для неназначенных тикетов: NULL не участвует
+# в уникальном ключе, поэтому upsert по нему невозможен
+UNASSIGNED_ID = uuid.UUID(int=0)
+
+
+class TicketRollup(BaseModel):
+    """
+    Счетчики переходов тикетов за час или день.
+
+    Одна строка на (гранулярность, корзина, категория, приоритет,
+    исполнитель). Заполняется инкрементально при смене состояния
+    тикета в той же транзакции, что и сама смена.
+    """
+
+    __tablename__ = "ticket_rollups"
+
+    granularity: Mapped[str] = mapped_column(
+        String(8),
+        nullable=False,
+        comment="Гранулярность корзины: hour, day"
+    )
+
+    bucket: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        comment="Начало корзины (UTC)"
+    )
+
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        comment="ID категории"
+    )
+
+    priority: Mapped[TicketPriority] = mapped_column(
+        Enum(TicketPriority),
+        nullable=False,
+        comment="Приоритет тикета"
+    )
+
+    assigned_to: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        nullable=False,
+        default=UNASSIGNED_ID,
+        comment="ID исполнителя (UNASSIGNED_ID - не назначен)"
+    )
+
+    # Счетчики переходов
+    created_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Создано тикетов"
+    )
+
+    resolved_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Решено тикетов"
+    )
+
+    closed_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Закрыто тикетов"
+    )
+
+    reopened_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, comment="Открыто повторно"
+    )
+
+    # Ключ upsert; префикс (granularity, bucket) обслуживает запросы по диапазону
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket", "category_id", "priority", "assigned_to",
+            name="uq_ticket_rollups_key"
+        ),
+    )
+
+    def __str__(self) -> str:
+        return f"TicketRollup {self.granularity} {self.bucket:%Y-%m-%d %H:00}"
@@ -2,7 +2,7 @@
 Схемы для категорий тикетов.
 """
 
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 import uuid
 
@@ -25,4 +25,13 @@ class CategoryResponse(BaseModel):
     # Computed field
     display_name: str = Field(description="Отображаемое название с иконкой")
     
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+class CategoryStaffUpdate(BaseModel):
+    """Схема замены профильных сотрудников категории."""
+    
+    user_ids: List[uuid.UUID] = Field(
+        default_factory=list,
+        description="ID сотрудников (HELPER+), обслуживающих категорию"
+    )
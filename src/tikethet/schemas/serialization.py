@@ -0,0 +1,237 @@
+"""
+Сериализация ORM объектов в словари ответов API.
+
+Словари строятся напрямую из ORM строк, минуя повторную валидацию
+Pydantic, и совпадают с model_dump(mode="json") соответствующих схем
+(TicketResponse, MessageResponse и т.д.). Модуль не зависит от HTTP
+слоя: им пользуются и маршруты API, и сервисы (архив, справочники).
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import inspect
+
+from tikethet.models.category import Category
+from tikethet.models.message import Message
+from tikethet.models.ticket import Ticket
+from tikethet.models.ticket_event import TicketEvent
+from tikethet.models.user import User
+
+
+def _is_loaded(obj: Any, attribute: str) -> bool:
+    """Загружен ли атрибут (связь) без обращения к базе данных."""
+    return attribute not in inspect(obj).unloaded
+
+
+def serialize_user(user: Optional[User]) -> Optional[Dict[str, Any]]:
+    """
+    Сериализация пользователя в формат UserResponse.
+
+    Args:
+        user: Пользователь или None
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные пользователя
+    """
+    if user is None:
+        return None
+
+    return {
+        "telegram_id": user.telegram_id,
+        "username": user.username,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "language_code": user.language_code,
+        "is_premium": user.is_premium,
+        "id": user.id,
+        "role": user.role,
+        "is_active": user.is_active,
+        "avatar_url": user.avatar_url,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+        "full_name": user.full_name,
+        "display_name": user.display_name,
+    }
+
+
+def serialize_category(category: Optional[Category]) -> Optional[Dict[str, Any]]:
+    """
+    Сериализация категории в формат CategoryResponse.
+
+    Args:
+        category: Категория или None
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные категории
+    """
+    if category is None:
+        return None
+
+    return {
+        "id": category.id,
+        "name": category.name,
+        "description": category.description,
+        "icon": category.icon,
+        "color": category.color,
+        "is_active": category.is_active,
+        "sort_order": category.sort_order,
+        "created_at": category.created_at,
+        "updated_at": category.updated_at,
+        "display_name": category.display_name,
+    }
+
+
+class _RelatedCache:
+    """Кэш сериализованных связанных объектов в пределах одного ответа."""
+
+    def __init__(self):
+        self.users: Dict[Any, Optional[Dict[str, Any]]] = {}
+        self.categories: Dict[Any, Optional[Dict[str, Any]]] = {}
+
+    def user(self, user: Optional[User]) -> Optional[Dict[str, Any]]:
+        if user is None:
+            return None
+        if user.id not in self.users:
+            self.users[user.id] = serialize_user(user)
+        return self.users[user.id]
+
+    def category(self, category: Optional[Category]) -> Optional[Dict[str, Any]]:
+        if category is None:
+            return None
+        if category.id not in self.categories:
+            self.categories[category.id] = serialize_category(category)
+        return self.categories[category.id]
+
+
+def serialize_ticket(ticket: Ticket, _cache: Optional[_RelatedCache] = None) -> Dict[str, Any]:
+    """
+    Сериализация тикета в формат TicketResponse.
+
+    Незагруженные связи отдаются как null (без ленивой загрузки).
+
+    Args:
+        ticket: Тикет
+        _cache: Кэш связанных объектов (для списков)
+
+    Returns:
+        Dict[str, Any]: Данные тикета
+    """
+    cache = _cache or _RelatedCache()
+
+    return {
+        "title": ticket.title,
+        "description": ticket.description,
+        "category_id": ticket.category_id,
+        "priority": ticket.priority,
+        "id": ticket.id,
+        "user_id": ticket.user_id,
+        "assigned_to": ticket.assigned_to,
+        "status": ticket.status,
+        "created_at": ticket.created_at,
+        "updated_at": ticket.updated_at,
+        "closed_at": ticket.closed_at,
+        "user": cache.user(ticket.user) if _is_loaded(ticket, "user") else None,
+        "assigned_user": (
+            cache.user(ticket.assigned_user) if _is_loaded(ticket, "assigned_user") else None
+        ),
+        "category": cache.category(ticket.category) if _is_loaded(ticket, "category") else None,
+        "is_active": ticket.is_active,
+        "is_assigned": ticket.is_assigned,
+        "display_title": ticket.display_title,
+        "short_description": ticket.short_description,
+    }
+
+
+def serialize_ticket_page(
+    tickets: Iterable[Ticket],
+    total: int,
+    skip: int,
+    limit: int
+) -> Dict[str, Any]:
+    """
+    Сериализация страницы тикетов в формат TicketListResponse.
+
+    Args:
+        tickets: Тикеты страницы
+        total: Общее количество
+        skip: Количество пропущенных элементов
+        limit: Лимит элементов на странице
+
+    Returns:
+        Dict[str, Any]: Пагинированный ответ
+    """
+    cache = _RelatedCache()
+    items = [serialize_ticket(ticket, cache) for ticket in tickets]
+
+    return {
+        "items": items,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "has_more": (skip + len(items)) < total,
+    }
+
+
+def serialize_message(message: Message, _cache: Optional[_RelatedCache] = None) -> Dict[str, Any]:
+    """
+    Сериализация сообщения в формат MessageResponse.
+
+    Args:
+        message: Сообщение
+        _cache: Кэш связанных объектов (для списков)
+
+    Returns:
+        Dict[str, Any]: Данные сообщения
+    """
+    cache = _cache or _RelatedCache()
+    attachments = message.attachments or []
+
+    return {
+        "content": message.content,
+        "attachments": attachments,
+        "is_internal": message.is_internal,
+        "id": message.id,
+        "ticket_id": message.ticket_id,
+        "user_id": message.user_id,
+        "created_at": message.created_at,
+        "user": cache.user(message.user) if _is_loaded(message, "user") else None,
+        "has_attachments": bool(attachments),
+        "attachment_count": len(attachments),
+        "short_content": message.short_content,
+    }
+
+
+def serialize_messages(messages: Iterable[Message]) -> list:
+    """
+    Сериализация списка сообщений с общим кэшем авторов.
+
+    Args:
+        messages: Сообщения
+
+    Returns:
+        list: Данные сообщений
+    """
+    cache = _RelatedCache()
+    return [serialize_message(message, cache) for message in messages]
+
+
+def serialize_ticket_event(event: TicketEvent) -> Dict[str, Any]:
+    """
+    Сериализация события истории тикета.
+
+    Args:
+        event: Событие
+
+    Returns:
+        Dict[str, Any]: Данные события
+    """
+    return {
+        "id": event.id,
+        "ticket_id": event.ticket_id,
+        "event_type": event.event_type,
+        "from_status": event.from_status,
+        "to_status": event.to_status,
+        "actor_id": event.actor_id,
+        "assigned_to": event.assigned_to,
+        "created_at": event.created_at,
+    }
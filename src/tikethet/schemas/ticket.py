@@ -88,4 +88,5 @@ class TicketFilter(BaseModel):
     category_id: Optional[uuid.UUID] = Field(None, description="Фильтр по категории")
     assigned_to: Optional[uuid.UUID] = Field(None, description="Фильтр по назначенному")
     user_id: Optional[uuid.UUID] = Field(None, description="Фильтр по автору")
-    search: Optional[str] = Field(None, description="Поиск по заголовку и описанию")
\ No newline at end of file
+    search: Optional[str] = Field(None, description="Поиск по заголовку и описанию")
+    active_only: bool = Field(False, description="Только активные тикеты (OPEN, IN_PROGRESS, WAITING_RESPONSE)")
\ No newline at end of file
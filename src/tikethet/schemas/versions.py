@@ -0,0 +1,87 @@
+"""
+Версии строк для валидации кэша (ETag / Last-Modified).
+
+Версия строки - (ID, updated_at), поэтому ETag набора строк вычисляется
+без сериализации тела и совпадает во всех процессах.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from tikethet.schemas.serialization import _is_loaded
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Построение слабого ETag из частей версии ресурса.
+
+    ETag слабый (W/), так как тело может сжиматься middleware.
+
+    Args:
+        *parts: Значения, определяющие версию ресурса
+
+    Returns:
+        str: ETag в формате W/"<hash>"
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(repr(part).encode("utf-8"))
+        digest.update(b"\x1f")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def row_version(obj: Any) -> tuple:
+    """Версия строки: (id, updated_at)."""
+    if obj is None:
+        return (None,)
+    return (obj.id, obj.updated_at)
+
+
+def _related_version(obj: Any, attribute: str) -> tuple:
+    """Версия связанной строки (только если связь уже загружена)."""
+    if not _is_loaded(obj, attribute):
+        return (None,)
+    return row_version(getattr(obj, attribute))
+
+
+def ticket_version(ticket: Any) -> tuple:
+    """
+    Версия тикета вместе со вложенными в ответ связями.
+
+    Args:
+        ticket: Тикет
+
+    Returns:
+        tuple: Версии тикета, автора, исполнителя и категории
+    """
+    return (
+        row_version(ticket),
+        _related_version(ticket, "user"),
+        _related_version(ticket, "assigned_user"),
+        _related_version(ticket, "category"),
+    )
+
+
+def message_version(message: Any) -> tuple:
+    """Версия сообщения вместе с автором."""
+    return (row_version(message), _related_version(message, "user"))
+
+
+def rows_etag(rows: Iterable[Any], *extra: Any) -> str:
+    """
+    ETag для набора строк.
+
+    Args:
+        rows: Строки (объекты с id и updated_at) или готовые кортежи версий
+        *extra: Дополнительные части версии (total, пагинация и т.п.)
+
+    Returns:
+        str: ETag
+    """
+    return make_etag(*extra, *(row if isinstance(row, tuple) else row_version(row) for row in rows))
+
+
+def latest_modified(rows: Iterable[Any]) -> Optional[datetime]:
+    """Максимальный updated_at среди строк."""
+    return max((row.updated_at for row in rows if row.updated_at is not None), default=None)
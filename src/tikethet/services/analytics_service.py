@@ -0,0 +1,303 @@
+"""
+Пакетная аналитика метрик поддержки.
+
+Тикеты и сообщения читаются серверным курсором в колоночные pandas
+фреймы, метрики считаются векторно (без циклов по тикетам) и
+материализуются в небольшую таблицу metrics_summary, которую дашборд
+читает одним запросом.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, delete, or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.message import Message
+from tikethet.models.metrics_summary import MetricsSummary
+from tikethet.models.ticket import Ticket, INACTIVE_TICKET_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Окно расчета метрик в днях
+ANALYTICS_WINDOW_DAYS = int(os.getenv("ANALYTICS_WINDOW_DAYS", "30"))
+
+# Размер пакета серверного курсора
+ANALYTICS_BATCH_SIZE = 5000
+
+# Ключ транзакционной блокировки перезаписи сводки
+SUMMARY_LOCK_KEY = 7_419_203_101
+
+TICKET_FRAME_COLUMNS = ("id", "user_id", "assigned_to", "status", "created_at", "updated_at", "closed_at")
+MESSAGE_FRAME_COLUMNS = ("ticket_id", "user_id", "is_internal", "created_at")
+
+INACTIVE_STATUS_VALUES = tuple(status.value for status in INACTIVE_TICKET_STATUSES)
+
+
+def _describe(name: str, values: pd.Series) -> List[Dict[str, Any]]:
+    """Количество, среднее и перцентили распределения."""
+    values = values.dropna()
+    if values.empty:
+        return [{"name": f"{name}_count", "value": 0.0}]
+
+    return [
+        {"name": f"{name}_count", "value": float(len(values))},
+        {"name": f"{name}_avg", "value": float(values.mean())},
+        {"name": f"{name}_p50", "value": float(values.quantile(0.5))},
+        {"name": f"{name}_p90", "value": float(values.quantile(0.9))},
+    ]
+
+
+def compute_metrics(
+    tickets: pd.DataFrame,
+    messages: pd.DataFrame,
+    now: datetime,
+    window_days: int
+) -> List[Dict[str, Any]]:
+    """
+    Векторный расчет метрик поддержки.
+
+    Время завершения тикета - closed_at, для решенных (RESOLVED) без
+    closed_at - updated_at.
+
+    Args:
+        tickets: Фрейм тикетов (TICKET_FRAME_COLUMNS)
+        messages: Фрейм публичных и внутренних сообщений (MESSAGE_FRAME_COLUMNS)
+        now: Момент расчета (UTC)
+        window_days: Окно расчета в днях
+
+    Returns:
+        List[Dict[str, Any]]: Строки для metrics_summary
+    """
+    window_start = pd.Timestamp(now - timedelta(days=window_days))
+    rows: List[Dict[str, Any]] = []
+
+    finished_at = tickets["closed_at"].where(
+        tickets["closed_at"].notna(),
+        tickets["updated_at"].where(tickets["status"].isin(INACTIVE_STATUS_VALUES))
+    )
+
+    # Время первого ответа: первое публичное сообщение не от автора тикета
+    created_by_id = tickets.set_index("id")["created_at"]
+    author_by_id = tickets.set_index("id")["user_id"]
+
+    public = messages[~messages["is_internal"].astype(bool)]
+    replies = public[public["user_id"].values != public["ticket_id"].map(author_by_id).values]
+    first_reply = replies.groupby("ticket_id")["created_at"].min()
+
+    in_window = created_by_id[created_by_id >= window_start]
+    first_response = (first_reply.reindex(in_window.index) - in_window).dt.total_seconds() / 60
+    rows += _describe("first_response_minutes", first_response)
+    rows.append({
+        "name": "unanswered_tickets",
+        "value": float(first_response.isna().sum()),
+    })
+
+    # Время решения тикетов, завершенных в окне
+    finished_in_window = finished_at >= window_start
+    resolution_hours = (
+        (finished_at - tickets["created_at"])[finished_in_window].dt.total_seconds() / 3600
+    )
+    rows += _describe("resolution_hours", resolution_hours)
+
+    # Бэклог на конец каждого дня: создано до конца дня минус завершено до конца дня
+    days = pd.date_range(window_start.floor("D"), pd.Timestamp(now).floor("D"), freq="D")
+    day_ends = (days + pd.Timedelta(days=1)).values
+    created_sorted = np.sort(tickets["created_at"].values)
+    finished_sorted = np.sort(finished_at.dropna().values)
+    backlog = (
+        np.searchsorted(created_sorted, day_ends, side="left")
+        - np.searchsorted(finished_sorted, day_ends, side="left")
+    )
+    rows += [
+        {"name": "backlog", "bucket": day.to_pydatetime(), "value": float(value)}
+        for day, value in zip(days, backlog)
+    ]
+
+    # Пропускная способность по исполнителям
+    assigned = tickets[finished_in_window & tickets["assigned_to"].notna()].assign(
+        resolution_hours=resolution_hours
+    )
+    per_assignee = assigned.groupby("assigned_to")["resolution_hours"].agg(["count", "median"])
+    for assignee_id, stats in per_assignee.iterrows():
+        rows.append({
+            "name": "throughput_tickets",
+            "dimension": "assignee",
+            "dimension_value": str(assignee_id),
+            "value": float(stats["count"]),
+        })
+        rows.append({
+            "name": "resolution_hours_p50",
+            "dimension": "assignee",
+            "dimension_value": str(assignee_id),
+            "value": float(stats["median"]),
+        })
+
+    return rows
+
+
+class AnalyticsService:
+    """Сервис расчета и чтения материализованных метрик."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _stream_frame(self, query, columns: tuple) -> pd.DataFrame:
+        """
+        Чтение результата запроса в DataFrame пакетами серверного курсора.
+
+        Args:
+            query: SELECT с колонками в порядке columns
+            columns: Имена колонок фрейма
+
+        Returns:
+            pd.DataFrame: Фрейм с колонками columns
+        """
+        result = await self.db.stream(
+            query.execution_options(yield_per=ANALYTICS_BATCH_SIZE)
+        )
+
+        chunks = []
+        async for partition in result.partitions():
+            chunks.append(pd.DataFrame.from_records(partition, columns=columns))
+
+        frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+
+        for column in columns:
+            if column.endswith("_at"):
+                frame[column] = pd.to_datetime(frame[column], utc=True)
+
+        return frame
+
+    async def load_frames(self, window_start: datetime) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Загрузка тикетов и сообщений, нужных для окна расчета.
+
+        Берутся тикеты, созданные в окне или не завершенные к его началу
+        (для бэклога), и сообщения тикетов, созданных в окне.
+
+        Args:
+            window_start: Начало окна
+
+        Returns:
+            tuple: (тикеты, сообщения)
+        """
+        tickets = await self._stream_frame(
+            select(
+                Ticket.id, Ticket.user_id, Ticket.assigned_to, Ticket.status,
+                Ticket.created_at, Ticket.updated_at, Ticket.closed_at
+            ).where(or_(
+                Ticket.created_at >= window_start,
+                Ticket.closed_at.is_(None),
+                Ticket.closed_at >= window_start
+            )),
+            TICKET_FRAME_COLUMNS
+        )
+        tickets["status"] = tickets["status"].map(lambda status: status.value).astype("category")
+
+        messages = await self._stream_frame(
+            select(
+                Message.ticket_id, Message.user_id, Message.is_internal, Message.created_at
+            ).where(and_(
+                Message.created_at >= window_start,
+                Message.ticket_id.in_(
+                    select(Ticket.id).where(Ticket.created_at >= window_start)
+                )
+            )),
+            MESSAGE_FRAME_COLUMNS
+        )
+
+        return tickets, messages
+
+    async def refresh_summary(self, window_days: int = ANALYTICS_WINDOW_DAYS) -> int:
+        """
+        Пересчет метрик и перезапись metrics_summary.
+
+        Удаление и вставка выполняются в одной транзакции - читатели
+        видят либо прежнюю, либо новую сводку целиком. Перезапись
+        сериализуется advisory lock: при READ COMMITTED параллельный
+        DELETE не видит строк другой транзакции, и сводки сложились бы.
+
+        Args:
+            window_days: Окно расчета в днях
+
+        Returns:
+            int: Количество записанных строк сводки
+        """
+        now = datetime.now(timezone.utc)
+        tickets, messages = await self.load_frames(now - timedelta(days=window_days))
+
+        rows = await asyncio.to_thread(compute_metrics, tickets, messages, now, window_days)
+
+        await self.db.execute(select(func.pg_advisory_xact_lock(SUMMARY_LOCK_KEY)))
+        await self.db.execute(delete(MetricsSummary))
+        self.db.add_all([
+            MetricsSummary(
+                name=row["name"],
+                dimension=row.get("dimension", "total"),
+                dimension_value=row.get("dimension_value"),
+                bucket=row.get("bucket"),
+                value=row["value"],
+                window_days=window_days
+            )
+            for row in rows
+        ])
+        await self.db.commit()
+
+        return len(rows)
+
+    async def get_summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Чтение материализованной сводки для дашборда.
+
+        Returns:
+            Optional[Dict[str, Any]]: Сводка или None, если расчет еще не выполнялся
+        """
+        result = await self.db.execute(
+            select(MetricsSummary).order_by(MetricsSummary.bucket)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return None
+
+        summary: Dict[str, Any] = {
+            "computed_at": max(row.created_at for row in rows),
+            "window_days": rows[0].window_days,
+            "totals": {},
+            "backlog": [],
+            "assignees": {},
+        }
+
+        for row in rows:
+            if row.bucket is not None:
+                summary["backlog"].append({"date": row.bucket.date(), "value": int(row.value)})
+            elif row.dimension == "assignee":
+                summary["assignees"].setdefault(row.dimension_value, {})[row.name] = row.value
+            else:
+                summary["totals"][row.name] = row.value
+
+        return summary
+
+
+async def analytics_loop(session_factory, interval_hours: float = 1) -> None:
+    """
+    Фоновая задача: пересчет метрик раз в interval_hours.
+
+    Args:
+        session_factory: Фабрика асинхронных сессий
+        interval_hours: Интервал между запусками
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                written = await AnalyticsService(session).refresh_summary()
+            logger.info(f"Support metrics refreshed: {written} summary rows")
+        except Exception as e:
+            logger.error(f"Analytics job failed: {e}", exc_info=True)
+
+        await asyncio.sleep(interval_hours * 3600)
@@ -0,0 +1,233 @@
+"""
+Сервис архивации закрытых тикетов в холодное хранилище.
+
+Тикеты, закрытые дольше ARCHIVE_AFTER_DAYS дней, вместе с сообщениями
+и метаданными вложений выгружаются в сжатые JSONL сегменты и удаляются
+из основных таблиц. Каждая запись сегмента - отдельный gzip member,
+поэтому тикет читается по смещению без распаковки всего файла.
+"""
+
+import asyncio
+import gzip
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+import orjson
+from sqlalchemy import select, delete, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from tikethet.models.archived_ticket import ArchivedTicket
+from tikethet.models.message import Message
+from tikethet.models.ticket import Ticket, TicketStatus
+from tikethet.schemas.serialization import serialize_ticket, serialize_messages
+
+logger = logging.getLogger(__name__)
+
+# Через сколько дней после закрытия тикет уходит в архив
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+
+# Каталог сегментов архива
+ARCHIVE_PATH = Path(os.getenv("ARCHIVE_PATH", "storage/data/archive"))
+
+# Сколько тикетов выгружать в один сегмент
+ARCHIVE_BATCH_SIZE = 500
+
+
+class ArchiveService:
+    """Сервис для выгрузки закрытых тикетов в архив и их чтения обратно."""
+
+    def __init__(self, db: AsyncSession, archive_path: Path = ARCHIVE_PATH):
+        self.db = db
+        self.archive_path = archive_path
+
+    @staticmethod
+    def build_record(ticket: Ticket) -> Dict[str, Any]:
+        """
+        Формирование архивной записи тикета.
+
+        Формат совпадает с ответом API, поэтому восстановление не требует
+        повторного обращения к связанным таблицам.
+
+        Args:
+            ticket: Тикет с загруженными связями и сообщениями
+
+        Returns:
+            Dict[str, Any]: Запись для сериализации через orjson
+        """
+        record = serialize_ticket(ticket)
+        record["messages"] = serialize_messages(
+            sorted(ticket.messages, key=lambda m: m.created_at)
+        )
+        return record
+
+    def _write_segment(self, records: List[Dict[str, Any]]) -> tuple[str, List[tuple[int, int]]]:
+        """
+        Запись сегмента на диск (блокирующая операция).
+
+        Args:
+            records: Архивные записи
+
+        Returns:
+            tuple: (имя сегмента, [(смещение, длина) для каждой записи])
+        """
+        self.archive_path.mkdir(parents=True, exist_ok=True)
+
+        segment = f"tickets-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+        tmp_path = self.archive_path / f"{segment}.tmp"
+
+        positions = []
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                line = orjson.dumps(record, option=orjson.OPT_UTC_Z) + b"\n"
+                member = gzip.compress(line)
+                positions.append((f.tell(), len(member)))
+                f.write(member)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Сегмент появляется атомарно - недописанных файлов в архиве не бывает
+        os.replace(tmp_path, self.archive_path / segment)
+
+        return segment, positions
+
+    def _read_record(self, segment: str, offset: int, length: int) -> Dict[str, Any]:
+        """Чтение одной записи из сегмента (блокирующая операция)."""
+        with open(self.archive_path / segment, "rb") as f:
+            f.seek(offset)
+            member = f.read(length)
+
+        return orjson.loads(gzip.decompress(member))
+
+    async def archive_closed_tickets(
+        self,
+        older_than_days: int = ARCHIVE_AFTER_DAYS,
+        batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """
+        Выгрузка давно закрытых тикетов в архив.
+
+        Сегмент записывается и синхронизируется с диском до удаления
+        строк из базы: при сбое в худшем случае останется лишний сегмент,
+        но не потерянный тикет. Пакет блокируется FOR UPDATE SKIP LOCKED
+        до коммита: параллельный запуск берет другие тикеты и не пишет
+        дублирующих сегментов.
+
+        Args:
+            older_than_days: Минимальный возраст закрытия в днях
+            batch_size: Размер пакета (тикетов на сегмент)
+
+        Returns:
+            int: Количество архивированных тикетов
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        archived = 0
+
+        while True:
+            result = await self.db.execute(
+                select(Ticket)
+                .where(and_(
+                    Ticket.status == TicketStatus.CLOSED,
+                    Ticket.closed_at < cutoff
+                ))
+                .options(
+                    selectinload(Ticket.user),
+                    selectinload(Ticket.assigned_user),
+                    selectinload(Ticket.category),
+                    selectinload(Ticket.messages).selectinload(Message.user)
+                )
+                .order_by(Ticket.closed_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            tickets = result.scalars().all()
+            if not tickets:
+                break
+
+            records = [self.build_record(ticket) for ticket in tickets]
+            segment, positions = await asyncio.to_thread(self._write_segment, records)
+
+            entries = [
+                ArchivedTicket(
+                    id=ticket.id,
+                    user_id=ticket.user_id,
+                    assigned_to=ticket.assigned_to,
+                    closed_at=ticket.closed_at,
+                    segment=segment,
+                    offset=offset,
+                    length=length
+                )
+                for ticket, (offset, length) in zip(tickets, positions)
+            ]
+            ticket_ids = [ticket.id for ticket in tickets]
+
+            # Тикеты (с сообщениями по каскаду) больше не отслеживаются сессией
+            for ticket in tickets:
+                self.db.expunge(ticket)
+
+            self.db.add_all(entries)
+
+            # Сообщения и уведомления удаляются каскадом на стороне БД
+            await self.db.execute(delete(Ticket).where(Ticket.id.in_(ticket_ids)))
+            await self.db.commit()
+
+            archived += len(tickets)
+            logger.info(f"Archived {len(tickets)} tickets into segment {segment}")
+
+            if len(tickets) < batch_size:
+                break
+
+        return archived
+
+    async def get_archive_entry(self, ticket_id: uuid.UUID) -> Optional[ArchivedTicket]:
+        """
+        Получение записи индекса архива.
+
+        Args:
+            ticket_id: ID тикета
+
+        Returns:
+            Optional[ArchivedTicket]: Запись индекса или None
+        """
+        result = await self.db.execute(
+            select(ArchivedTicket).where(ArchivedTicket.id == ticket_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def load_archived_ticket(self, entry: ArchivedTicket) -> Dict[str, Any]:
+        """
+        Восстановление архивной записи тикета из сегмента.
+
+        Args:
+            entry: Запись индекса архива
+
+        Returns:
+            Dict[str, Any]: Тикет в формате TicketResponse с ключом messages
+        """
+        return await asyncio.to_thread(
+            self._read_record, entry.segment, entry.offset, entry.length
+        )
+
+
+async def archive_loop(session_factory, interval_hours: float = 24) -> None:
+    """
+    Фоновая задача: архивация закрытых тикетов раз в interval_hours.
+
+    Args:
+        session_factory: Фабрика асинхронных сессий
+        interval_hours: Интервал между запусками
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                archived = await ArchiveService(session).archive_closed_tickets()
+            if archived:
+                logger.info(f"Archiver moved {archived} closed tickets to cold storage")
+        except Exception as e:
+            logger.error(f"Ticket archiver failed: {e}", exc_info=True)
+
+        await asyncio.sleep(interval_hours * 3600)
@@ -0,0 +1,280 @@
+"""
+Автоматическая маршрутизация тикетов по специалистам.
+
+Движок держит в памяти процесса число активных тикетов каждого
+сотрудника и кучу (нагрузка, очередность, сотрудник) на каждую
+категорию. Выбор исполнителя для нового тикета - O(log n): из кучи
+категории (или универсальных сотрудников) извлекается наименее
+загруженный. Устаревшие записи кучи отбрасываются лениво, нагрузка
+обновляется инкрементально после каждого перехода тикета и полностью
+перечитывается из БД раз в max_age (изменения других процессов).
+
+Автоназначение задает владельца, но оставляет тикет OPEN: сотрудник
+берет свои тикеты в работу через claim-next (TicketService.
+claim_next_ticket), который после них отдает общую очередь без
+исполнителя. При AUTO_ASSIGNMENT_ENABLED=false все новые тикеты
+попадают в общую очередь (чистая модель pull).
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional
+
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.staff_skill import StaffCategorySkill
+from tikethet.models.ticket import Ticket, TicketStatus, ACTIVE_TICKET_STATUSES
+from tikethet.models.user import User
+from tikethet.services.user_service import UserService
+
+# Автоматическое назначение новых тикетов
+AUTO_ASSIGNMENT_ENABLED = os.getenv("AUTO_ASSIGNMENT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Ключ кучи универсальных сотрудников (без специализации)
+GENERALISTS = None
+
+
+class AssignmentEngine:
+    """
+    Процессная модель нагрузки персонала для выбора исполнителя.
+
+    Повторяет схему CategoryCache: снимок перечитывается при изменении
+    специализаций (invalidate) или по истечении max_age.
+    """
+
+    def __init__(self, max_age: float = 300, enabled: bool = AUTO_ASSIGNMENT_ENABLED):
+        self.max_age = max_age
+        self.enabled = enabled
+        self._version = 0
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._load: Dict[uuid.UUID, int] = {}
+        self._skills: Dict[uuid.UUID, FrozenSet[Optional[uuid.UUID]]] = {}
+        self._heaps: Dict[Optional[uuid.UUID], list] = {}
+        self._members: Dict[Optional[uuid.UUID], int] = {}
+        self._sequence = itertools.count()
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        """Актуален ли загруженный снимок."""
+        return (
+            self._loaded_version == self._version
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+
+    def invalidate(self) -> None:
+        """Инвалидация снимка после изменения специализаций."""
+        self._version += 1
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Загрузка персонала, специализаций и нагрузки, если снимок устарел.
+
+        Args:
+            db: Сессия базы данных
+        """
+        if self.is_fresh:
+            return
+
+        async with self._lock:
+            if self.is_fresh:
+                return
+
+            version = self._version
+            staff = await UserService(db).get_staff_users()
+            staff_ids = [user.id for user in staff]
+
+            skills: Dict[uuid.UUID, set] = defaultdict(set)
+            result = await db.execute(
+                select(StaffCategorySkill.user_id, StaffCategorySkill.category_id)
+                .where(StaffCategorySkill.user_id.in_(staff_ids))
+            )
+            for user_id, category_id in result.all():
+                skills[user_id].add(category_id)
+
+            # Нагрузка - активные назначенные тикеты (одним GROUP BY вместо
+            # get_assigned_tickets на каждого сотрудника)
+            result = await db.execute(
+                select(Ticket.assigned_to, func.count())
+                .where(and_(
+                    Ticket.assigned_to.in_(staff_ids),
+                    Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+                ))
+                .group_by(Ticket.assigned_to)
+            )
+            load = dict(result.all())
+
+            self._load = {user_id: load.get(user_id, 0) for user_id in staff_ids}
+            self._skills = {
+                user_id: frozenset(skills.get(user_id) or {GENERALISTS})
+                for user_id in staff_ids
+            }
+            self._rebuild_heaps()
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def _rebuild_heaps(self) -> None:
+        heaps: Dict[Optional[uuid.UUID], list] = defaultdict(list)
+        for user_id, keys in self._skills.items():
+            for key in keys:
+                heaps[key].append((self._load[user_id], next(self._sequence), user_id))
+
+        for heap in heaps.values():
+            heapq.heapify(heap)
+
+        self._heaps = dict(heaps)
+        self._members = {key: len(heap) for key, heap in heaps.items()}
+
+    def _push(self, user_id: uuid.UUID) -> None:
+        entry_load = self._load[user_id]
+        for key in self._skills[user_id]:
+            heap = self._heaps[key]
+            heapq.heappush(heap, (entry_load, next(self._sequence), user_id))
+
+            # Ленивое удаление копит устаревшие записи - периодическое сжатие
+            if len(heap) > 4 * self._members[key] + 16:
+                self._heaps[key] = [
+                    (self._load[member], next(self._sequence), member)
+                    for member, keys in self._skills.items() if key in keys
+                ]
+                heapq.heapify(self._heaps[key])
+
+    def _peek(self, key: Optional[uuid.UUID]) -> Optional[uuid.UUID]:
+        heap = self._heaps.get(key)
+        while heap:
+            entry_load, _, user_id = heap[0]
+            if self._load.get(user_id) == entry_load:
+                return user_id
+            heapq.heappop(heap)
+        return None
+
+    def _adjust(self, user_id: Optional[uuid.UUID], delta: int) -> None:
+        if user_id is None or user_id not in self._load:
+            return
+        self._load[user_id] = max(self._load[user_id] + delta, 0)
+        self._push(user_id)
+
+    async def pick(self, db: AsyncSession, category_id: uuid.UUID) -> Optional[uuid.UUID]:
+        """
+        Выбор исполнителя для нового тикета с резервированием нагрузки.
+
+        Приоритет у профильных сотрудников категории, затем универсальные.
+        При откате транзакции резерв снимается через release.
+
+        Args:
+            db: Сессия базы данных
+            category_id: Категория тикета
+
+        Returns:
+            Optional[uuid.UUID]: ID исполнителя или None
+        """
+        if not self.enabled:
+            return None
+
+        await self.ensure_loaded(db)
+
+        user_id = self._peek(category_id) or self._peek(GENERALISTS)
+        self._adjust(user_id, 1)
+        return user_id
+
+    def release(self, user_id: Optional[uuid.UUID]) -> None:
+        """Снятие резерва нагрузки (тикет не сохранен или покинул исполнителя)."""
+        self._adjust(user_id, -1)
+
+    def on_ticket_changed(
+        self,
+        previous_assignee: Optional[uuid.UUID],
+        previous_status: TicketStatus,
+        ticket: Ticket
+    ) -> None:
+        """
+        Хук после commit: перенос нагрузки при переназначении и смене статуса.
+
+        Args:
+            previous_assignee: Исполнитель до изменения
+            previous_status: Статус до изменения
+            ticket: Тикет после изменения
+        """
+        was_counted = previous_assignee is not None and previous_status.is_active
+        is_counted = ticket.assigned_to is not None and ticket.status.is_active
+
+        if was_counted and (not is_counted or previous_assignee != ticket.assigned_to):
+            self._adjust(previous_assignee, -1)
+        if is_counted and (not was_counted or previous_assignee != ticket.assigned_to):
+            self._adjust(ticket.assigned_to, 1)
+
+    def get_load(self) -> Dict[uuid.UUID, int]:
+        """Текущая нагрузка персонала (копия)."""
+        return dict(self._load)
+
+
+# Общий для процесса движок назначения
+assignment_engine = AssignmentEngine()
+
+
+class AssignmentService:
+    """Сервис управления специализациями персонала."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_category_staff(self, category_id: uuid.UUID) -> List[User]:
+        """
+        Сотрудники, обслуживающие категорию.
+
+        Args:
+            category_id: ID категории
+
+        Returns:
+            List[User]: Профильные сотрудники
+        """
+        result = await self.db.execute(
+            select(User)
+            .join(StaffCategorySkill, StaffCategorySkill.user_id == User.id)
+            .where(StaffCategorySkill.category_id == category_id)
+            .order_by(User.first_name)
+        )
+        return result.scalars().all()
+
+    async def set_category_staff(
+        self,
+        category_id: uuid.UUID,
+        user_ids: List[uuid.UUID]
+    ) -> List[User]:
+        """
+        Замена списка профильных сотрудников категории.
+
+        Args:
+            category_id: ID категории
+            user_ids: ID сотрудников (HELPER+)
+
+        Returns:
+            List[User]: Профильные сотрудники после изменения
+
+        Raises:
+            ValueError: Если среди ID есть не сотрудники
+        """
+        staff_ids = {user.id for user in await UserService(self.db).get_staff_users()}
+        unknown = set(user_ids) - staff_ids
+        if unknown:
+            raise ValueError(f"Не являются активными сотрудниками: {', '.join(map(str, unknown))}")
+
+        await self.db.execute(
+            delete(StaffCategorySkill).where(StaffCategorySkill.category_id == category_id)
+        )
+        self.db.add_all([
+            StaffCategorySkill(user_id=user_id, category_id=category_id)
+            for user_id in set(user_ids)
+        ])
+        await self.db.commit()
+
+        assignment_engine.invalidate()
+
+        return await self.get_category_staff(category_id)
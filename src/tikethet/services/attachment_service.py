@@ -0,0 +1,303 @@
+"""
+Сервис хранения файлов вложений.
+
+Содержимое сохраняется в каталог загрузок по SHA-256: одинаковые файлы
+лежат на диске один раз, сколько бы сообщений на них ни ссылалось.
+Запись идет по частям через UploadWriter, который считает хеш и размер
+по мере поступления данных, поэтому файл целиком в памяти не держится.
+Готовый файл переносится на место атомарным os.replace.
+"""
+
+import hashlib
+import mimetypes
+import os
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.config import get_settings
+from tikethet.models.message import Message
+from tikethet.models.stored_file import StoredFile
+
+# Размер части при потоковой записи
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Каталог незавершенных загрузок внутри каталога загрузок
+INCOMING_DIR = ".incoming"
+
+
+def file_extension(filename: Optional[str], content_type: str) -> str:
+    """
+    Расширение для имени сохраненного файла.
+
+    Args:
+        filename: Исходное имя файла
+        content_type: MIME тип
+
+    Returns:
+        str: Расширение с точкой или пустая строка
+    """
+    extension = Path(filename or "").suffix.lower()
+    if not extension or len(extension) > 10 or not extension[1:].isalnum():
+        extension = mimetypes.guess_extension(content_type) or ""
+    return extension
+
+
+class UploadWriter:
+    """
+    Потоковая запись загружаемого файла с подсчетом SHA-256.
+
+    Совместим с destination у Bot.download_file (write/flush).
+    """
+
+    def __init__(self, upload_dir: Path):
+        self.upload_dir = upload_dir
+        incoming = upload_dir / INCOMING_DIR
+        incoming.mkdir(parents=True, exist_ok=True)
+
+        fd, name = tempfile.mkstemp(dir=incoming, prefix="upload-")
+        self.temp_path = Path(name)
+        self._file = os.fdopen(fd, "wb")
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    @property
+    def sha256(self) -> str:
+        """SHA-256 записанных данных (hex)."""
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes) -> int:
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        return self._file.write(chunk)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def commit(self, extension: str) -> str:
+        """
+        Перенос файла на постоянное место (ab/cd/<sha256><ext>).
+
+        Args:
+            extension: Расширение файла
+
+        Returns:
+            str: Путь относительно каталога загрузок
+        """
+        self._file.close()
+        digest = self.sha256
+        relative = f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+        target = self.upload_dir / relative
+
+        if target.exists():
+            self.temp_path.unlink(missing_ok=True)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self.temp_path, target)
+        return relative
+
+    def discard(self) -> None:
+        """Удаление незавершенной или ненужной загрузки."""
+        self._file.close()
+        self.temp_path.unlink(missing_ok=True)
+
+
+class AttachmentService:
+    """Сервис сохранения и поиска файлов вложений."""
+
+    def __init__(self, db: AsyncSession, upload_dir: Optional[Path] = None):
+        self.db = db
+        self.upload_dir = upload_dir or Path(get_settings().upload_path)
+
+    def open_upload(self) -> UploadWriter:
+        """
+        Начало потоковой загрузки файла.
+
+        Returns:
+            UploadWriter: Приемник данных (после записи - store или discard)
+        """
+        return UploadWriter(self.upload_dir)
+
+    def file_path(self, stored: StoredFile) -> Path:
+        """Путь к содержимому на диске."""
+        return self.upload_dir / stored.path
+
+    async def get(self, stored_file_id: uuid.UUID) -> Optional[StoredFile]:
+        """
+        Получение файла по ID.
+
+        Args:
+            stored_file_id: ID файла
+
+        Returns:
+            Optional[StoredFile]: Файл или None
+        """
+        return await self.db.get(StoredFile, stored_file_id)
+
+    async def get_many(self, stored_file_ids: Iterable[uuid.UUID]) -> Dict[uuid.UUID, StoredFile]:
+        """
+        Получение нескольких файлов по ID.
+
+        Args:
+            stored_file_ids: ID файлов
+
+        Returns:
+            Dict[uuid.UUID, StoredFile]: Найденные файлы по ID
+        """
+        ids = set(stored_file_ids)
+        if not ids:
+            return {}
+
+        result = await self.db.execute(
+            select(StoredFile).where(StoredFile.id.in_(ids))
+        )
+        return {stored.id: stored for stored in result.scalars().all()}
+
+    async def get_by_sha256(self, sha256: str) -> Optional[StoredFile]:
+        """
+        Получение файла по хешу содержимого.
+
+        Args:
+            sha256: SHA-256 (hex)
+
+        Returns:
+            Optional[StoredFile]: Файл или None
+        """
+        result = await self.db.execute(
+            select(StoredFile).where(StoredFile.sha256 == sha256)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_telegram_unique_id(self, file_unique_id: str) -> Optional[StoredFile]:
+        """
+        Получение уже скачанного файла Telegram.
+
+        Args:
+            file_unique_id: file_unique_id Telegram
+
+        Returns:
+            Optional[StoredFile]: Файл или None
+        """
+        result = await self.db.execute(
+            select(StoredFile).where(StoredFile.telegram_file_unique_id == file_unique_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def store(
+        self,
+        upload: UploadWriter,
+        filename: Optional[str],
+        content_type: str,
+        telegram_file_id: Optional[str] = None,
+        telegram_file_unique_id: Optional[str] = None,
+        uploaded_by: Optional[uuid.UUID] = None
+    ) -> StoredFile:
+        """
+        Сохранение загруженного файла с дедупликацией по содержимому.
+
+        Если такое содержимое уже есть, загрузка удаляется, а у
+        существующей строки заполняются недостающие идентификаторы
+        Telegram. Вставка выполняется ON CONFLICT по sha256, поэтому
+        параллельные загрузки одного файла дают одну строку.
+
+        Args:
+            upload: Завершенная запись файла
+            filename: Исходное имя файла
+            content_type: MIME тип
+            telegram_file_id: file_id Telegram
+            telegram_file_unique_id: file_unique_id Telegram
+            uploaded_by: ID загрузившего пользователя (для новой строки)
+
+        Returns:
+            StoredFile: Сохраненный файл
+        """
+        stored = await self.get_by_sha256(upload.sha256)
+        if stored is not None:
+            upload.discard()
+            path = stored.path
+        else:
+            path = upload.commit(file_extension(filename, content_type))
+
+        statement = insert(StoredFile).values(
+            id=uuid.uuid4(),
+            sha256=upload.sha256,
+            size=upload.size,
+            content_type=content_type,
+            path=path,
+            telegram_file_id=telegram_file_id,
+            telegram_file_unique_id=telegram_file_unique_id,
+            uploaded_by=uploaded_by
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[StoredFile.sha256],
+            set_={
+                "telegram_file_id": func.coalesce(
+                    StoredFile.telegram_file_id, statement.excluded.telegram_file_id
+                ),
+                "telegram_file_unique_id": func.coalesce(
+                    StoredFile.telegram_file_unique_id, statement.excluded.telegram_file_unique_id
+                ),
+                "uploaded_by": func.coalesce(
+                    StoredFile.uploaded_by, statement.excluded.uploaded_by
+                )
+            }
+        ).returning(StoredFile)
+
+        try:
+            result = await self.db.execute(
+                statement.execution_options(populate_existing=True)
+            )
+            stored = result.scalar_one()
+            await self.db.commit()
+        except IntegrityError:
+            # Тот же файл Telegram параллельно сохранен другим обработчиком
+            await self.db.rollback()
+            if telegram_file_unique_id is None:
+                raise
+            stored = await self.get_by_telegram_unique_id(telegram_file_unique_id)
+            if stored is None:
+                raise
+
+        return stored
+
+    async def remember_file_id(self, stored_file_id: uuid.UUID, file_id: str) -> None:
+        """
+        Запоминание file_id после отправки файла ботом.
+
+        Args:
+            stored_file_id: ID файла
+            file_id: Новый file_id Telegram
+        """
+        await self.db.execute(
+            update(StoredFile)
+            .where(StoredFile.id == stored_file_id)
+            .values(telegram_file_id=file_id)
+        )
+        await self.db.commit()
+
+    @staticmethod
+    def to_attachment(stored: StoredFile, filename: str) -> Dict[str, Any]:
+        """
+        Данные вложения сообщения для сохраненного файла.
+
+        Args:
+            stored: Сохраненный файл
+            filename: Имя файла для отображения
+
+        Returns:
+            Dict[str, Any]: Данные вложения
+        """
+        return Message.create_attachment_data(
+            filename=filename,
+            size=stored.size,
+            content_type=stored.content_type,
+            url=f"/uploads/{stored.path}",
+            file_id=stored.telegram_file_id,
+            stored_file_id=stored.id
+        )
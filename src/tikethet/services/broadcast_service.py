@@ -0,0 +1,210 @@
+"""
+Сервис массовых рассылок: получатели, контрольные точки, аренда.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.broadcast import Broadcast, BroadcastStatus
+from tikethet.models.user import User
+
+# Размер пакета получателей (одна контрольная точка на пакет)
+BROADCAST_CHUNK_SIZE = 500
+
+# Рассылка без контрольной точки дольше этого срока считается прерванной
+BROADCAST_LEASE_SECONDS = 300
+
+
+class BroadcastService:
+    """Сервис состояния массовых рассылок."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self,
+        text: str,
+        admin_chat_id: int,
+        created_by: Optional[User] = None
+    ) -> Broadcast:
+        """
+        Создание рассылки по всем активным пользователям.
+
+        Args:
+            text: Текст рассылки (HTML)
+            admin_chat_id: Чат для отчета о прогрессе
+            created_by: Администратор
+
+        Returns:
+            Broadcast: Созданная рассылка без аренды - ее захватит
+                claim_stale ведущего процесса
+        """
+        result = await self.db.execute(
+            select(func.count()).select_from(User).where(User.is_active == True)
+        )
+
+        broadcast = Broadcast(
+            text=text,
+            admin_chat_id=admin_chat_id,
+            created_by=created_by.id if created_by else None,
+            total=result.scalar_one(),
+            heartbeat_at=None
+        )
+        self.db.add(broadcast)
+        await self.db.commit()
+        await self.db.refresh(broadcast)
+
+        return broadcast
+
+    async def claim_stale(self) -> List[Broadcast]:
+        """
+        Захват новых (без аренды) и прерванных (аренда истекла) рассылок.
+
+        Захват - атомарный UPDATE, поэтому рассылку продолжит только одна
+        реплика бота.
+
+        Returns:
+            List[Broadcast]: Захваченные рассылки
+        """
+        now = datetime.now(timezone.utc)
+        result = await self.db.execute(
+            update(Broadcast)
+            .where(and_(
+                Broadcast.status == BroadcastStatus.RUNNING.value,
+                or_(
+                    Broadcast.heartbeat_at.is_(None),
+                    Broadcast.heartbeat_at < now - timedelta(seconds=BROADCAST_LEASE_SECONDS)
+                )
+            ))
+            .values(heartbeat_at=now)
+            .returning(Broadcast)
+            .execution_options(synchronize_session=False)
+        )
+        broadcasts = result.scalars().all()
+        await self.db.commit()
+
+        return broadcasts
+
+    async def get_recipients(
+        self,
+        after: Optional[uuid.UUID],
+        limit: int = BROADCAST_CHUNK_SIZE
+    ) -> List[tuple]:
+        """
+        Пакет получателей после контрольной точки (keyset по users.id).
+
+        Каждый пакет читается отдельным коротким запросом, поэтому
+        транзакция не остается открытой на время отправки.
+
+        Args:
+            after: Контрольная точка - последний обработанный users.id
+            limit: Размер пакета
+
+        Returns:
+            List[tuple]: Пары (users.id, telegram_id) по возрастанию users.id
+        """
+        conditions = [User.is_active == True]
+        if after is not None:
+            conditions.append(User.id > after)
+
+        result = await self.db.execute(
+            select(User.id, User.telegram_id)
+            .where(and_(*conditions))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def checkpoint(
+        self,
+        broadcast_id: uuid.UUID,
+        last_user_id: uuid.UUID,
+        sent: int,
+        failed: int
+    ) -> Optional[str]:
+        """
+        Фиксация завершенного пакета и продление аренды.
+
+        Args:
+            broadcast_id: ID рассылки
+            last_user_id: Последний users.id пакета
+            sent: Доставлено в пакете
+            failed: Не доставлено в пакете
+
+        Returns:
+            Optional[str]: Текущий статус рассылки (для остановки)
+        """
+        result = await self.db.execute(
+            update(Broadcast)
+            .where(Broadcast.id == broadcast_id)
+            .values(
+                last_user_id=last_user_id,
+                sent_count=Broadcast.sent_count + sent,
+                failed_count=Broadcast.failed_count + failed,
+                heartbeat_at=datetime.now(timezone.utc)
+            )
+            .returning(Broadcast.status)
+        )
+        status = result.scalar_one_or_none()
+        await self.db.commit()
+
+        return status
+
+    async def finish(self, broadcast_id: uuid.UUID) -> Optional[Broadcast]:
+        """
+        Завершение рассылки (если она не была остановлена).
+
+        Args:
+            broadcast_id: ID рассылки
+
+        Returns:
+            Optional[Broadcast]: Рассылка с итоговыми счетчиками
+        """
+        await self.db.execute(
+            update(Broadcast)
+            .where(and_(
+                Broadcast.id == broadcast_id,
+                Broadcast.status == BroadcastStatus.RUNNING.value
+            ))
+            .values(status=BroadcastStatus.COMPLETED.value, finished_at=datetime.now(timezone.utc))
+        )
+        await self.db.commit()
+
+        return await self.db.get(Broadcast, broadcast_id)
+
+    async def set_progress_message(self, broadcast_id: uuid.UUID, message_id: int) -> None:
+        """
+        Сохранение ID сообщения с прогрессом в чате администратора.
+
+        Args:
+            broadcast_id: ID рассылки
+            message_id: ID сообщения Telegram
+        """
+        await self.db.execute(
+            update(Broadcast)
+            .where(Broadcast.id == broadcast_id)
+            .values(progress_message_id=message_id)
+        )
+        await self.db.commit()
+
+    async def cancel_running(self) -> int:
+        """
+        Остановка всех выполняющихся рассылок.
+
+        Исполнитель увидит статус на ближайшей контрольной точке.
+
+        Returns:
+            int: Количество остановленных рассылок
+        """
+        result = await self.db.execute(
+            update(Broadcast)
+            .where(Broadcast.status == BroadcastStatus.RUNNING.value)
+            .values(status=BroadcastStatus.CANCELLED.value, finished_at=datetime.now(timezone.utc))
+        )
+        await self.db.commit()
+
+        return result.rowcount
@@ -2,13 +2,116 @@
 Сервис для работы с категориями тикетов.
 """
 
+import asyncio
+import time
 import uuid
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Dict, Any
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from tikethet.models.category import Category
+from tikethet.schemas.serialization import serialize_category
+from tikethet.schemas.versions import rows_etag
+
+
+class CategoryCache:
+    """
+    Процессный кэш справочника категорий с версионной инвалидацией.
+    
+    Категории меняются редко, поэтому список активных категорий и
+    категории по ID хранятся в памяти в сериализованном виде. Любая
+    запись в справочник увеличивает счетчик версии - при следующем
+    чтении кэш перезагружается одним запросом. max_age ограничивает
+    устаревание в других процессах (воркерах), которые не видят
+    инвалидацию текущего процесса.
+    """
+    
+    def __init__(self, max_age: float = 300):
+        self.max_age = max_age
+        self._version = 0
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._by_id: Dict[uuid.UUID, Dict[str, Any]] = {}
+        self._active: List[Dict[str, Any]] = []
+        self._active_etag = ""
+        self._active_modified: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+    
+    @property
+    def version(self) -> int:
+        """Текущая версия справочника."""
+        return self._version
+    
+    @property
+    def active_etag(self) -> str:
+        """ETag загруженного списка активных категорий."""
+        return self._active_etag
+    
+    @property
+    def active_last_modified(self) -> Optional[datetime]:
+        """Время последнего изменения активных категорий."""
+        return self._active_modified
+    
+    @property
+    def is_fresh(self) -> bool:
+        """Актуален ли загруженный снимок."""
+        return (
+            self._loaded_version == self._version
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+    
+    def invalidate(self) -> None:
+        """Инвалидация кэша после изменения категорий."""
+        self._version += 1
+    
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """
+        Загрузка справочника, если снимок устарел.
+        
+        Args:
+            db: Сессия базы данных
+        """
+        if self.is_fresh:
+            return
+        
+        async with self._lock:
+            if self.is_fresh:
+                return
+            
+            version = self._version
+            result = await db.execute(
+                select(Category).order_by(Category.sort_order, Category.name)
+            )
+            categories = [serialize_category(category) for category in result.scalars().all()]
+            
+            self._by_id = {category["id"]: category for category in categories}
+            self._active = [category for category in categories if category["is_active"]]
+            # ETag из версий строк одинаков во всех процессах, в отличие от счетчика версии
+            self._active_etag = rows_etag(
+                (category["id"], category["updated_at"]) for category in self._active
+            )
+            self._active_modified = max(
+                (category["updated_at"] for category in self._active if category["updated_at"]),
+                default=None
+            )
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+    
+    async def get_active(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        """Активные категории в порядке сортировки."""
+        await self.ensure_loaded(db)
+        return self._active
+    
+    async def get(self, db: AsyncSession, category_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """Категория по ID (включая неактивные)."""
+        await self.ensure_loaded(db)
+        return self._by_id.get(category_id)
+
+
+# Общий для процесса кэш категорий
+category_cache = CategoryCache()
 
 
 class CategoryService:
@@ -46,6 +149,27 @@ class CategoryService:
         )
         return result.scalars().all()
     
+    async def get_cached_category(self, category_id: uuid.UUID) -> Optional[Dict[str, Any]]:
+        """
+        Получение категории по ID из кэша справочника.
+        
+        Args:
+            category_id: ID категории
+            
+        Returns:
+            Optional[Dict[str, Any]]: Данные категории (формат CategoryResponse) или None
+        """
+        return await category_cache.get(self.db, category_id)
+    
+    async def get_cached_active_categories(self) -> List[Dict[str, Any]]:
+        """
+        Получение активных категорий из кэша справочника.
+        
+        Returns:
+            List[Dict[str, Any]]: Данные категорий (формат CategoryResponse)
+        """
+        return await category_cache.get_active(self.db)
+    
     async def create_category(self, category_data: dict) -> Category:
         """
         Создание новой категории.
@@ -62,6 +186,8 @@ class CategoryService:
         await self.db.commit()
         await self.db.refresh(category)
         
+        category_cache.invalidate()
+        
         return category
     
     async def create_default_categories(self) -> List[Category]:
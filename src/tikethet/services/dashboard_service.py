@@ -0,0 +1,133 @@
+"""
+Сводка для команды /stats администратора.
+
+Собирается только из поддерживаемых агрегатов: потоки за сегодня и
+неделю - из почасовых/дневных счетчиков (ticket_rollups), среднее время
+решения - из materialized metrics_summary, текущая очередь - GROUP BY по
+частичному индексу активных тикетов, нагрузка персонала - из процессной
+модели AssignmentEngine. Готовая сводка кэшируется на max_age секунд, и
+одновременные запросы ждут одной сборки.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.metrics_summary import MetricsSummary
+from tikethet.models.ticket import Ticket, ACTIVE_TICKET_STATUSES
+from tikethet.services.assignment_service import assignment_engine
+from tikethet.services.rollup_service import RollupService, bucket_start
+
+
+@dataclass
+class StaffStats:
+    """Нагрузка персонала по активным тикетам."""
+
+    staff: int = 0
+    busy: int = 0
+    average_load: float = 0.0
+
+
+@dataclass
+class DashboardStats:
+    """Сводка /stats."""
+
+    today: Dict[str, int]
+    week: Dict[str, int]
+    by_status: Dict[str, int]
+    staff: StaffStats = field(default_factory=StaffStats)
+    resolution_hours_avg: Optional[float] = None
+    resolution_window_days: Optional[int] = None
+    computed_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class DashboardCache:
+    """Процессный кэш сводки /stats."""
+
+    def __init__(self, max_age: float = 30):
+        self.max_age = max_age
+        self._stats: Optional[DashboardStats] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_fresh(self) -> bool:
+        """Актуальна ли сохраненная сводка."""
+        return self._stats is not None and time.monotonic() - self._loaded_at < self.max_age
+
+    def invalidate(self) -> None:
+        """Сброс сводки."""
+        self._stats = None
+
+    async def get(self, db: AsyncSession) -> DashboardStats:
+        """
+        Сводка для /stats (из кэша или собранная заново).
+
+        Args:
+            db: Сессия базы данных
+
+        Returns:
+            DashboardStats: Сводка
+        """
+        if self.is_fresh:
+            return self._stats
+
+        async with self._lock:
+            if not self.is_fresh:
+                self._stats = await self._build(db)
+                self._loaded_at = time.monotonic()
+            return self._stats
+
+    async def _build(self, db: AsyncSession) -> DashboardStats:
+        rollups = RollupService(db)
+        now = datetime.now(timezone.utc)
+        today = bucket_start(now, "day")
+        end = now + timedelta(hours=1)
+
+        result = await db.execute(
+            select(Ticket.status, func.count())
+            .where(Ticket.status.in_(ACTIVE_TICKET_STATUSES))
+            .group_by(Ticket.status)
+        )
+        by_status = {status.value: 0 for status in ACTIVE_TICKET_STATUSES}
+        for status, count in result.all():
+            by_status[status.value] = count
+
+        stats = DashboardStats(
+            today=await rollups.get_totals(today, end),
+            week=await rollups.get_totals(today - timedelta(days=6), end),
+            by_status=by_status
+        )
+
+        result = await db.execute(
+            select(MetricsSummary.value, MetricsSummary.window_days)
+            .where(
+                MetricsSummary.name == "resolution_hours_avg",
+                MetricsSummary.dimension == "total",
+                MetricsSummary.bucket.is_(None)
+            )
+            .limit(1)
+        )
+        row = result.first()
+        if row is not None:
+            stats.resolution_hours_avg, stats.resolution_window_days = row
+
+        await assignment_engine.ensure_loaded(db)
+        load = assignment_engine.get_load()
+        if load:
+            stats.staff = StaffStats(
+                staff=len(load),
+                busy=sum(1 for value in load.values() if value > 0),
+                average_load=sum(load.values()) / len(load)
+            )
+
+        return stats
+
+
+# Общий для процесса кэш сводки /stats
+dashboard_cache = DashboardCache()
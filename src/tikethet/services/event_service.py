@@ -0,0 +1,213 @@
+"""
+Сервис истории событий тикетов (ticket_events).
+
+События пишутся в той же транзакции, что и изменение тикета, и служат
+основой для SLA отчетов: время первого ответа и время в статусе
+считаются по индексам ticket_events без сканирования сообщений.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.ticket import Ticket, TicketStatus
+from tikethet.models.ticket_event import TicketEvent, TicketEventType
+from tikethet.models.user import User
+
+
+class TicketEventService:
+    """Сервис записи и чтения истории событий тикетов."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def record(
+        self,
+        ticket: Ticket,
+        event_type: TicketEventType,
+        actor: Optional[User] = None,
+        from_status: Optional[TicketStatus] = None
+    ) -> TicketEvent:
+        """
+        Добавление события в текущую транзакцию (без commit).
+
+        Args:
+            ticket: Тикет (после изменения, с назначенным ID)
+            event_type: Тип события
+            actor: Пользователь, вызвавший событие
+            from_status: Статус до события
+
+        Returns:
+            TicketEvent: Добавленное событие
+        """
+        event = TicketEvent(
+            ticket_id=ticket.id,
+            event_type=event_type,
+            from_status=from_status,
+            to_status=ticket.status,
+            actor_id=actor.id if actor else None,
+            assigned_to=ticket.assigned_to
+        )
+        self.db.add(event)
+        return event
+
+    async def record_first_response(self, ticket: Ticket, actor: User) -> None:
+        """
+        Фиксация первого публичного ответа персонала.
+
+        Повторные ответы игнорируются уникальным частичным индексом.
+
+        Args:
+            ticket: Тикет
+            actor: Автор ответа
+        """
+        statement = pg_insert(TicketEvent).values(
+            id=uuid.uuid4(),
+            ticket_id=ticket.id,
+            event_type=TicketEventType.FIRST_RESPONSE,
+            to_status=ticket.status,
+            actor_id=actor.id,
+            assigned_to=ticket.assigned_to
+        ).on_conflict_do_nothing(
+            index_elements=[TicketEvent.ticket_id],
+            index_where=TicketEvent.event_type == TicketEventType.FIRST_RESPONSE
+        )
+        await self.db.execute(statement)
+
+    async def record_sla_breach(self, ticket: Ticket) -> bool:
+        """
+        Фиксация нарушения SLA первого ответа.
+
+        Args:
+            ticket: Тикет
+
+        Returns:
+            bool: True если нарушение записано впервые
+        """
+        statement = pg_insert(TicketEvent).values(
+            id=uuid.uuid4(),
+            ticket_id=ticket.id,
+            event_type=TicketEventType.SLA_BREACHED,
+            to_status=ticket.status,
+            assigned_to=ticket.assigned_to
+        ).on_conflict_do_nothing(
+            index_elements=[TicketEvent.ticket_id],
+            index_where=TicketEvent.event_type == TicketEventType.SLA_BREACHED
+        ).returning(TicketEvent.id)
+
+        result = await self.db.execute(statement)
+        return result.scalar_one_or_none() is not None
+
+    async def get_timeline(self, ticket_id: uuid.UUID) -> List[TicketEvent]:
+        """
+        Хронология событий тикета.
+
+        Args:
+            ticket_id: ID тикета
+
+        Returns:
+            List[TicketEvent]: События в порядке возникновения
+        """
+        result = await self.db.execute(
+            select(TicketEvent)
+            .where(TicketEvent.ticket_id == ticket_id)
+            .order_by(TicketEvent.created_at, TicketEvent.seq)
+        )
+        return result.scalars().all()
+
+    async def get_time_in_status(
+        self,
+        ticket_id: uuid.UUID,
+        now: Optional[datetime] = None
+    ) -> Dict[str, float]:
+        """
+        Суммарное время тикета в каждом статусе (в секундах).
+
+        Интервал статуса - от события, установившего его, до следующего
+        события тикета (LEAD по индексу ix_ticket_events_ticket_created).
+
+        Args:
+            ticket_id: ID тикета
+            now: Конец последнего интервала (по умолчанию - now() в БД)
+
+        Returns:
+            Dict[str, float]: Статус -> секунды
+        """
+        next_at = func.lead(TicketEvent.created_at).over(
+            partition_by=TicketEvent.ticket_id,
+            order_by=(TicketEvent.created_at, TicketEvent.seq)
+        )
+        intervals = (
+            select(
+                TicketEvent.to_status.label("status"),
+                TicketEvent.created_at.label("started_at"),
+                next_at.label("ended_at")
+            )
+            .where(and_(
+                TicketEvent.ticket_id == ticket_id,
+                TicketEvent.to_status.is_not(None)
+            ))
+            .subquery()
+        )
+
+        ended_at = func.coalesce(intervals.c.ended_at, now if now is not None else func.now())
+        result = await self.db.execute(
+            select(
+                intervals.c.status,
+                func.sum(func.extract("epoch", ended_at - intervals.c.started_at))
+            ).group_by(intervals.c.status)
+        )
+
+        return {status.value: float(seconds or 0) for status, seconds in result.all()}
+
+    async def get_first_response_stats(
+        self,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, Any]:
+        """
+        Время первого ответа по тикетам, созданным в периоде [start, end).
+
+        Args:
+            start: Начало периода
+            end: Конец периода
+
+        Returns:
+            Dict[str, Any]: count, answered, avg_minutes, p50_minutes, p90_minutes
+        """
+        created = select(TicketEvent.ticket_id, TicketEvent.created_at).where(and_(
+            TicketEvent.event_type == TicketEventType.CREATED,
+            TicketEvent.created_at >= start,
+            TicketEvent.created_at < end
+        )).subquery()
+
+        first_response = select(TicketEvent.ticket_id, TicketEvent.created_at).where(
+            TicketEvent.event_type == TicketEventType.FIRST_RESPONSE
+        ).subquery()
+
+        minutes = func.extract("epoch", first_response.c.created_at - created.c.created_at) / 60
+
+        result = await self.db.execute(
+            select(
+                func.count(created.c.ticket_id),
+                func.count(first_response.c.ticket_id),
+                func.avg(minutes),
+                func.percentile_cont(0.5).within_group(minutes),
+                func.percentile_cont(0.9).within_group(minutes),
+            ).select_from(
+                created.outerjoin(first_response, first_response.c.ticket_id == created.c.ticket_id)
+            )
+        )
+        count, answered, avg_minutes, p50, p90 = result.one()
+
+        return {
+            "count": count,
+            "answered": answered,
+            "avg_minutes": float(avg_minutes) if avg_minutes is not None else None,
+            "p50_minutes": float(p50) if p50 is not None else None,
+            "p90_minutes": float(p90) if p90 is not None else None,
+        }
@@ -2,8 +2,10 @@
 Сервис для работы с сообщениями в тикетах.
 """
 
+import html
 import uuid
-from typing import Optional, List, Dict, Any
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +15,13 @@ from tikethet.models.message import Message
 from tikethet.models.ticket import Ticket
 from tikethet.models.user import User, UserRole
 from tikethet.schemas.message import MessageCreate, MessageUpdate
+from tikethet.models.ticket_event import TicketEventType
+from tikethet.services.event_service import TicketEventService
+from tikethet.services.sla_service import sla_monitor
+from tikethet.services.summary_service import ticket_summary_cache
+from tikethet.services.outbox_service import OutboxService
+from tikethet.services.attachment_service import AttachmentService
+from tikethet.models.outbox import DeliveryLane
 
 
 class MessageService:
@@ -42,7 +51,8 @@ class MessageService:
         self, 
         ticket_id: uuid.UUID, 
         user: User,
-        include_internal: bool = None
+        include_internal: bool = None,
+        since: Optional[datetime] = None
     ) -> List[Message]:
         """
         Получение сообщений тикета.
@@ -51,6 +61,8 @@ class MessageService:
             ticket_id: ID тикета
             user: Пользователь, запрашивающий сообщения
             include_internal: Включать ли внутренние сообщения
+            since: Нижняя граница created_at (обычно дата создания тикета) -
+                позволяет PostgreSQL отбросить более старые партиции
             
         Returns:
             List[Message]: Список сообщений
@@ -59,6 +71,10 @@ class MessageService:
             selectinload(Message.user)
         )
         
+        # Сообщения не бывают старше тикета - ограничиваем диапазон партиций
+        if since is not None:
+            query = query.where(Message.created_at >= since)
+        
         # Определяем, показывать ли внутренние сообщения
         if include_internal is None:
             include_internal = user.role.can_access(UserRole.HELPER)
@@ -105,14 +121,104 @@ class MessageService:
         self.db.add(message)
         
         # Обновляем статус тикета при необходимости
+        previous_status = ticket.status
         await self._update_ticket_status_on_message(ticket, user)
         
+        # Первый публичный ответ персонала - точка отсчета SLA
+        is_staff_reply = (
+            not is_internal and
+            user.id != ticket.user_id and
+            user.role.can_access(UserRole.HELPER)
+        )
+        if is_staff_reply:
+            await TicketEventService(self.db).record_first_response(ticket, user)
+            await self._notify_author(ticket, message)
+        
         await self.db.commit()
         await self.db.refresh(message)
         await self.db.refresh(message, ["user"])
         
+        if is_staff_reply:
+            sla_monitor.on_first_response(ticket.id)
+        else:
+            sla_monitor.on_ticket_changed(ticket)
+        ticket_summary_cache.on_ticket_changed(previous_status, ticket)
+        
         return message
     
+    async def _notify_author(self, ticket: Ticket, message: Message) -> None:
+        """
+        Уведомление автора тикета об ответе персонала (в той же транзакции).
+        
+        Args:
+            ticket: Тикет
+            message: Ответ персонала
+        """
+        result = await self.db.execute(
+            select(User.telegram_id).where(User.id == ticket.user_id)
+        )
+        chat_id = result.scalar_one_or_none()
+        if chat_id is None:
+            return
+        
+        preview = message.content if len(message.content) <= 300 else message.content[:297] + "..."
+        outbox = OutboxService(self.db)
+        outbox.enqueue(
+            chat_id,
+            f"💬 <b>Ответ по тикету «{html.escape(ticket.title)}»</b>\n\n{html.escape(preview)}",
+            lane=DeliveryLane.NORMAL
+        )
+        
+        # Сохраненные файлы уходят следом отдельными сообщениями (по file_id)
+        for stored_file_id, filename in await self._sendable_files(ticket, message):
+            outbox.enqueue(
+                chat_id,
+                html.escape(filename),
+                lane=DeliveryLane.NORMAL,
+                stored_file_id=stored_file_id
+            )
+    
+    async def _sendable_files(self, ticket: Ticket, message: Message) -> List[Tuple[uuid.UUID, str]]:
+        """
+        Файлы вложений, которые бот может отправить автору тикета.
+        
+        Вложения приходят от клиента API, поэтому stored_file_id
+        проверяется по данным сервера: файл должен существовать и быть
+        загружен автором сообщения или автором тикета. Некорректные
+        записи пропускаются.
+        
+        Args:
+            ticket: Тикет
+            message: Сообщение с вложениями
+            
+        Returns:
+            List[Tuple[uuid.UUID, str]]: Пары (ID файла, имя файла)
+        """
+        requested = []
+        for attachment in message.attachments or []:
+            if not isinstance(attachment, dict):
+                continue
+            try:
+                stored_file_id = uuid.UUID(str(attachment.get("stored_file_id")))
+            except ValueError:
+                continue
+            filename = attachment.get("filename")
+            requested.append((stored_file_id, filename if isinstance(filename, str) else ""))
+        
+        if not requested:
+            return []
+        
+        stored_files = await AttachmentService(self.db).get_many(
+            stored_file_id for stored_file_id, _ in requested
+        )
+        allowed_uploaders = {message.user_id, ticket.user_id}
+        return [
+            (stored_file_id, filename)
+            for stored_file_id, filename in requested
+            if stored_file_id in stored_files
+            and stored_files[stored_file_id].uploaded_by in allowed_uploaders
+        ]
+    
     async def update_message(
         self,
         message: Message,
@@ -178,6 +284,8 @@ class MessageService:
         if ticket.status == TicketStatus.CLOSED:
             return
         
+        previous_status = ticket.status
+        
         # Если сообщение от автора тикета и тикет ожидает ответа
         if (user.id == ticket.user_id and 
             ticket.status == TicketStatus.WAITING_RESPONSE):
@@ -194,6 +302,11 @@ class MessageService:
               user.id != ticket.user_id and
               ticket.status == TicketStatus.IN_PROGRESS):
             ticket.status = TicketStatus.WAITING_RESPONSE
+        
+        if ticket.status != previous_status:
+            TicketEventService(self.db).record(
+                ticket, TicketEventType.STATUS_CHANGED, actor=user, from_status=previous_status
+            )
     
     async def add_attachment_to_message(
         self,
@@ -219,7 +332,8 @@ class MessageService:
             size=attachment_data["size"],
             content_type=attachment_data["content_type"],
             url=attachment_data["url"],
-            file_id=attachment_data.get("telegram_file_id")
+            file_id=attachment_data.get("telegram_file_id"),
+            stored_file_id=attachment_data.get("stored_file_id")
         )
         
         message.attachments.append(attachment)
@@ -229,19 +343,26 @@ class MessageService:
         
         return message
     
-    async def get_messages_count(self, ticket_id: uuid.UUID) -> int:
+    async def get_messages_count(
+        self,
+        ticket_id: uuid.UUID,
+        since: Optional[datetime] = None
+    ) -> int:
         """
         Получение количества сообщений в тикете.
         
         Args:
             ticket_id: ID тикета
+            since: Нижняя граница created_at для отсечения партиций
             
         Returns:
             int: Количество сообщений
         """
         from sqlalchemy import func
         
-        result = await self.db.execute(
-            select(func.count(Message.id)).where(Message.ticket_id == ticket_id)
-        )
+        query = select(func.count(Message.id)).where(Message.ticket_id == ticket_id)
+        if since is not None:
+            query = query.where(Message.created_at >= since)
+        
+        result = await self.db.execute(query)
         return result.scalar()
\ No newline at end of file
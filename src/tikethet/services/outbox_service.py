@@ -0,0 +1,194 @@
+"""
+Сервис очереди исходящих сообщений Telegram.
+
+Сообщения добавляются в транзакцию вызывающего кода (transactional
+outbox) и отправляются диспетчером бота с учетом лимитов Telegram.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+from sqlalchemy import select, update, delete, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.outbox import OutboxMessage, OutboxStatus, DeliveryLane
+
+# Срок аренды забранной строки: после него неподтвержденная отправка повторяется
+OUTBOX_LEASE_SECONDS = 60
+
+# Предельное число попыток при сетевых ошибках и ошибках сервера
+OUTBOX_MAX_ATTEMPTS = 5
+
+
+@dataclass
+class OutboxItem:
+    """Забранное диспетчером сообщение (без ORM объекта)."""
+
+    id: uuid.UUID
+    chat_id: int
+    text: str
+    lane: int
+    attempts: int
+    created_at: datetime
+    stored_file_id: Optional[uuid.UUID] = None
+
+
+@dataclass
+class DeliveryResult:
+    """Итог попытки отправки для пакетного обновления."""
+
+    id: uuid.UUID
+    status: OutboxStatus
+    not_before: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+class OutboxService:
+    """Сервис записи и выборки исходящих сообщений."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def enqueue(
+        self,
+        chat_id: int,
+        text: str,
+        lane: DeliveryLane = DeliveryLane.NORMAL,
+        stored_file_id: Optional[uuid.UUID] = None
+    ) -> OutboxMessage:
+        """
+        Добавление сообщения в текущую транзакцию (без commit).
+
+        Args:
+            chat_id: Telegram chat ID получателя
+            text: Текст сообщения (HTML); для файла - подпись
+            lane: Полоса приоритета
+            stored_file_id: Отправить сохраненный файл вместо текста
+
+        Returns:
+            OutboxMessage: Добавленное сообщение
+        """
+        message = OutboxMessage(
+            chat_id=chat_id,
+            text=text,
+            lane=int(lane),
+            stored_file_id=stored_file_id
+        )
+        self.db.add(message)
+        return message
+
+    def enqueue_many(
+        self,
+        chat_ids: Iterable[int],
+        text: str,
+        lane: DeliveryLane = DeliveryLane.NORMAL
+    ) -> int:
+        """
+        Добавление одного текста для нескольких получателей (без commit).
+
+        Args:
+            chat_ids: Telegram chat ID получателей
+            text: Текст сообщения (HTML)
+            lane: Полоса приоритета
+
+        Returns:
+            int: Количество добавленных сообщений
+        """
+        messages = [
+            OutboxMessage(chat_id=chat_id, text=text, lane=int(lane))
+            for chat_id in set(chat_ids)
+        ]
+        self.db.add_all(messages)
+        return len(messages)
+
+    async def claim_due(self, limit: int) -> List[OutboxItem]:
+        """
+        Забрать готовые к отправке сообщения под аренду.
+
+        Строки блокируются FOR UPDATE SKIP LOCKED, чтобы несколько реплик
+        не забирали одно сообщение, и сдвигаются на срок аренды. Порядок -
+        по полосе приоритета, затем по времени создания.
+
+        Args:
+            limit: Максимальное количество сообщений
+
+        Returns:
+            List[OutboxItem]: Забранные сообщения в порядке отправки
+        """
+        now = datetime.now(timezone.utc)
+        due = (
+            select(OutboxMessage.id)
+            .where(and_(
+                OutboxMessage.status == OutboxStatus.PENDING.value,
+                OutboxMessage.not_before <= now
+            ))
+            .order_by(OutboxMessage.lane, OutboxMessage.not_before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+
+        result = await self.db.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(due.scalar_subquery()))
+            .values(
+                not_before=now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+                attempts=OutboxMessage.attempts + 1
+            )
+            .returning(
+                OutboxMessage.id, OutboxMessage.chat_id, OutboxMessage.text,
+                OutboxMessage.lane, OutboxMessage.attempts, OutboxMessage.created_at,
+                OutboxMessage.stored_file_id
+            )
+            .execution_options(synchronize_session=False)
+        )
+        items = [OutboxItem(*row) for row in result.all()]
+        await self.db.commit()
+
+        items.sort(key=lambda item: (item.lane, item.created_at))
+        return items
+
+    async def complete(self, results: List[DeliveryResult]) -> None:
+        """
+        Пакетная запись итогов отправки.
+
+        Args:
+            results: Итоги по забранным сообщениям
+        """
+        if not results:
+            return
+
+        now = datetime.now(timezone.utc)
+        rows = []
+        for item in results:
+            row = {"id": item.id, "status": item.status.value, "last_error": item.error}
+            if item.status == OutboxStatus.SENT:
+                row["sent_at"] = now
+            if item.not_before is not None:
+                row["not_before"] = item.not_before
+            rows.append(row)
+
+        # UPDATE по первичному ключу пакетом (executemany)
+        await self.db.execute(update(OutboxMessage), rows)
+
+        await self.db.commit()
+
+    async def purge(self, older_than: timedelta) -> int:
+        """
+        Удаление доставленных и окончательно неудачных сообщений.
+
+        Args:
+            older_than: Возраст сообщений для удаления
+
+        Returns:
+            int: Количество удаленных строк
+        """
+        result = await self.db.execute(
+            delete(OutboxMessage).where(and_(
+                OutboxMessage.status != OutboxStatus.PENDING.value,
+                OutboxMessage.created_at < datetime.now(timezone.utc) - older_than
+            ))
+        )
+        await self.db.commit()
+        return result.rowcount
@@ -0,0 +1,206 @@
+"""
+Сервис обслуживания месячных партиций messages и notifications.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# Партиционированные по created_at таблицы (миграция 0003_partition_messages)
+PARTITIONED_TABLES = ("messages", "notifications")
+
+# Схема, в которую переносятся отсоединенные старые партиции
+ARCHIVE_SCHEMA = "archive"
+
+# Имя партиции: messages_y2024m09
+PARTITION_NAME_RE = re.compile(r"^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$")
+
+
+def month_start(moment: datetime, shift: int = 0) -> datetime:
+    """
+    Начало месяца (UTC), смещенного на shift месяцев от moment.
+
+    Args:
+        moment: Исходная дата
+        shift: Смещение в месяцах (может быть отрицательным)
+
+    Returns:
+        datetime: Первое число месяца 00:00 UTC
+    """
+    month_index = moment.year * 12 + (moment.month - 1) + shift
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Имя месячной партиции таблицы."""
+    return f"{table}_y{month:%Y}m{month:%m}"
+
+
+class PartitionService:
+    """Сервис для создания и архивации месячных партиций."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def is_partitioned(self, table: str) -> bool:
+        """
+        Проверка, является ли таблица партиционированной.
+
+        Базы, созданные через create_all без миграций, остаются обычными
+        таблицами - для них обслуживание партиций пропускается.
+
+        Args:
+            table: Имя таблицы
+
+        Returns:
+            bool: True если таблица партиционирована
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :table AND pg_table_is_visible(c.oid)"
+            ),
+            {"table": table}
+        )
+        return result.scalar() is not None
+
+    async def get_partitions(self, table: str) -> List[str]:
+        """
+        Получение списка подключенных партиций таблицы.
+
+        Args:
+            table: Имя родительской таблицы
+
+        Returns:
+            List[str]: Имена партиций
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = :table AND pg_table_is_visible(parent.oid) "
+                "ORDER BY child.relname"
+            ),
+            {"table": table}
+        )
+        return list(result.scalars().all())
+
+    async def ensure_partitions(self, table: str, months_ahead: int = 3) -> List[str]:
+        """
+        Создание партиций на текущий и следующие месяцы.
+
+        Args:
+            table: Имя партиционированной таблицы
+            months_ahead: Сколько месяцев вперед подготовить
+
+        Returns:
+            List[str]: Имена вновь созданных партиций
+        """
+        existing = set(await self.get_partitions(table))
+        now = datetime.now(timezone.utc)
+        created = []
+
+        for shift in range(months_ahead + 1):
+            start = month_start(now, shift)
+            name = partition_name(table, start)
+            if name in existing:
+                continue
+
+            await self.db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start.isoformat()}') "
+                f"TO ('{month_start(start, 1).isoformat()}')"
+            ))
+            created.append(name)
+
+        await self.db.commit()
+
+        for name in created:
+            logger.info(f"Created partition {name}")
+
+        return created
+
+    async def detach_old_partitions(self, table: str, keep_months: int = 12) -> List[str]:
+        """
+        Отсоединение партиций старше keep_months и перенос в архивную схему.
+
+        Отсоединенные партиции остаются доступными как archive.<имя> для
+        выгрузок, но больше не участвуют в запросах, VACUUM и обслуживании
+        индексов основной таблицы.
+
+        Args:
+            table: Имя партиционированной таблицы
+            keep_months: Сколько месяцев истории оставить подключенными
+
+        Returns:
+            List[str]: Имена отсоединенных партиций
+        """
+        cutoff = month_start(datetime.now(timezone.utc), -keep_months)
+        detached = []
+
+        await self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+
+        for name in await self.get_partitions(table):
+            match = PARTITION_NAME_RE.match(name)
+            if not match or match.group("table") != table:
+                continue
+
+            start = datetime(
+                int(match.group("year")), int(match.group("month")), 1, tzinfo=timezone.utc
+            )
+            if start >= cutoff:
+                continue
+
+            await self.db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await self.db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            detached.append(name)
+
+        await self.db.commit()
+
+        for name in detached:
+            logger.info(f"Detached partition {name} into schema {ARCHIVE_SCHEMA}")
+
+        return detached
+
+    async def run_maintenance(self, months_ahead: int = 3, keep_months: int = 12) -> None:
+        """
+        Полный цикл обслуживания всех партиционированных таблиц.
+
+        Args:
+            months_ahead: Сколько месяцев вперед подготовить
+            keep_months: Сколько месяцев истории оставить подключенными
+        """
+        for table in PARTITIONED_TABLES:
+            if not await self.is_partitioned(table):
+                logger.debug(f"Table {table} is not partitioned, skipping maintenance")
+                continue
+
+            await self.ensure_partitions(table, months_ahead)
+            await self.detach_old_partitions(table, keep_months)
+
+
+async def partition_maintenance_loop(session_factory, interval_hours: float = 24) -> None:
+    """
+    Фоновая задача: обслуживание партиций при старте и далее раз в interval_hours.
+
+    Args:
+        session_factory: Фабрика асинхронных сессий
+        interval_hours: Интервал между запусками
+    """
+    while True:
+        try:
+            async with session_factory() as session:
+                await PartitionService(session).run_maintenance()
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}", exc_info=True)
+
+        await asyncio.sleep(interval_hours * 3600)
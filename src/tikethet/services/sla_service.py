@@ -0,0 +1,427 @@
+"""
+SLA первого ответа: иерархическое колесо таймеров.
+
+Вместо ежеминутного опроса БД каждый тикет без ответа персонала держит
+таймер в памяти процесса API. Колесо перестраивается из активных тикетов
+при старте и обновляется сервисами тикетов и сообщений после commit.
+Вставка и отмена таймера - O(1), нарушение срабатывает в пределах одного
+тика (1 секунда) от дедлайна.
+
+Истинным источником остается БД: при срабатывании наличие первого ответа
+проверяется заново, а событие SLA_BREACHED с уникальным индексом
+гарантирует одно уведомление на тикет даже при нескольких воркерах.
+"""
+
+import asyncio
+import html
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.notification import Notification, NotificationType
+from tikethet.models.outbox import DeliveryLane
+from tikethet.models.ticket import Ticket, TicketPriority, ACTIVE_TICKET_STATUSES
+from tikethet.models.ticket_event import TicketEvent, TicketEventType
+from tikethet.services.event_service import TicketEventService
+from tikethet.services.outbox_service import OutboxService
+from tikethet.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+# Срок первого ответа персонала по приоритетам (минуты), переопределяется
+# переменными окружения SLA_<PRIORITY>_MINUTES
+SLA_FIRST_RESPONSE_MINUTES = {
+    priority: int(os.getenv(f"SLA_{priority.value}_MINUTES", default))
+    for priority, default in (
+        (TicketPriority.CRITICAL, "15"),
+        (TicketPriority.HIGH, "60"),
+        (TicketPriority.NORMAL, "240"),
+        (TicketPriority.LOW, "1440"),
+    )
+}
+
+# Размеры уровней колеса при тике 1 с: секунды, минуты, часы, сутки (до 64 дней)
+WHEEL_TICK_SECONDS = 1.0
+WHEEL_LEVEL_SIZES = (60, 60, 24, 64)
+
+
+class TimerHandle:
+    """Таймер колеса; хранит ссылку на свой слот для отмены за O(1)."""
+
+    __slots__ = ("key", "deadline", "slot")
+
+    def __init__(self, key: Hashable, deadline: int):
+        self.key = key
+        self.deadline = deadline
+        self.slot: Optional[Dict[Hashable, "TimerHandle"]] = None
+
+
+class HierarchicalTimingWheel:
+    """
+    Иерархическое колесо таймеров (Varghese & Lauck).
+
+    Уровень i состоит из слотов шириной prod(sizes[:i]) тиков. Таймер
+    кладется на самый нижний уровень, чей охват вмещает остаток до
+    дедлайна; при переходе границы слота верхнего уровня его таймеры
+    перераспределяются вниз. Таймеры дальше охвата колеса ждут в overflow
+    и перераспределяются при обороте верхнего уровня.
+    """
+
+    def __init__(self, now_tick: int, sizes: tuple = WHEEL_LEVEL_SIZES):
+        self.sizes = sizes
+        self.spans = []
+        span = 1
+        for size in sizes:
+            self.spans.append(span)
+            span *= size
+        self.horizon = span
+
+        self.current = now_tick
+        self.levels: List[List[Dict[Hashable, TimerHandle]]] = [
+            [{} for _ in range(size)] for size in sizes
+        ]
+        self.overflow: Dict[Hashable, TimerHandle] = {}
+        self.timers: Dict[Hashable, TimerHandle] = {}
+        self._due: List[TimerHandle] = []
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.timers
+
+    def _place(self, handle: TimerHandle) -> None:
+        delta = handle.deadline - self.current
+
+        if delta <= 0:
+            handle.slot = None
+            self._due.append(handle)
+            return
+
+        if delta >= self.horizon:
+            slot = self.overflow
+        else:
+            level = 0
+            while delta >= self.spans[level] * self.sizes[level]:
+                level += 1
+            index = (handle.deadline // self.spans[level]) % self.sizes[level]
+            slot = self.levels[level][index]
+
+        slot[handle.key] = handle
+        handle.slot = slot
+
+    def schedule(self, key: Hashable, deadline: int) -> TimerHandle:
+        """
+        Установка таймера (существующий таймер с тем же ключом заменяется).
+
+        Args:
+            key: Ключ таймера
+            deadline: Дедлайн в тиках
+
+        Returns:
+            TimerHandle: Таймер
+        """
+        self.cancel(key)
+        handle = TimerHandle(key, deadline)
+        self.timers[key] = handle
+        self._place(handle)
+        return handle
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Отмена таймера.
+
+        Args:
+            key: Ключ таймера
+
+        Returns:
+            bool: True если таймер был установлен
+        """
+        handle = self.timers.pop(key, None)
+        if handle is None:
+            return False
+
+        if handle.slot is not None:
+            del handle.slot[key]
+        else:
+            self._due.remove(handle)
+        return True
+
+    def _cascade(self, slot: Dict[Hashable, TimerHandle]) -> None:
+        handles = list(slot.values())
+        slot.clear()
+        for handle in handles:
+            self._place(handle)
+
+    def advance(self, now_tick: int) -> List[TimerHandle]:
+        """
+        Продвижение колеса до now_tick.
+
+        Пустое колесо перескакивает сразу, иначе обрабатывается каждый тик:
+        сначала перераспределяются слоты верхних уровней, чья граница
+        пройдена, затем срабатывает текущий слот нижнего уровня.
+
+        Args:
+            now_tick: Текущий тик
+
+        Returns:
+            List[TimerHandle]: Сработавшие таймеры (сняты с колеса)
+        """
+        while self.current < now_tick:
+            if not self.timers:
+                self.current = now_tick
+                break
+
+            self.current += 1
+
+            if self.overflow and self.current % self.horizon == 0:
+                self._cascade(self.overflow)
+
+            for level in range(len(self.sizes) - 1, 0, -1):
+                span = self.spans[level]
+                if self.current % span == 0:
+                    self._cascade(self.levels[level][(self.current // span) % self.sizes[level]])
+
+            self._cascade(self.levels[0][self.current % self.sizes[0]])
+
+        expired, self._due = self._due, []
+        for handle in expired:
+            del self.timers[handle.key]
+        return expired
+
+
+def first_response_deadline(ticket: Ticket) -> datetime:
+    """
+    Дедлайн первого ответа персонала по приоритету тикета.
+
+    Args:
+        ticket: Тикет
+
+    Returns:
+        datetime: Момент нарушения SLA (UTC)
+    """
+    created_at = ticket.created_at
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at + timedelta(minutes=SLA_FIRST_RESPONSE_MINUTES[ticket.priority])
+
+
+class SlaService:
+    """Сервис SLA: выборка тикетов под таймерами и фиксация нарушений."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_pending_tickets(self) -> List[Ticket]:
+        """
+        Активные тикеты без первого ответа и без зафиксированного нарушения.
+
+        Returns:
+            List[Ticket]: Тикеты, для которых нужен таймер
+        """
+        settled = select(TicketEvent.ticket_id).where(and_(
+            TicketEvent.ticket_id == Ticket.id,
+            TicketEvent.event_type.in_([
+                TicketEventType.FIRST_RESPONSE, TicketEventType.SLA_BREACHED
+            ])
+        ))
+        result = await self.db.execute(
+            select(Ticket).where(and_(
+                Ticket.status.in_(ACTIVE_TICKET_STATUSES),
+                ~settled.exists()
+            ))
+        )
+        return result.scalars().all()
+
+    async def has_first_response(self, ticket_id: uuid.UUID) -> bool:
+        """
+        Проверка наличия первого ответа персонала.
+
+        Args:
+            ticket_id: ID тикета
+
+        Returns:
+            bool: True если ответ был
+        """
+        result = await self.db.execute(
+            select(TicketEvent.id).where(and_(
+                TicketEvent.ticket_id == ticket_id,
+                TicketEvent.event_type == TicketEventType.FIRST_RESPONSE
+            ))
+        )
+        return result.first() is not None
+
+    async def register_breach(self, ticket: Ticket) -> bool:
+        """
+        Фиксация нарушения и уведомление персонала.
+
+        Уведомляется исполнитель, а для неназначенного тикета - весь
+        активный персонал: запись в notifications и алерт в Telegram
+        (полоса CRITICAL очереди исходящих сообщений).
+
+        Args:
+            ticket: Тикет с истекшим сроком первого ответа
+
+        Returns:
+            bool: True если нарушение зафиксировано этим вызовом
+        """
+        if not await TicketEventService(self.db).record_sla_breach(ticket):
+            await self.db.rollback()
+            return False
+
+        users = UserService(self.db)
+        if ticket.assigned_to:
+            assignee = await users.get_user_by_id(ticket.assigned_to)
+            recipients = [assignee] if assignee else []
+        else:
+            recipients = await users.get_staff_users()
+
+        minutes = SLA_FIRST_RESPONSE_MINUTES[ticket.priority]
+        content = (
+            f"{ticket.display_title}: нет ответа персонала более {minutes} мин. "
+            f"(приоритет: {ticket.priority.display_name})"
+        )
+        self.db.add_all([
+            Notification(
+                user_id=user.id,
+                ticket_id=ticket.id,
+                type=NotificationType.SYSTEM,
+                title="Нарушен SLA первого ответа",
+                content=content
+            )
+            for user in recipients
+        ])
+        OutboxService(self.db).enqueue_many(
+            (user.telegram_id for user in recipients),
+            f"⏰ <b>Нарушен SLA первого ответа</b>\n{html.escape(content)}",
+            lane=DeliveryLane.CRITICAL
+        )
+        await self.db.commit()
+        return True
+
+
+class SlaMonitor:
+    """
+    Таймеры SLA процесса API.
+
+    Пока монитор не запущен (например, в процессе бота), хуки сервисов
+    ничего не делают: тикеты этого процесса подхватит перестройка колеса
+    при старте API или проверка БД при срабатывании.
+    """
+
+    def __init__(self, tick_seconds: float = WHEEL_TICK_SECONDS):
+        self.tick_seconds = tick_seconds
+        self.wheel = HierarchicalTimingWheel(self._now_tick())
+        self.running = False
+        self._session_factory: Optional[Callable] = None
+        self._tasks: set = set()
+
+    def _now_tick(self) -> int:
+        return int(time.time() / self.tick_seconds)
+
+    def _schedule(self, ticket: Ticket) -> None:
+        deadline = first_response_deadline(ticket).timestamp()
+        self.wheel.schedule(ticket.id, int(deadline / self.tick_seconds) + 1)
+
+    def on_ticket_created(self, ticket: Ticket) -> None:
+        """Хук: новый тикет ставится на таймер первого ответа."""
+        if self.running:
+            self._schedule(ticket)
+
+    def on_ticket_changed(self, ticket: Ticket) -> None:
+        """
+        Хук: смена статуса или приоритета.
+
+        Неактивный тикет снимается с таймера, активный ставится на таймер
+        по текущему приоритету - в том числе переоткрытый и созданный в
+        другом процессе. Наличие первого ответа проверяется по БД при
+        срабатывании, таймер отвеченного тикета просто отбрасывается.
+        """
+        if not self.running:
+            return
+
+        if ticket.status in ACTIVE_TICKET_STATUSES:
+            self._schedule(ticket)
+        else:
+            self.wheel.cancel(ticket.id)
+
+    def on_first_response(self, ticket_id: uuid.UUID) -> None:
+        """Хук: первый ответ персонала снимает таймер."""
+        if self.running:
+            self.wheel.cancel(ticket_id)
+
+    async def rebuild(self) -> int:
+        """
+        Перестройка колеса из активных тикетов без ответа.
+
+        Returns:
+            int: Количество установленных таймеров
+        """
+        async with self._session_factory() as session:
+            tickets = await SlaService(session).get_pending_tickets()
+
+        self.wheel = HierarchicalTimingWheel(self._now_tick())
+        for ticket in tickets:
+            self._schedule(ticket)
+
+        return len(tickets)
+
+    async def _handle_breach(self, ticket_id: uuid.UUID) -> None:
+        try:
+            async with self._session_factory() as session:
+                ticket = await session.get(Ticket, ticket_id)
+                if ticket is None or ticket.status not in ACTIVE_TICKET_STATUSES:
+                    return
+
+                service = SlaService(session)
+                if await service.has_first_response(ticket_id):
+                    return
+
+                # Приоритет мог быть понижен в другом процессе
+                if first_response_deadline(ticket) > datetime.now(timezone.utc):
+                    self._schedule(ticket)
+                    return
+
+                if await service.register_breach(ticket):
+                    logger.warning(
+                        f"SLA breached: ticket {ticket_id} ({ticket.priority}) "
+                        f"has no staff response in {SLA_FIRST_RESPONSE_MINUTES[ticket.priority]} min"
+                    )
+        except Exception as e:
+            logger.error(f"SLA breach handling failed for ticket {ticket_id}: {e}", exc_info=True)
+
+    async def run(self, session_factory) -> None:
+        """
+        Фоновая задача: перестройка колеса и обработка тиков.
+
+        Args:
+            session_factory: Фабрика асинхронных сессий
+        """
+        self._session_factory = session_factory
+        try:
+            scheduled = await self.rebuild()
+            logger.info(f"SLA timing wheel rebuilt: {scheduled} pending tickets")
+        except Exception as e:
+            logger.error(f"SLA timing wheel rebuild failed: {e}", exc_info=True)
+
+        self.running = True
+        try:
+            while True:
+                for handle in self.wheel.advance(self._now_tick()):
+                    task = asyncio.create_task(self._handle_breach(handle.key))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                await asyncio.sleep(self.tick_seconds - time.time() % self.tick_seconds)
+        finally:
+            self.running = False
+
+
+# Монитор процесса (запускается в lifespan приложения)
+sla_monitor = SlaMonitor()
@@ -0,0 +1,184 @@
+"""
+Сводка тикетов пользователя для команды /status.
+
+Счетчики (активные, ожидающие ответа, решенные сегодня) хранятся в
+памяти процесса по пользователю. Запись загружается запросом по индексу
+tickets.user_id (активные) и по событиям ticket_events за день (решенные)
+и дальше обновляется инкрементально хуками
+TicketService после каждого создания и перехода тикета, поэтому
+повторные /status не сканируют таблицу. Смена дня и max_age (изменения
+других процессов) приводят к перезагрузке записи.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from tikethet.models.ticket import (
+    Ticket, TicketStatus, ACTIVE_TICKET_STATUSES, INACTIVE_TICKET_STATUSES
+)
+from tikethet.models.ticket_event import TicketEvent, TicketEventType
+
+
+@dataclass
+class TicketSummary:
+    """Счетчики тикетов пользователя."""
+
+    active: int = 0
+    waiting: int = 0
+    resolved_today: int = 0
+
+
+@dataclass
+class _Entry:
+    summary: TicketSummary
+    day: date
+    loaded_at: float
+
+
+class TicketSummaryCache:
+    """Процессный кэш сводок тикетов по пользователям (LRU)."""
+
+    def __init__(self, max_age: float = 300, max_entries: int = 10000):
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[uuid.UUID, _Entry]" = OrderedDict()
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(timezone.utc).date()
+
+    def _fresh_entry(self, user_id: uuid.UUID) -> Optional[_Entry]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        if entry.day != self._today() or time.monotonic() - entry.loaded_at >= self.max_age:
+            del self._entries[user_id]
+            return None
+        return entry
+
+    def invalidate(self, user_id: Optional[uuid.UUID] = None) -> None:
+        """
+        Сброс сводки пользователя (или всех сводок).
+
+        Args:
+            user_id: ID пользователя, None - все записи
+        """
+        if user_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(user_id, None)
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID) -> TicketSummary:
+        """
+        Сводка тикетов пользователя.
+
+        Args:
+            db: Сессия базы данных (используется при промахе кэша)
+            user_id: ID пользователя
+
+        Returns:
+            TicketSummary: Копия счетчиков
+        """
+        entry = self._fresh_entry(user_id)
+        if entry is None:
+            entry = await self._load(db, user_id)
+        else:
+            self._entries.move_to_end(user_id)
+
+        summary = entry.summary
+        return TicketSummary(summary.active, summary.waiting, summary.resolved_today)
+
+    async def _load(self, db: AsyncSession, user_id: uuid.UUID) -> _Entry:
+        today = self._today()
+        day_start = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+
+        result = await db.execute(
+            select(Ticket.status, func.count())
+            .where(and_(
+                Ticket.user_id == user_id,
+                Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+            ))
+            .group_by(Ticket.status)
+        )
+        counts = dict(result.all())
+
+        # Решенные сегодня - по событиям перехода из активного статуса в
+        # RESOLVED/CLOSED: updated_at меняется при любой правке тикета
+        result = await db.execute(
+            select(func.count(func.distinct(TicketEvent.ticket_id)))
+            .join(Ticket, Ticket.id == TicketEvent.ticket_id)
+            .where(and_(
+                TicketEvent.event_type == TicketEventType.STATUS_CHANGED,
+                TicketEvent.created_at >= day_start,
+                TicketEvent.from_status.in_(ACTIVE_TICKET_STATUSES),
+                TicketEvent.to_status.in_(INACTIVE_TICKET_STATUSES),
+                Ticket.user_id == user_id,
+                Ticket.status.in_(INACTIVE_TICKET_STATUSES)
+            ))
+        )
+
+        summary = TicketSummary(
+            active=sum(counts.get(status, 0) for status in ACTIVE_TICKET_STATUSES),
+            waiting=counts.get(TicketStatus.WAITING_RESPONSE, 0),
+            resolved_today=result.scalar_one()
+        )
+
+        entry = _Entry(summary, today, time.monotonic())
+        self._entries[user_id] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def on_ticket_created(self, ticket: Ticket) -> None:
+        """Хук TicketService: новый тикет пользователя."""
+        entry = self._fresh_entry(ticket.user_id)
+        if entry is None:
+            return
+
+        entry.summary.active += 1
+        if ticket.status == TicketStatus.WAITING_RESPONSE:
+            entry.summary.waiting += 1
+
+    def on_ticket_changed(self, previous_status: TicketStatus, ticket: Ticket) -> None:
+        """
+        Хук TicketService: переход статуса тикета (после commit).
+
+        Args:
+            previous_status: Статус до изменения
+            ticket: Тикет после изменения
+        """
+        status = ticket.status
+        if status == previous_status:
+            return
+
+        entry = self._fresh_entry(ticket.user_id)
+        if entry is None:
+            return
+
+        if not previous_status.is_active:
+            # Переоткрытие или RESOLVED -> CLOSED: неизвестно, был ли тикет
+            # учтен в "решенных сегодня" - запись перечитывается
+            self.invalidate(ticket.user_id)
+            return
+
+        summary = entry.summary
+        if previous_status == TicketStatus.WAITING_RESPONSE:
+            summary.waiting -= 1
+        if status == TicketStatus.WAITING_RESPONSE:
+            summary.waiting += 1
+
+        if not status.is_active:
+            summary.active -= 1
+            summary.resolved_today += 1
+
+
+# Общий для процесса кэш (TicketService, команда /status)
+ticket_summary_cache = TicketSummaryCache()
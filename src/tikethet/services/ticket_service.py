@@ -3,19 +3,63 @@
 """
 
 import uuid
-from typing import Optional, List, Tuple
-from datetime import datetime
+from typing import Optional, List, Tuple, AsyncIterator
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, func, or_, and_
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from tikethet.models.ticket import Ticket, TicketStatus, TicketPriority
+from tikethet.models.ticket import (
+    Ticket, TicketStatus, TicketPriority,
+    ACTIVE_TICKET_STATUSES, INACTIVE_TICKET_STATUSES
+)
 from tikethet.models.user import User, UserRole
 from tikethet.models.category import Category
 from tikethet.models.message import Message
 from tikethet.schemas.ticket import TicketCreate, TicketUpdate, TicketFilter
 from tikethet.schemas.common import PaginationParams
+from tikethet.services.rollup_service import RollupService, bucket_start
+from tikethet.services.event_service import TicketEventService
+from tikethet.services.sla_service import sla_monitor
+from tikethet.services.assignment_service import assignment_engine
+from tikethet.services.summary_service import ticket_summary_cache
+from tikethet.models.ticket_event import TicketEventType
+
+
+# Размер пакета серверного курсора при выгрузке
+EXPORT_BATCH_SIZE = 1000
+
+# Колонки выгрузки тикетов (плоские строки без ORM объектов и identity map)
+TICKET_EXPORT_COLUMNS = (
+    Ticket.id,
+    Ticket.title,
+    Ticket.description,
+    Ticket.status,
+    Ticket.priority,
+    Ticket.category_id,
+    Category.name.label("category_name"),
+    Ticket.user_id,
+    Ticket.assigned_to,
+    Ticket.created_at,
+    Ticket.updated_at,
+    Ticket.closed_at,
+)
+
+# Колонки выгрузки сообщений
+MESSAGE_EXPORT_COLUMNS = (
+    Message.id,
+    Message.ticket_id,
+    Message.user_id,
+    Message.content,
+    Message.is_internal,
+    Message.attachments,
+    Message.created_at,
+)
+
+TICKET_EXPORT_FIELDS = tuple(column.key for column in TICKET_EXPORT_COLUMNS)
+MESSAGE_EXPORT_FIELDS = tuple(column.key for column in MESSAGE_EXPORT_COLUMNS)
 
 
 class TicketService:
@@ -52,39 +96,143 @@ class TicketService:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
-    async def create_ticket(self, ticket_data: TicketCreate, user: User) -> Ticket:
+    async def get_ticket_by_external_id(self, external_id: str) -> Optional[Ticket]:
+        """
+        Получение тикета по ключу дедупликации внешнего источника.
+        
+        Args:
+            external_id: Ключ (например, tg:<chat_id>:<message_id>)
+            
+        Returns:
+            Optional[Ticket]: Тикет или None
+        """
+        result = await self.db.execute(
+            select(Ticket).where(Ticket.external_id == external_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def create_ticket(
+        self,
+        ticket_data: TicketCreate,
+        user: User,
+        external_id: Optional[str] = None
+    ) -> Ticket:
         """
         Создание нового тикета.
         
+        Исполнитель назначается автоматически (AssignmentEngine) в той же
+        транзакции; статус остается OPEN до первого ответа.
+        
         Args:
             ticket_data: Данные для создания тикета
             user: Автор тикета
+            external_id: Ключ дедупликации (уникален)
             
         Returns:
             Ticket: Созданный тикет
         """
+        # Исполнитель выбирается до вставки и сохраняется в той же транзакции
+        assignee_id = await assignment_engine.pick(self.db, ticket_data.category_id)
+        
         ticket = Ticket(
             title=ticket_data.title,
             description=ticket_data.description,
             category_id=ticket_data.category_id,
             priority=ticket_data.priority,
             user_id=user.id,
-            status=TicketStatus.OPEN
+            assigned_to=assignee_id,
+            status=TicketStatus.OPEN,
+            external_id=external_id
         )
         
-        self.db.add(ticket)
-        await self.db.commit()
+        try:
+            self.db.add(ticket)
+            # ID тикета нужен событию истории до commit
+            await self.db.flush()
+            
+            events = TicketEventService(self.db)
+            events.record(ticket, TicketEventType.CREATED, actor=user)
+            if assignee_id:
+                events.record(ticket, TicketEventType.ASSIGNED)
+            await RollupService(self.db).record(ticket, "created")
+            await self.db.commit()
+        except Exception:
+            assignment_engine.release(assignee_id)
+            raise
+        
         await self.db.refresh(ticket)
         
         # Загружаем связанные объекты
         await self.db.refresh(ticket, ["user", "category"])
         
+        sla_monitor.on_ticket_created(ticket)
+        ticket_summary_cache.on_ticket_created(ticket)
+        
         return ticket
     
+    async def create_ticket_once(
+        self,
+        ticket_data: TicketCreate,
+        user: User,
+        external_id: str
+    ) -> Tuple[Ticket, bool]:
+        """
+        Идемпотентное создание тикета по ключу внешнего источника.
+        
+        Повторная доставка (в том числе параллельная, в другой реплике)
+        возвращает уже созданный тикет: гонку разрешает уникальный индекс.
+        
+        Args:
+            ticket_data: Данные для создания тикета
+            user: Автор тикета
+            external_id: Ключ дедупликации
+            
+        Returns:
+            Tuple[Ticket, bool]: (тикет, был_ли_создан)
+        """
+        existing = await self.get_ticket_by_external_id(external_id)
+        if existing is not None:
+            return existing, False
+        
+        try:
+            return await self.create_ticket(ticket_data, user, external_id=external_id), True
+        except IntegrityError:
+            await self.db.rollback()
+            existing = await self.get_ticket_by_external_id(external_id)
+            if existing is None:
+                raise
+            return existing, False
+    
+    async def append_description(self, ticket_id: uuid.UUID, text: str) -> bool:
+        """
+        Дополнение описания активного тикета (следующие сообщения
+        быстрого обращения). Конкатенация выполняется в UPDATE, поэтому
+        параллельные дополнения не теряются.
+        
+        Args:
+            ticket_id: ID тикета
+            text: Добавляемый текст
+            
+        Returns:
+            bool: False если тикет не найден или уже не активен
+        """
+        result = await self.db.execute(
+            update(Ticket)
+            .where(and_(
+                Ticket.id == ticket_id,
+                Ticket.status.in_(ACTIVE_TICKET_STATUSES)
+            ))
+            .values(description=Ticket.description + "\n\n" + text)
+        )
+        await self.db.commit()
+        
+        return result.rowcount > 0
+    
     async def update_ticket(
         self, 
         ticket: Ticket, 
-        ticket_data: TicketUpdate
+        ticket_data: TicketUpdate,
+        actor: Optional[User] = None
     ) -> Ticket:
         """
         Обновление тикета.
@@ -92,6 +240,7 @@ class TicketService:
         Args:
             ticket: Тикет для обновления
             ticket_data: Новые данные
+            actor: Пользователь, выполняющий изменение
             
         Returns:
             Ticket: Обновленный тикет
@@ -102,18 +251,24 @@ class TicketService:
         if "status" in update_data and update_data["status"] == TicketStatus.CLOSED:
             update_data["closed_at"] = datetime.utcnow()
         
+        previous_status = ticket.status
+        previous_assignee = ticket.assigned_to
+        
         for field, value in update_data.items():
             setattr(ticket, field, value)
         
+        await self._record_status_change(ticket, previous_status, actor)
         await self.db.commit()
         await self.db.refresh(ticket)
+        self._after_change(ticket, previous_status, previous_assignee)
         
         return ticket
     
     async def assign_ticket(
         self, 
         ticket: Ticket, 
-        assigned_user: Optional[User]
+        assigned_user: Optional[User],
+        actor: Optional[User] = None
     ) -> Ticket:
         """
         Назначение тикета на пользователя.
@@ -121,46 +276,95 @@ class TicketService:
         Args:
             ticket: Тикет для назначения
             assigned_user: Пользователь для назначения (None для снятия назначения)
+            actor: Пользователь, выполняющий назначение
             
         Returns:
             Ticket: Обновленный тикет
         """
+        previous_status = ticket.status
+        previous_assignee = ticket.assigned_to
         ticket.assigned_to = assigned_user.id if assigned_user else None
         
         # Если назначаем тикет и он открыт, меняем статус на "В работе"
         if assigned_user and ticket.status == TicketStatus.OPEN:
             ticket.status = TicketStatus.IN_PROGRESS
         
+        if ticket.assigned_to != previous_assignee:
+            TicketEventService(self.db).record(
+                ticket, TicketEventType.ASSIGNED, actor=actor, from_status=previous_status
+            )
+        await self._record_status_change(ticket, previous_status, actor)
         await self.db.commit()
         await self.db.refresh(ticket)
+        self._after_change(ticket, previous_status, previous_assignee)
         
         return ticket
     
-    async def get_tickets(
+    async def claim_next_ticket(
         self,
-        filters: TicketFilter,
-        pagination: PaginationParams,
-        user: User
-    ) -> Tuple[List[Ticket], int]:
+        user: User,
+        category_id: Optional[uuid.UUID] = None
+    ) -> Optional[Ticket]:
         """
-        Получение списка тикетов с фильтрами и пагинацией.
+        Взять в работу следующий тикет.
+        
+        Работает вместе с автоназначением (AUTO_ASSIGNMENT_ENABLED):
+        движок назначает новый тикет исполнителю, но оставляет его OPEN,
+        и claim-next сначала отдает сотруднику его собственные еще не
+        начатые тикеты, а затем - общую очередь без исполнителя (тикеты,
+        созданные без доступного персонала или при выключенном
+        автоназначении). Строки блокируются FOR UPDATE SKIP LOCKED:
+        параллельные сотрудники пропускают тикеты, уже взятые другими
+        транзакциями, и не ждут их. Блокировка снимается commit'ом
+        назначения.
+        
+        Args:
+            user: Сотрудник, берущий тикет
+            category_id: Ограничение по категории
+            
+        Returns:
+            Optional[Ticket]: Назначенный тикет или None, если очередь пуста
+        """
+        pools = [
+            # Автоназначенные на сотрудника, но еще не взятые в работу
+            [Ticket.assigned_to == user.id, Ticket.status == TicketStatus.OPEN],
+            # Общая очередь без исполнителя
+            [Ticket.assigned_to.is_(None), Ticket.status.in_(ACTIVE_TICKET_STATUSES)],
+        ]
+        
+        ticket = None
+        for conditions in pools:
+            if category_id:
+                conditions.append(Ticket.category_id == category_id)
+            
+            result = await self.db.execute(
+                select(Ticket)
+                .where(and_(*conditions))
+                .order_by(Ticket.priority.desc(), Ticket.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            ticket = result.scalar_one_or_none()
+            if ticket is not None:
+                break
+        
+        if ticket is None:
+            await self.db.rollback()
+            return None
+        
+        return await self.assign_ticket(ticket, user, actor=user)
+    
+    def _build_conditions(self, filters: TicketFilter, user: User) -> list:
+        """
+        Построение условий WHERE по фильтрам и правам пользователя.
         
         Args:
             filters: Фильтры для поиска
-            pagination: Параметры пагинации
             user: Пользователь, который запрашивает список
             
         Returns:
-            Tuple[List[Ticket], int]: (список тикетов, общее количество)
+            list: Список SQLAlchemy условий
         """
-        # Базовый запрос с загрузкой связанных объектов
-        base_query = select(Ticket).options(
-            selectinload(Ticket.user),
-            selectinload(Ticket.assigned_user),
-            selectinload(Ticket.category)
-        )
-        
-        # Применяем фильтры доступа
         conditions = []
         
         # Обычные пользователи видят только свои тикеты
@@ -176,6 +380,9 @@ class TicketService:
         # Применяем фильтры
         if filters.status:
             conditions.append(Ticket.status == filters.status)
+        elif filters.active_only:
+            # Условие совпадает с предикатом частичных индексов
+            conditions.append(Ticket.status.in_(ACTIVE_TICKET_STATUSES))
         
         if filters.priority:
             conditions.append(Ticket.priority == filters.priority)
@@ -192,31 +399,211 @@ class TicketService:
                 )
             )
         
-        # Применяем условия к запросу
-        if conditions:
-            base_query = base_query.where(and_(*conditions))
+        return conditions
+    
+    async def _fetch_page(
+        self,
+        conditions: list,
+        order_by: tuple,
+        pagination: PaginationParams
+    ) -> Tuple[List[Ticket], int]:
+        """
+        Выполнение запроса страницы тикетов и подсчета общего количества.
         
+        Args:
+            conditions: Условия WHERE
+            order_by: Выражения сортировки
+            pagination: Параметры пагинации
+            
+        Returns:
+            Tuple[List[Ticket], int]: (список тикетов, общее количество)
+        """
         # Запрос для подсчета общего количества
         count_query = select(func.count()).select_from(Ticket)
         if conditions:
             count_query = count_query.where(and_(*conditions))
         
-        # Получаем общее количество
         total_result = await self.db.execute(count_query)
         total = total_result.scalar()
         
+        # Базовый запрос с загрузкой связанных объектов
+        query = select(Ticket).options(
+            selectinload(Ticket.user),
+            selectinload(Ticket.assigned_user),
+            selectinload(Ticket.category)
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+        
         # Применяем сортировку и пагинацию
-        query = base_query.order_by(
-            Ticket.priority.desc(),
-            Ticket.created_at.desc()
-        ).offset(pagination.skip).limit(pagination.limit)
+        query = query.order_by(*order_by).offset(pagination.skip).limit(pagination.limit)
         
-        # Выполняем запрос
         result = await self.db.execute(query)
         tickets = result.scalars().all()
         
         return tickets, total
     
+    async def get_tickets(
+        self,
+        filters: TicketFilter,
+        pagination: PaginationParams,
+        user: User
+    ) -> Tuple[List[Ticket], int]:
+        """
+        Получение списка тикетов с фильтрами и пагинацией.
+        
+        Args:
+            filters: Фильтры для поиска
+            pagination: Параметры пагинации
+            user: Пользователь, который запрашивает список
+            
+        Returns:
+            Tuple[List[Ticket], int]: (список тикетов, общее количество)
+        """
+        conditions = self._build_conditions(filters, user)
+        
+        return await self._fetch_page(
+            conditions,
+            (Ticket.priority.desc(), Ticket.created_at.desc()),
+            pagination
+        )
+    
+    async def get_active_queue(
+        self,
+        filters: TicketFilter,
+        pagination: PaginationParams,
+        user: User
+    ) -> Tuple[List[Ticket], int]:
+        """
+        Рабочая очередь персонала - только активные тикеты.
+        
+        Читает "горячую" часть таблицы через частичный индекс
+        ix_tickets_active_priority_created, не затрагивая историю.
+        
+        Args:
+            filters: Дополнительные фильтры (статус должен быть активным)
+            pagination: Параметры пагинации
+            user: Сотрудник, который запрашивает очередь
+            
+        Returns:
+            Tuple[List[Ticket], int]: (список тикетов, общее количество)
+        """
+        filters = filters.model_copy(update={"active_only": True})
+        if filters.status and not filters.status.is_active:
+            return [], 0
+        
+        conditions = self._build_conditions(filters, user)
+        
+        return await self._fetch_page(
+            conditions,
+            (Ticket.priority.desc(), Ticket.created_at.desc()),
+            pagination
+        )
+    
+    async def get_archived_tickets(
+        self,
+        filters: TicketFilter,
+        pagination: PaginationParams,
+        user: User
+    ) -> Tuple[List[Ticket], int]:
+        """
+        Архивный путь: решенные и закрытые тикеты.
+        
+        Сортировка по времени завершения: closed_at, а для решенных
+        (RESOLVED, closed_at не заполняется) - updated_at; id - для
+        стабильной пагинации. Использует индекс ix_tickets_archive_finished_at.
+        
+        Args:
+            filters: Дополнительные фильтры
+            pagination: Параметры пагинации
+            user: Пользователь, который запрашивает архив
+            
+        Returns:
+            Tuple[List[Ticket], int]: (список тикетов, общее количество)
+        """
+        filters = filters.model_copy(update={"active_only": False})
+        if filters.status and filters.status.is_active:
+            return [], 0
+        
+        conditions = self._build_conditions(filters, user)
+        if not filters.status:
+            conditions.append(Ticket.status.in_(INACTIVE_TICKET_STATUSES))
+        
+        return await self._fetch_page(
+            conditions,
+            (func.coalesce(Ticket.closed_at, Ticket.updated_at).desc(), Ticket.id.desc()),
+            pagination
+        )
+    
+    async def stream_tickets_for_export(
+        self,
+        filters: TicketFilter,
+        user: User,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Потоковая выгрузка тикетов по фильтрам.
+        
+        Строки читаются серверным курсором пакетами по batch_size и
+        отдаются по одной - память не зависит от размера выгрузки.
+        
+        Args:
+            filters: Фильтры (как у списка тикетов)
+            user: Пользователь, который запрашивает выгрузку
+            batch_size: Размер пакета курсора
+            
+        Yields:
+            dict: Строка с полями TICKET_EXPORT_FIELDS
+        """
+        conditions = self._build_conditions(filters, user)
+        
+        query = (
+            select(*TICKET_EXPORT_COLUMNS)
+            .outerjoin(Category, Category.id == Ticket.category_id)
+            .order_by(Ticket.created_at, Ticket.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if conditions:
+            query = query.where(and_(*conditions))
+        
+        result = await self.db.stream(query)
+        async for row in result.mappings():
+            yield row
+    
+    async def stream_messages_for_export(
+        self,
+        filters: TicketFilter,
+        user: User,
+        batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Потоковая выгрузка сообщений тикетов, подходящих под фильтры.
+        
+        Args:
+            filters: Фильтры тикетов (как у списка тикетов)
+            user: Пользователь, который запрашивает выгрузку
+            batch_size: Размер пакета курсора
+            
+        Yields:
+            dict: Строка с полями MESSAGE_EXPORT_FIELDS
+        """
+        conditions = self._build_conditions(filters, user)
+        
+        ticket_ids = select(Ticket.id)
+        if conditions:
+            ticket_ids = ticket_ids.where(and_(*conditions))
+        
+        query = (
+            select(*MESSAGE_EXPORT_COLUMNS)
+            .where(Message.ticket_id.in_(ticket_ids))
+            .order_by(Message.created_at, Message.id)
+            .execution_options(yield_per=batch_size)
+        )
+        
+        result = await self.db.stream(query)
+        async for row in result.mappings():
+            yield row
+    
     async def get_user_tickets(
         self,
         user: User,
@@ -261,14 +648,19 @@ class TicketService:
     async def get_assigned_tickets(
         self,
         user: User,
-        status_filter: Optional[TicketStatus] = None
+        status_filter: Optional[TicketStatus] = None,
+        include_inactive: bool = False
     ) -> List[Ticket]:
         """
         Получение тикетов, назначенных на пользователя.
         
+        По умолчанию возвращает только активные тикеты (живую работу),
+        закрытая история читается через get_archived_tickets.
+        
         Args:
             user: Пользователь
             status_filter: Фильтр по статусу
+            include_inactive: Включать ли решенные и закрытые тикеты
             
         Returns:
             List[Ticket]: Список назначенных тикетов
@@ -277,6 +669,8 @@ class TicketService:
         
         if status_filter:
             conditions.append(Ticket.status == status_filter)
+        elif not include_inactive:
+            conditions.append(Ticket.status.in_(ACTIVE_TICKET_STATUSES))
         
         query = select(Ticket).where(and_(*conditions)).options(
             selectinload(Ticket.user),
@@ -286,39 +680,98 @@ class TicketService:
         result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def close_ticket(self, ticket: Ticket) -> Ticket:
+    async def _record_status_change(
+        self,
+        ticket: Ticket,
+        previous_status: TicketStatus,
+        actor: Optional[User] = None
+    ) -> None:
+        """
+        Учет перехода статуса в истории и счетчиках (до commit, в той же транзакции).
+        
+        Args:
+            ticket: Тикет после перехода
+            previous_status: Статус до перехода
+            actor: Пользователь, вызвавший переход
+        """
+        if ticket.status == previous_status:
+            return
+        
+        TicketEventService(self.db).record(
+            ticket, TicketEventType.STATUS_CHANGED, actor=actor, from_status=previous_status
+        )
+        
+        rollups = RollupService(self.db)
+        
+        if ticket.status == TicketStatus.RESOLVED:
+            await rollups.record(ticket, "resolved")
+        elif ticket.status == TicketStatus.CLOSED:
+            await rollups.record(ticket, "closed")
+        elif ticket.status.is_active and not previous_status.is_active:
+            await rollups.record(ticket, "reopened")
+    
+    def _after_change(
+        self,
+        ticket: Ticket,
+        previous_status: TicketStatus,
+        previous_assignee: Optional[uuid.UUID]
+    ) -> None:
+        """
+        Обновление процессных моделей (SLA таймеры, нагрузка, сводки
+        пользователей) после commit.
+        
+        Args:
+            ticket: Тикет после изменения
+            previous_status: Статус до изменения
+            previous_assignee: Исполнитель до изменения
+        """
+        sla_monitor.on_ticket_changed(ticket)
+        assignment_engine.on_ticket_changed(previous_assignee, previous_status, ticket)
+        ticket_summary_cache.on_ticket_changed(previous_status, ticket)
+    
+    async def close_ticket(self, ticket: Ticket, actor: Optional[User] = None) -> Ticket:
         """
         Закрытие тикета.
         
         Args:
             ticket: Тикет для закрытия
+            actor: Пользователь, закрывающий тикет
             
         Returns:
             Ticket: Закрытый тикет
         """
+        previous_status = ticket.status
+        previous_assignee = ticket.assigned_to
         ticket.status = TicketStatus.CLOSED
         ticket.closed_at = datetime.utcnow()
         
+        await self._record_status_change(ticket, previous_status, actor)
         await self.db.commit()
         await self.db.refresh(ticket)
+        self._after_change(ticket, previous_status, previous_assignee)
         
         return ticket
     
-    async def reopen_ticket(self, ticket: Ticket) -> Ticket:
+    async def reopen_ticket(self, ticket: Ticket, actor: Optional[User] = None) -> Ticket:
         """
         Повторное открытие тикета.
         
         Args:
             ticket: Тикет для открытия
+            actor: Пользователь, открывающий тикет
             
         Returns:
             Ticket: Открытый тикет
         """
+        previous_status = ticket.status
+        previous_assignee = ticket.assigned_to
         ticket.status = TicketStatus.OPEN
         ticket.closed_at = None
         
+        await self._record_status_change(ticket, previous_status, actor)
         await self.db.commit()
         await self.db.refresh(ticket)
+        self._after_change(ticket, previous_status, previous_assignee)
         
         return ticket
     
@@ -326,6 +779,10 @@ class TicketService:
         """
         Получение статистики по тикетам.
         
+        Текущее распределение по статусам и приоритетам считается одним
+        GROUP BY, потоки за сегодня и за неделю (для персонала) читаются
+        из почасовых/дневных счетчиков.
+        
         Args:
             user: Пользователь для фильтрации (опционально)
             
@@ -336,34 +793,34 @@ class TicketService:
         
         if user and user.role == UserRole.USER:
             conditions.append(Ticket.user_id == user.id)
-        elif user and user.role.can_access(UserRole.HELPER):
-            # Персонал может видеть статистику по всем или назначенным тикетам
-            pass
         
-        base_query = select(func.count()).select_from(Ticket)
+        query = select(Ticket.status, Ticket.priority, func.count()).group_by(
+            Ticket.status, Ticket.priority
+        )
         if conditions:
-            base_query = base_query.where(and_(*conditions))
+            query = query.where(and_(*conditions))
         
-        # Общее количество тикетов
-        total_result = await self.db.execute(base_query)
-        total = total_result.scalar()
+        result = await self.db.execute(query)
+        
+        status_stats = {status.value: 0 for status in TicketStatus}
+        priority_stats = {priority.value: 0 for priority in TicketPriority}
+        for status, priority, count in result.all():
+            status_stats[status.value] += count
+            priority_stats[priority.value] += count
         
-        # Статистика по статусам
-        status_stats = {}
-        for status in TicketStatus:
-            status_query = base_query.where(Ticket.status == status)
-            result = await self.db.execute(status_query)
-            status_stats[status.value] = result.scalar()
-        
-        # Статистика по приоритетам
-        priority_stats = {}
-        for priority in TicketPriority:
-            priority_query = base_query.where(Ticket.priority == priority)
-            result = await self.db.execute(priority_query)
-            priority_stats[priority.value] = result.scalar()
-        
-        return {
-            "total": total,
+        stats = {
+            "total": sum(status_stats.values()),
             "by_status": status_stats,
             "by_priority": priority_stats
-        }
\ No newline at end of file
+        }
+        
+        # Счетчики не разбиты по авторам - потоки доступны только персоналу
+        if user is None or user.role.can_access(UserRole.HELPER):
+            rollups = RollupService(self.db)
+            now = datetime.now(timezone.utc)
+            today = bucket_start(now, "day")
+            
+            stats["today"] = await rollups.get_totals(today, now + timedelta(hours=1))
+            stats["week"] = await rollups.get_totals(today - timedelta(days=6), now + timedelta(hours=1))
+        
+        return stats
@@ -2,16 +2,110 @@
 Сервис для работы с пользователями.
 """
 
+import time
 import uuid
-from typing import Optional, List
+from typing import Optional, List, Dict, FrozenSet, Tuple
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from tikethet.config import get_settings
 from tikethet.models.user import User, UserRole
 from tikethet.schemas.user import UserCreate, UserUpdate
 
 
+class RoleResolver:
+    """
+    Процессный кэш ролей пользователей бота по telegram_id.
+    
+    Администраторы из настроек (ADMIN_TELEGRAM_IDS) разбираются один раз
+    во frozenset, роли из БД кэшируются на ttl секунд. Смена роли или
+    активности в текущем процессе сразу инвалидирует запись, ttl
+    ограничивает устаревание в других процессах.
+    """
+    
+    def __init__(self, ttl: float = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._admin_ids: Optional[FrozenSet[int]] = None
+        self._roles: Dict[int, Tuple[Optional[UserRole], float]] = {}
+    
+    @property
+    def admin_ids(self) -> FrozenSet[int]:
+        """Telegram ID администраторов из настроек."""
+        if self._admin_ids is None:
+            settings = get_settings()
+            self._admin_ids = frozenset(
+                int(id_str) for id_str in settings.admin_telegram_ids.split(',') if id_str.strip()
+            )
+        return self._admin_ids
+    
+    def invalidate(self, telegram_id: Optional[int] = None) -> None:
+        """
+        Инвалидация роли пользователя (или всего кэша).
+        
+        Args:
+            telegram_id: Telegram ID пользователя, None - все записи
+        """
+        if telegram_id is None:
+            self._roles.clear()
+        else:
+            self._roles.pop(telegram_id, None)
+    
+    async def get_role(self, telegram_id: int, session_factory) -> Optional[UserRole]:
+        """
+        Роль активного пользователя.
+        
+        Args:
+            telegram_id: Telegram ID пользователя
+            session_factory: Фабрика сессий (используется при промахе кэша)
+            
+        Returns:
+            Optional[UserRole]: Роль или None если пользователь не
+                зарегистрирован или деактивирован
+        """
+        now = time.monotonic()
+        cached = self._roles.get(telegram_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        
+        async with session_factory() as session:
+            result = await session.execute(
+                select(User.role).where(
+                    User.telegram_id == telegram_id,
+                    User.is_active == True
+                )
+            )
+            role = result.scalar_one_or_none()
+        
+        if len(self._roles) >= self.max_entries:
+            self._roles = {
+                key: value for key, value in self._roles.items() if value[1] > now
+            }
+        self._roles[telegram_id] = (role, now + self.ttl)
+        
+        return role
+    
+    def is_admin(self, telegram_id: int, role: Optional[UserRole]) -> bool:
+        """
+        Права администратора: ID из настроек или роль ADMIN и выше.
+        
+        Args:
+            telegram_id: Telegram ID пользователя
+            role: Роль из get_role()
+            
+        Returns:
+            bool: True если пользователь - администратор
+        """
+        if telegram_id in self.admin_ids:
+            return True
+        return role is not None and role.can_access(UserRole.ADMIN)
+
+
+# Общий для процесса кэш ролей (middleware бота, сервис пользователей)
+role_resolver = RoleResolver()
+
+
 class UserService:
     """Сервис для управления пользователями."""
     
@@ -137,9 +231,23 @@ class UserService:
         user.role = new_role
         await self.db.commit()
         await self.db.refresh(user)
+        self._after_staff_change(user)
         
         return user
     
+    def _after_staff_change(self, user: User) -> None:
+        """
+        Сброс кэшей, зависящих от роли и активности пользователя.
+        
+        Args:
+            user: Измененный пользователь
+        """
+        # assignment_service импортирует этот модуль - импорт здесь избегает цикла
+        from tikethet.services.assignment_service import assignment_engine
+        
+        role_resolver.invalidate(user.telegram_id)
+        assignment_engine.invalidate()
+    
     async def deactivate_user(self, user: User) -> User:
         """
         Деактивация пользователя.
@@ -153,6 +261,7 @@ class UserService:
         user.is_active = False
         await self.db.commit()
         await self.db.refresh(user)
+        self._after_staff_change(user)
         
         return user
     
@@ -169,6 +278,7 @@ class UserService:
         user.is_active = True
         await self.db.commit()
         await self.db.refresh(user)
+        self._after_staff_change(user)
         
         return user
     
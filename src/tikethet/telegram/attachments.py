@@ -0,0 +1,191 @@
+"""
+Вложения из сообщений бота и отправка сохраненных файлов.
+
+Медиа из сообщения скачивается один раз: повторно присланный файл
+находится по file_unique_id без обращения к Telegram, а скачанные
+данные пишутся на диск по частям и дедуплицируются по SHA-256 (см.
+AttachmentService). При отправке известного файла используется его
+file_id - байты повторно в Telegram не загружаются.
+"""
+
+import logging
+import mimetypes
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import FSInputFile, Message
+
+from tikethet.database import AsyncSessionLocal
+from tikethet.models.stored_file import StoredFile
+from tikethet.services.attachment_service import AttachmentService, UPLOAD_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Предел getFile Bot API: большие файлы бот скачать не может
+TELEGRAM_DOWNLOAD_LIMIT = 20 * 1024 * 1024
+
+# Предел отправки фото (больше - отправляется документом)
+TELEGRAM_PHOTO_LIMIT = 10 * 1024 * 1024
+
+
+@dataclass
+class TelegramMedia:
+    """Файл из сообщения Telegram."""
+
+    file_id: str
+    file_unique_id: str
+    file_size: Optional[int]
+    filename: str
+    content_type: str
+
+
+def extract_media(message: Message) -> Optional[TelegramMedia]:
+    """
+    Файл сообщения: фото (наибольший размер), документ, видео, аудио или голос.
+
+    Args:
+        message: Сообщение Telegram
+
+    Returns:
+        Optional[TelegramMedia]: Файл или None
+    """
+    if message.photo:
+        photo = message.photo[-1]
+        return TelegramMedia(
+            photo.file_id,
+            photo.file_unique_id,
+            photo.file_size,
+            f"photo_{photo.file_unique_id}.jpg",
+            "image/jpeg"
+        )
+
+    for media, default_name in (
+        (message.document, "document"),
+        (message.video, "video.mp4"),
+        (message.audio, "audio.mp3"),
+        (message.voice, "voice.ogg")
+    ):
+        if media:
+            filename = getattr(media, "file_name", None) or default_name
+            return TelegramMedia(
+                media.file_id,
+                media.file_unique_id,
+                media.file_size,
+                filename,
+                media.mime_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            )
+
+    return None
+
+
+async def ingest_media(
+    bot: Bot,
+    media: TelegramMedia,
+    uploaded_by: Optional[uuid.UUID] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Сохранение файла Telegram и данные вложения для сообщения тикета.
+
+    Args:
+        bot: Экземпляр бота
+        media: Файл из сообщения
+        uploaded_by: ID пользователя, приславшего файл
+
+    Returns:
+        Optional[Dict[str, Any]]: Данные вложения или None, если файл
+            больше лимита скачивания
+    """
+    async with AsyncSessionLocal() as session:
+        stored = await AttachmentService(session).get_by_telegram_unique_id(media.file_unique_id)
+
+    if stored is None:
+        if media.file_size and media.file_size > TELEGRAM_DOWNLOAD_LIMIT:
+            logger.info(f"Attachment {media.file_unique_id} skipped: {media.file_size} bytes")
+            return None
+
+        # Сессия берет соединение только при store - не на время скачивания
+        file = await bot.get_file(media.file_id)
+        async with AsyncSessionLocal() as session:
+            service = AttachmentService(session)
+            upload = service.open_upload()
+            try:
+                await bot.download_file(
+                    file.file_path,
+                    destination=upload,
+                    chunk_size=UPLOAD_CHUNK_SIZE,
+                    seek=False
+                )
+            except BaseException:
+                upload.discard()
+                raise
+
+            stored = await service.store(
+                upload,
+                media.filename,
+                media.content_type,
+                telegram_file_id=media.file_id,
+                telegram_file_unique_id=media.file_unique_id,
+                uploaded_by=uploaded_by
+            )
+
+    return AttachmentService.to_attachment(stored, media.filename)
+
+
+async def _send(bot: Bot, chat_id: int, stored: StoredFile, file: Any, caption: str) -> Message:
+    if stored.content_type.startswith("image/") and stored.size <= TELEGRAM_PHOTO_LIMIT:
+        return await bot.send_photo(chat_id=chat_id, photo=file, caption=caption)
+    if stored.content_type.startswith("video/"):
+        return await bot.send_video(chat_id=chat_id, video=file, caption=caption)
+    return await bot.send_document(chat_id=chat_id, document=file, caption=caption)
+
+
+async def send_stored_file(
+    bot: Bot,
+    session_factory,
+    chat_id: int,
+    stored_file_id: uuid.UUID,
+    caption: str
+) -> bool:
+    """
+    Отправка сохраненного файла: по file_id, а без него - загрузкой с диска.
+
+    file_id, полученный после загрузки, запоминается для следующих
+    отправок. Недействительный file_id (или file_id другого типа
+    медиа) заменяется загрузкой файла.
+
+    Args:
+        bot: Экземпляр бота
+        session_factory: Фабрика сессий БД
+        chat_id: Telegram chat ID получателя
+        stored_file_id: ID сохраненного файла
+        caption: Подпись (HTML)
+
+    Returns:
+        bool: False если файл не найден
+    """
+    async with session_factory() as session:
+        service = AttachmentService(session)
+        stored = await service.get(stored_file_id)
+        if stored is None:
+            return False
+        path = service.file_path(stored)
+
+    if stored.telegram_file_id:
+        try:
+            await _send(bot, chat_id, stored, stored.telegram_file_id, caption)
+            return True
+        except TelegramBadRequest as e:
+            logger.info(f"file_id of {stored.sha256[:12]} rejected, uploading: {e}")
+
+    if not path.exists():
+        return False
+
+    sent = await _send(bot, chat_id, stored, FSInputFile(path), caption)
+    media = extract_media(sent)
+    if media is not None:
+        async with session_factory() as session:
+            await AttachmentService(session).remember_file_id(stored.id, media.file_id)
+    return True
@@ -7,6 +7,7 @@
 
 import asyncio
 import logging
+import os
 import sys
 from typing import Optional
 
@@ -18,10 +19,25 @@ from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_applicati
 from aiohttp import web
 
 from tikethet.config import get_settings
-from tikethet.telegram.handlers import commands, webapp, admin
+from tikethet.database import AsyncSessionLocal, engine
+from tikethet.telegram.dispatcher import NotificationDispatcher
+from tikethet.telegram.broadcast import resume_broadcasts_loop
+from tikethet.telegram.handlers import commands, webapp, admin, support
+from tikethet.telegram.leader import run_as_leader
+from tikethet.telegram.middlewares import register_middlewares
+from tikethet.telegram.storage import create_fsm_storage
+from tikethet.telegram.webhook import PooledRequestHandler
 
 logger = logging.getLogger(__name__)
 
+# Обработка webhook: "pool" - подтверждение сразу и пул воркеров,
+# "inline" - обработка внутри запроса Telegram
+WEBHOOK_PROCESSING = os.getenv("WEBHOOK_PROCESSING", "pool")
+
+# Webhook обслуживается FastAPI приложением (telegram/runtime.py),
+# отдельный процесс бота нужен только для polling режима
+BOT_EMBEDDED = os.getenv("BOT_EMBEDDED", "true").lower() in ("1", "true", "yes")
+
 
 async def set_bot_commands(bot: Bot):
     """
@@ -39,6 +55,65 @@ async def set_bot_commands(bot: Bot):
     logger.info("Bot commands configured")
 
 
+def register_background_tasks(dp: Dispatcher) -> None:
+    """
+    Запуск фоновых задач бота: доставка уведомлений из outbox и
+    возобновление прерванных рассылок.
+    
+    Задачи выполняются только в одном процессе (advisory lock, см.
+    telegram/leader.py): лимитер Bot API процессный, и несколько
+    диспетчеров умножили бы общий бюджет бота.
+    
+    Args:
+        dp: Dispatcher, чьи startup/shutdown управляют фоновой задачей
+    """
+    tasks: list[asyncio.Task] = []
+    
+    async def on_startup(bot: Bot) -> None:
+        def jobs() -> list:
+            dispatcher = NotificationDispatcher(bot, AsyncSessionLocal)
+            return [dispatcher.run(), resume_broadcasts_loop(bot, AsyncSessionLocal)]
+        
+        tasks.append(asyncio.create_task(run_as_leader(engine, jobs)))
+    
+    async def on_shutdown() -> None:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        tasks.clear()
+    
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+
+
+def build_dispatcher(dp: Optional[Dispatcher] = None) -> Dispatcher:
+    """
+    Регистрация handlers и фоновых задач бота.
+    
+    Args:
+        dp: Dispatcher (по умолчанию создается новый с постоянным
+            хранилищем FSM)
+        
+    Returns:
+        Dispatcher: Настроенный dispatcher
+    """
+    dp = dp or Dispatcher(storage=create_fsm_storage())
+    
+    async def close_storage() -> None:
+        await dp.storage.close()
+    
+    dp.shutdown.register(close_storage)
+    
+    register_middlewares(dp)
+    commands.register_handlers(dp)
+    webapp.register_handlers(dp)
+    admin.register_handlers(dp)
+    support.register_handlers(dp)
+    register_background_tasks(dp)
+    
+    return dp
+
+
 async def setup_webhook(bot: Bot, settings) -> web.Application:
     """
     Настройка webhook для продакшен режима.
@@ -62,19 +137,21 @@ async def setup_webhook(bot: Bot, settings) -> web.Application:
     app = web.Application()
     
     # Создаем dispatcher
-    dp = Dispatcher()
-    
-    # Регистрируем handlers
-    commands.register_handlers(dp)
-    webapp.register_handlers(dp)
-    admin.register_handlers(dp)
+    dp = build_dispatcher()
     
     # Создаем webhook request handler
-    webhook_requests_handler = SimpleRequestHandler(
-        dispatcher=dp,
-        bot=bot,
-        secret_token=settings.webhook_secret,
-    )
+    if WEBHOOK_PROCESSING == "inline":
+        webhook_requests_handler = SimpleRequestHandler(
+            dispatcher=dp,
+            bot=bot,
+            secret_token=settings.webhook_secret,
+        )
+    else:
+        webhook_requests_handler = PooledRequestHandler(
+            dispatcher=dp,
+            bot=bot,
+            secret_token=settings.webhook_secret,
+        )
     
     # Регистрируем webhook handler
     webhook_requests_handler.register(app, path=settings.webhook_path)
@@ -94,9 +171,7 @@ async def start_polling(bot: Bot, dp: Dispatcher):
         dp: Dispatcher
     """
     # Регистрируем handlers
-    commands.register_handlers(dp)
-    webapp.register_handlers(dp)
-    admin.register_handlers(dp)
+    build_dispatcher(dp)
     
     # Удаляем webhook если был установлен
     await bot.delete_webhook(drop_pending_updates=True)
@@ -143,7 +218,10 @@ async def main():
         # Устанавливаем команды
         await set_bot_commands(bot)
         
-        if settings.webhook_mode:
+        if settings.webhook_mode and BOT_EMBEDDED:
+            # Webhook принимает FastAPI приложение, второй обработчик не нужен
+            logger.info("Webhook mode is served by the API application (BOT_EMBEDDED)")
+        elif settings.webhook_mode:
             # Webhook режим для продакшен
             logger.info("Starting in webhook mode")
             app = await setup_webhook(bot, settings)
@@ -157,7 +235,7 @@ async def main():
         else:
             # Polling режим для разработки
             logger.info("Starting in polling mode")
-            dp = Dispatcher()
+            dp = Dispatcher(storage=create_fsm_storage())
             await start_polling(bot, dp)
             
     except Exception as e:
@@ -0,0 +1,253 @@
+"""
+Исполнитель массовых рассылок бота.
+
+Получатели читаются пакетами по keyset (users.id после контрольной
+точки) в отдельных коротких сессиях - транзакция не висит открытой всю
+рассылку. Каждый пакет отправляется с ограниченной параллельностью
+через общий лимитер (полоса BULK - уведомления по тикетам идут раньше)
+и фиксируется контрольной точкой. Память не зависит от числа получателей, прерванная
+рассылка продолжается с последней контрольной точки. Прогресс,
+скорость и оставшееся время периодически обновляются в чате
+администратора.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Dict, Optional
+
+from aiogram import Bot, html
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from tikethet.models.broadcast import Broadcast, BroadcastStatus
+from tikethet.models.outbox import DeliveryLane
+from tikethet.services.broadcast_service import BroadcastService
+from tikethet.telegram.dispatcher import TelegramRateLimiter, telegram_limiter
+
+logger = logging.getLogger(__name__)
+
+# Одновременных запросов к Bot API на рассылку
+BROADCAST_CONCURRENCY = 16
+
+# Интервал обновления сообщения с прогрессом (секунды)
+PROGRESS_INTERVAL = 5.0
+
+# Попыток на получателя при 429 и сетевых ошибках
+BROADCAST_SEND_ATTEMPTS = 3
+
+# Интервал проверки новых и прерванных рассылок (секунды)
+BROADCAST_POLL_SECONDS = 5.0
+
+# Рассылки, выполняющиеся в текущем процессе
+_active: Dict[uuid.UUID, asyncio.Task] = {}
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} ч {minutes} мин"
+    if minutes:
+        return f"{minutes} мин {seconds} с"
+    return f"{seconds} с"
+
+
+class BroadcastRunner:
+    """Выполнение одной рассылки с контрольными точками."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory,
+        broadcast: Broadcast,
+        limiter: TelegramRateLimiter = telegram_limiter,
+        concurrency: int = BROADCAST_CONCURRENCY
+    ):
+        self.bot = bot
+        self.session_factory = session_factory
+        self.broadcast = broadcast
+        self.limiter = limiter
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._sent = broadcast.sent_count
+        self._failed = broadcast.failed_count
+        self._started = time.monotonic()
+        self._processed_at_start = broadcast.processed
+        self._last_report = 0.0
+
+    async def _send(self, chat_id: int) -> bool:
+        for attempt in range(BROADCAST_SEND_ATTEMPTS):
+            await self.limiter.acquire(chat_id, DeliveryLane.BULK)
+            async with self._semaphore:
+                try:
+                    await self.bot.send_message(
+                        chat_id=chat_id,
+                        text=self.broadcast.text,
+                        disable_web_page_preview=True
+                    )
+                    return True
+                except TelegramRetryAfter as e:
+                    self.limiter.pause(e.retry_after)
+                except TelegramAPIError:
+                    # Бот заблокирован, аккаунт удален и т.п.
+                    return False
+                except (OSError, asyncio.TimeoutError):
+                    await asyncio.sleep(2 ** attempt)
+        return False
+
+    def _progress_text(self, final_status: Optional[str] = None) -> str:
+        processed = self._sent + self._failed
+        total = max(self.broadcast.total, processed)
+        percent = processed * 100 // total if total else 100
+
+        elapsed = time.monotonic() - self._started
+        rate = (processed - self._processed_at_start) / elapsed if elapsed > 0 else 0.0
+
+        if final_status == BroadcastStatus.COMPLETED.value:
+            title = "Рассылка завершена"
+        elif final_status == BroadcastStatus.CANCELLED.value:
+            title = "Рассылка остановлена"
+        else:
+            title = "Рассылка выполняется"
+
+        lines = [
+            html.bold(title),
+            f"Обработано: {processed} из {total} ({percent}%)",
+            f"Доставлено: {self._sent}, ошибок: {self._failed}",
+            f"Скорость: {rate:.1f} сообщ./с",
+        ]
+        if final_status is None and rate > 0:
+            lines.append(f"Осталось: ~{_format_duration((total - processed) / rate)}")
+        else:
+            lines.append(f"Время: {_format_duration(elapsed)}")
+
+        return "\n".join(lines)
+
+    async def _report(self, final_status: Optional[str] = None) -> None:
+        now = time.monotonic()
+        if final_status is None and now - self._last_report < PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+
+        try:
+            if self.broadcast.progress_message_id:
+                await self.bot.edit_message_text(
+                    text=self._progress_text(final_status),
+                    chat_id=self.broadcast.admin_chat_id,
+                    message_id=self.broadcast.progress_message_id
+                )
+            else:
+                message = await self.bot.send_message(
+                    self.broadcast.admin_chat_id, self._progress_text(final_status)
+                )
+                self.broadcast.progress_message_id = message.message_id
+                async with self.session_factory() as session:
+                    await BroadcastService(session).set_progress_message(
+                        self.broadcast.id, message.message_id
+                    )
+        except TelegramAPIError as e:
+            # Отчет вторичен: "message is not modified", удаленное сообщение и т.п.
+            logger.debug(f"Broadcast progress report skipped: {e}")
+
+    async def run(self) -> None:
+        """Отправка оставшимся получателям с контрольной точки."""
+        broadcast_id = self.broadcast.id
+        status = BroadcastStatus.RUNNING.value
+        logger.info(f"Broadcast {broadcast_id} started from checkpoint {self.broadcast.last_user_id}")
+
+        await self._report()
+
+        last_user_id = self.broadcast.last_user_id
+        while True:
+            # Короткая сессия на пакет: соединение не удерживается на время отправки
+            async with self.session_factory() as reader:
+                chunk = await BroadcastService(reader).get_recipients(last_user_id)
+            if not chunk:
+                break
+
+            results = await asyncio.gather(
+                *(self._send(telegram_id) for _, telegram_id in chunk)
+            )
+            sent = sum(results)
+            self._sent += sent
+            self._failed += len(results) - sent
+            last_user_id = chunk[-1][0]
+
+            async with self.session_factory() as writer:
+                status = await BroadcastService(writer).checkpoint(
+                    broadcast_id, last_user_id, sent, len(results) - sent
+                )
+
+            if status != BroadcastStatus.RUNNING.value:
+                break
+
+            await self._report()
+
+        if status == BroadcastStatus.RUNNING.value:
+            async with self.session_factory() as session:
+                await BroadcastService(session).finish(broadcast_id)
+            status = BroadcastStatus.COMPLETED.value
+
+        await self._report(final_status=status)
+        logger.info(
+            f"Broadcast {broadcast_id} {status}: sent {self._sent}, failed {self._failed}"
+        )
+
+
+def start_broadcast(bot: Bot, session_factory, broadcast: Broadcast) -> bool:
+    """
+    Запуск рассылки фоновой задачей процесса.
+
+    Args:
+        bot: Экземпляр бота
+        session_factory: Фабрика асинхронных сессий
+        broadcast: Рассылка (под арендой текущего процесса)
+
+    Returns:
+        bool: False если рассылка уже выполняется в этом процессе
+    """
+    if broadcast.id in _active:
+        return False
+
+    async def run() -> None:
+        try:
+            await BroadcastRunner(bot, session_factory, broadcast).run()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Аренда истечет, и рассылку продолжит resume_broadcasts_loop
+            logger.error(f"Broadcast {broadcast.id} failed: {e}", exc_info=True)
+        finally:
+            _active.pop(broadcast.id, None)
+
+    _active[broadcast.id] = asyncio.create_task(run())
+    return True
+
+
+async def resume_broadcasts_loop(bot: Bot, session_factory) -> None:
+    """
+    Фоновая задача: запуск новых и возобновление прерванных рассылок.
+
+    Выполняется только в ведущем процессе (telegram/leader.py), поэтому
+    рассылки делят лимитер с диспетчером outbox. /broadcast лишь создает
+    строку рассылки.
+
+    Args:
+        bot: Экземпляр бота
+        session_factory: Фабрика асинхронных сессий
+    """
+    try:
+        while True:
+            try:
+                async with session_factory() as session:
+                    broadcasts = await BroadcastService(session).claim_stale()
+                for broadcast in broadcasts:
+                    if start_broadcast(bot, session_factory, broadcast):
+                        logger.info(f"Broadcast {broadcast.id} started at {broadcast.processed}/{broadcast.total}")
+            except Exception as e:
+                logger.error(f"Broadcast resume check failed: {e}", exc_info=True)
+
+            await asyncio.sleep(BROADCAST_POLL_SECONDS)
+    finally:
+        for task in list(_active.values()):
+            task.cancel()
@@ -0,0 +1,300 @@
+"""
+Диспетчер исходящих уведомлений Telegram.
+
+Отправляет сообщения из telegram_outbox с соблюдением лимитов Bot API:
+общий token bucket (~30 сообщений/с на бота) и bucket на каждый чат
+(~1 сообщение/с). Полосы приоритета: критические алерты забираются из
+очереди и получают токены раньше обычных уведомлений и рассылок.
+Ответ 429 (retry-after) приостанавливает всю отправку на указанный срок;
+сообщения, которые не дождались бы отправки до конца аренды, возвращаются
+в очередь неотправленными. Лимитер процессный, поэтому диспетчер
+запускается только в одном процессе (telegram/leader.py).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+
+from tikethet.models.outbox import DeliveryLane, OutboxStatus
+from tikethet.services.outbox_service import (
+    OutboxService, OutboxItem, DeliveryResult, OUTBOX_LEASE_SECONDS, OUTBOX_MAX_ATTEMPTS
+)
+from tikethet.telegram.attachments import send_stored_file
+
+logger = logging.getLogger(__name__)
+
+# Лимиты Telegram Bot API (сообщений в секунду)
+GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+
+# Размер пакета выборки из outbox и число одновременных запросов к API
+DISPATCH_BATCH_SIZE = 30
+DISPATCH_CONCURRENCY = 8
+
+# Пауза при пустой очереди (сообщения добавляют другие процессы)
+DISPATCH_IDLE_SECONDS = 1.0
+
+# Запас времени аренды на запрос к Bot API
+LEASE_SAFETY_SECONDS = 15
+
+# Хранение доставленных сообщений
+OUTBOX_RETENTION = timedelta(days=7)
+
+
+class TokenBucket:
+    """Token bucket: rate токенов в секунду, не более capacity в запасе."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Секунд до появления токена (0 - токен доступен)."""
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def take(self, now: float) -> None:
+        """Списание токена (после delay() == 0)."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class TelegramRateLimiter:
+    """
+    Общий и початовый лимиты с приоритетом полос.
+
+    Общий токен ожидающий более низкой полосы получает только когда нет
+    ожидающих более высоких полос (ожидание лимита своего чата не
+    считается). Проверка и списание выполняются без await между ними,
+    поэтому блокировка в однопоточном цикле событий не нужна.
+    """
+
+    def __init__(self, global_rate: float = GLOBAL_RATE, chat_rate: float = CHAT_RATE):
+        self.chat_rate = chat_rate
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self._chats: Dict[int, TokenBucket] = {}
+        self._waiting = [0] * len(DeliveryLane)
+        self._paused_until = 0.0
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            # Полные (простаивающие) buckets не нужны - не даем словарю расти
+            if len(self._chats) > 10000:
+                now = time.monotonic()
+                self._chats = {
+                    key: value for key, value in self._chats.items() if not value.is_full(now)
+                }
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, 1)
+        return bucket
+
+    def pause(self, seconds: float) -> None:
+        """Приостановка всей отправки (429 retry-after)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @property
+    def paused_until(self) -> float:
+        """Момент (time.monotonic) окончания паузы 429."""
+        return self._paused_until
+
+    async def acquire(
+        self,
+        chat_id: int,
+        lane: DeliveryLane = DeliveryLane.NORMAL,
+        deadline: Optional[float] = None
+    ) -> bool:
+        """
+        Ожидание права на отправку сообщения в чат.
+
+        Args:
+            chat_id: Telegram chat ID
+            lane: Полоса приоритета
+            deadline: Не ждать дольше этого момента (time.monotonic)
+
+        Returns:
+            bool: False если право не получено до deadline
+        """
+        while True:
+            now = time.monotonic()
+            chat_bucket = self._chat_bucket(chat_id)
+
+            # Ожидание своего чата не должно задерживать другие полосы
+            delay = max(self._paused_until - now, chat_bucket.delay(now))
+            if delay > 0:
+                if deadline is not None and now + delay > deadline:
+                    return False
+                await asyncio.sleep(delay)
+                continue
+
+            if not await self._acquire_global(lane, deadline):
+                return False
+
+            # Токен чата мог забрать параллельный отправитель в тот же чат
+            now = time.monotonic()
+            if chat_bucket.delay(now) <= 0:
+                chat_bucket.take(now)
+                return True
+
+            # Возврат общего токена и повторное ожидание чата
+            self.global_bucket.tokens += 1
+
+    async def _acquire_global(self, lane: DeliveryLane, deadline: Optional[float]) -> bool:
+        self._waiting[lane] += 1
+        try:
+            while True:
+                now = time.monotonic()
+                delay = self._paused_until - now
+                if delay <= 0 and any(self._waiting[:lane]):
+                    delay = 1 / self.global_bucket.rate
+                if delay <= 0:
+                    delay = self.global_bucket.delay(now)
+                if delay <= 0:
+                    self.global_bucket.take(now)
+                    return True
+
+                if deadline is not None and now + delay > deadline:
+                    return False
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[lane] -= 1
+
+
+# Общий для процесса лимитер: уведомления и рассылки делят лимит бота
+telegram_limiter = TelegramRateLimiter()
+
+
+class NotificationDispatcher:
+    """Фоновая доставка сообщений из telegram_outbox."""
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory,
+        limiter: Optional[TelegramRateLimiter] = None,
+        batch_size: int = DISPATCH_BATCH_SIZE,
+        concurrency: int = DISPATCH_CONCURRENCY
+    ):
+        self.bot = bot
+        self.session_factory = session_factory
+        self.limiter = limiter or telegram_limiter
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _deliver(self, item: OutboxItem, lease_deadline: float) -> DeliveryResult:
+        # Ожидание дольше аренды (длинный retry-after) привело бы к повторной
+        # выборке строки и дублю: строка возвращается в очередь неотправленной
+        if not await self.limiter.acquire(item.chat_id, DeliveryLane(item.lane), deadline=lease_deadline):
+            delay = max(0.0, self.limiter.paused_until - time.monotonic())
+            return DeliveryResult(
+                item.id,
+                OutboxStatus.PENDING,
+                not_before=datetime.now(timezone.utc) + timedelta(seconds=delay)
+            )
+
+        async with self._semaphore:
+            try:
+                sent = False
+                if item.stored_file_id is not None:
+                    sent = await send_stored_file(
+                        self.bot, self.session_factory, item.chat_id, item.stored_file_id, item.text
+                    )
+                if not sent:
+                    await self.bot.send_message(
+                        chat_id=item.chat_id,
+                        text=item.text,
+                        disable_web_page_preview=True
+                    )
+                return DeliveryResult(item.id, OutboxStatus.SENT)
+            except TelegramRetryAfter as e:
+                self.limiter.pause(e.retry_after)
+                logger.warning(f"Telegram flood control: retry after {e.retry_after}s")
+                return DeliveryResult(
+                    item.id,
+                    OutboxStatus.PENDING,
+                    not_before=datetime.now(timezone.utc) + timedelta(seconds=e.retry_after),
+                    error=str(e)
+                )
+            except (TelegramForbiddenError, TelegramBadRequest) as e:
+                # Бот заблокирован, чат не найден, неверная разметка - повтор бесполезен
+                return DeliveryResult(item.id, OutboxStatus.FAILED, error=str(e))
+            except (TelegramAPIError, OSError, asyncio.TimeoutError) as e:
+                if item.attempts >= OUTBOX_MAX_ATTEMPTS:
+                    return DeliveryResult(item.id, OutboxStatus.FAILED, error=str(e))
+                return DeliveryResult(
+                    item.id,
+                    OutboxStatus.PENDING,
+                    not_before=datetime.now(timezone.utc) + timedelta(seconds=2 ** item.attempts),
+                    error=str(e)
+                )
+
+    async def dispatch_batch(self) -> int:
+        """
+        Отправка одного пакета готовых сообщений.
+
+        Returns:
+            int: Количество забранных сообщений
+        """
+        async with self.session_factory() as session:
+            items = await OutboxService(session).claim_due(self.batch_size)
+
+        if not items:
+            return 0
+
+        # Запас до конца аренды на сам запрос к Bot API
+        lease_deadline = time.monotonic() + OUTBOX_LEASE_SECONDS - LEASE_SAFETY_SECONDS
+        results: List[DeliveryResult] = await asyncio.gather(
+            *(self._deliver(item, lease_deadline) for item in items)
+        )
+
+        async with self.session_factory() as session:
+            await OutboxService(session).complete(results)
+
+        failed = sum(1 for result in results if result.status == OutboxStatus.FAILED)
+        if failed:
+            logger.warning(f"Outbox batch: {failed} of {len(items)} messages failed permanently")
+
+        return len(items)
+
+    async def run(self) -> None:
+        """Фоновая задача: выборка и отправка пакетов, очистка истории."""
+        logger.info("Notification dispatcher started")
+        next_purge = 0.0
+
+        while True:
+            try:
+                if time.monotonic() >= next_purge:
+                    async with self.session_factory() as session:
+                        purged = await OutboxService(session).purge(OUTBOX_RETENTION)
+                    if purged:
+                        logger.info(f"Outbox purged: {purged} delivered messages")
+                    next_purge = time.monotonic() + 3600
+
+                if await self.dispatch_batch():
+                    continue
+            except Exception as e:
+                logger.error(f"Notification dispatch failed: {e}", exc_info=True)
+
+            await asyncio.sleep(DISPATCH_IDLE_SECONDS)
@@ -8,35 +8,24 @@ import logging
 from typing import List
 
 from aiogram import Dispatcher, Router, html
-from aiogram.filters import Command
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command, CommandObject
 from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.types import WebAppInfo
 
 from tikethet.config import get_settings
+from tikethet.database import AsyncSessionLocal
+from tikethet.models.ticket import TicketStatus
+from tikethet.services.dashboard_service import dashboard_cache
+from tikethet.services.user_service import UserService
+from tikethet.services.broadcast_service import BroadcastService
 
 logger = logging.getLogger(__name__)
 router = Router()
 
 
-async def is_admin_user(user_id: int) -> bool:
-    """
-    Проверка, является ли пользователь администратором.
-    
-    Args:
-        user_id: Telegram ID пользователя
-        
-    Returns:
-        bool: True если пользователь - администратор
-    """
-    # TODO: Интеграция с API для проверки роли пользователя
-    # Пока что проверяем через настройки
-    settings = get_settings()
-    admin_ids = [int(id_str) for id_str in settings.admin_telegram_ids.split(',') if id_str.strip()]
-    return user_id in admin_ids
-
-
 @router.message(Command("admin"))
-async def command_admin_handler(message: Message) -> None:
+async def command_admin_handler(message: Message, is_admin: bool) -> None:
     """
     Обработчик команды /admin.
     
@@ -46,8 +35,8 @@ async def command_admin_handler(message: Message) -> None:
     if not user:
         return
     
-    # Проверяем права администратора
-    if not await is_admin_user(user.id):
+    # Права определяет RoleMiddleware (настройки + роль в БД)
+    if not is_admin:
         await message.answer("У вас нет прав для выполнения этой команды.")
         return
     
@@ -100,35 +89,50 @@ async def command_admin_handler(message: Message) -> None:
 
 
 @router.message(Command("stats"))
-async def command_stats_handler(message: Message) -> None:
+async def command_stats_handler(message: Message, is_admin: bool) -> None:
     """
     Обработчик команды /stats.
     
     Показывает статистику по тикетам.
     """
     user = message.from_user
-    if not user or not await is_admin_user(user.id):
+    if not user or not is_admin:
         await message.answer("У вас нет прав для выполнения этой команды.")
         return
     
-    # TODO: Интеграция с API для получения статистики
+    # Сводка собирается из агрегатов (счетчики, metrics_summary, нагрузка)
+    # и кэшируется на несколько секунд
+    async with AsyncSessionLocal() as session:
+        stats = await dashboard_cache.get(session)
+    
+    today = stats.today
+    week = stats.week
+    in_progress = stats.by_status[TicketStatus.IN_PROGRESS.value]
+    
+    if stats.resolution_hours_avg is None:
+        resolution = "нет данных"
+    else:
+        resolution = f"{stats.resolution_hours_avg:.1f} ч (за {stats.resolution_window_days} дн.)"
     
     stats_text = f"""
 {html.bold("Статистика системы тикетов")}
 
 {html.code("За сегодня:")}
-• Новых тикетов: 0
-• Решенных: 0
-• В работе: 0
+• Новых тикетов: {today["created"]}
+• Решенных: {today["resolved"]}
+• Закрытых: {today["closed"]}
+• В работе: {in_progress}
 
 {html.code("За неделю:")}
-• Всего тикетов: 0
-• Среднее время решения: 0 ч
-• Удовлетворенность: 0%
+• Всего тикетов: {week["created"]}
+• Решенных: {week["resolved"]}
+• Среднее время решения: {resolution}
 
 {html.code("Персонал:")}
-• Активных помощников: 0
-• Средняя нагрузка: 0 тикетов
+• Активных помощников: {stats.staff.busy} из {stats.staff.staff}
+• Средняя нагрузка: {stats.staff.average_load:.1f} тикетов
+
+Обновлено: {stats.computed_at:%H:%M} UTC
 
 Для подробной аналитики используйте веб-панель.
 """
@@ -151,14 +155,14 @@ async def command_stats_handler(message: Message) -> None:
 
 
 @router.message(Command("role"))
-async def command_role_handler(message: Message) -> None:
+async def command_role_handler(message: Message, is_admin: bool) -> None:
     """
     Обработчик команды /role для назначения ролей пользователям.
     
     Формат: /role @username ROLE
     """
     user = message.from_user
-    if not user or not await is_admin_user(user.id):
+    if not user or not is_admin:
         await message.answer("У вас нет прав для выполнения этой команды.")
         return
     
@@ -196,30 +200,63 @@ async def command_role_handler(message: Message) -> None:
 
 
 @router.message(Command("broadcast"))
-async def command_broadcast_handler(message: Message) -> None:
+async def command_broadcast_handler(message: Message, command: CommandObject, is_admin: bool) -> None:
     """
     Обработчик команды /broadcast для массовой рассылки.
     
+    Формат: /broadcast текст (HTML) или /broadcast stop.
     Только для администраторов высшего уровня.
     """
     user = message.from_user
-    if not user or not await is_admin_user(user.id):
+    if not user or not is_admin:
         await message.answer("У вас нет прав для выполнения этой команды.")
         return
     
-    # TODO: Реализовать массовую рассылку
+    text = (command.args or "").strip()
     
-    await message.answer(
-        "Функция массовой рассылки в разработке.\n"
-        "Используйте веб-панель для отправки уведомлений."
-    )
+    if not text:
+        await message.answer(
+            f"{html.bold('Массовая рассылка')}\n\n"
+            f"/broadcast текст - отправить всем активным пользователям\n"
+            f"/broadcast stop - остановить выполняющиеся рассылки"
+        )
+        return
+    
+    if text.lower() == "stop":
+        async with AsyncSessionLocal() as session:
+            cancelled = await BroadcastService(session).cancel_running()
+        await message.answer(f"Остановлено рассылок: {cancelled}")
+        return
+    
+    # Предпросмотр проверяет разметку до отправки всем получателям
+    try:
+        await message.answer(text)
+    except TelegramBadRequest as e:
+        await message.answer(f"Ошибка разметки сообщения: {html.quote(str(e))}")
+        return
+    
+    async with AsyncSessionLocal() as session:
+        admin = await UserService(session).get_user_by_telegram_id(user.id)
+        broadcast = await BroadcastService(session).create(
+            text=text,
+            admin_chat_id=message.chat.id,
+            created_by=admin
+        )
+    
+    # Рассылку выполняет ведущий процесс (общий лимитер Bot API), он
+    # подхватит ее в resume_broadcasts_loop и пришлет прогресс в этот чат
+    logger.info(f"Broadcast {broadcast.id} queued by {user.id} for {broadcast.total} users")
 
 
 # Callback handlers для административных функций
 
 @router.callback_query(lambda c: c.data and c.data == "admin_stats")
-async def callback_admin_stats(callback_query) -> None:
+async def callback_admin_stats(callback_query, is_admin: bool) -> None:
     """Callback для просмотра статистики."""
+    if not is_admin:
+        await callback_query.answer("Недостаточно прав", show_alert=True)
+        return
+    
     settings = get_settings()
     
     keyboard = InlineKeyboardMarkup(
@@ -241,8 +278,12 @@ async def callback_admin_stats(callback_query) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data == "admin_users")
-async def callback_admin_users(callback_query) -> None:
+async def callback_admin_users(callback_query, is_admin: bool) -> None:
     """Callback для управления пользователями."""
+    if not is_admin:
+        await callback_query.answer("Недостаточно прав", show_alert=True)
+        return
+    
     settings = get_settings()
     
     keyboard = InlineKeyboardMarkup(
@@ -264,8 +305,12 @@ async def callback_admin_users(callback_query) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data == "admin_roles")
-async def callback_admin_roles(callback_query) -> None:
+async def callback_admin_roles(callback_query, is_admin: bool) -> None:
     """Callback для управления ролями."""
+    if not is_admin:
+        await callback_query.answer("Недостаточно прав", show_alert=True)
+        return
+    
     settings = get_settings()
     
     keyboard = InlineKeyboardMarkup(
@@ -287,8 +332,12 @@ async def callback_admin_roles(callback_query) -> None:
 
 
 @router.callback_query(lambda c: c.data and c.data == "detailed_stats")
-async def callback_detailed_stats(callback_query) -> None:
+async def callback_detailed_stats(callback_query, is_admin: bool) -> None:
     """Callback для подробной статистики."""
+    if not is_admin:
+        await callback_query.answer("Недостаточно прав", show_alert=True)
+        return
+    
     settings = get_settings()
     
     keyboard = InlineKeyboardMarkup(
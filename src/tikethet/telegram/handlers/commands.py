@@ -11,6 +11,9 @@ from aiogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.types import WebAppInfo
 
 from tikethet.config import get_settings
+from tikethet.database import AsyncSessionLocal
+from tikethet.services.summary_service import ticket_summary_cache
+from tikethet.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -173,8 +176,15 @@ async def command_status_handler(message: Message) -> None:
     if not user:
         return
     
-    # TODO: Интеграция с API для получения статуса тикетов
-    # Пока что заглушка
+    # Счетчики берутся из кэша сводок, который обновляют переходы тикетов
+    async with AsyncSessionLocal() as session:
+        db_user = await UserService(session).get_user_by_telegram_id(user.id)
+        if db_user is None:
+            await message.answer(
+                "У вас пока нет тикетов. Откройте Mini App через /tickets, чтобы создать первый."
+            )
+            return
+        summary = await ticket_summary_cache.get(session, db_user.id)
     
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
@@ -190,9 +200,9 @@ async def command_status_handler(message: Message) -> None:
     status_text = f"""
 {html.bold("Статус ваших тикетов")}
 
-{html.code("Активные тикеты:")} Загружается...
-{html.code("В ожидании ответа:")} Загружается...
-{html.code("Решенные сегодня:")} Загружается...
+{html.code("Активные тикеты:")} {summary.active}
+{html.code("В ожидании ответа:")} {summary.waiting}
+{html.code("Решенные сегодня:")} {summary.resolved_today}
 
 Для подробного просмотра откройте Mini App.
 """
@@ -0,0 +1,305 @@
+"""
+Быстрое обращение: сообщения бота превращаются в тикет.
+
+После кнопки "Быстрое обращение" первое сообщение пользователя создает
+тикет, а следующие сообщения в течение QUICK_SUPPORT_WINDOW секунд
+дописываются в его описание - серия сообщений дает один тикет, а не N
+строк. Фото, документы, видео и голосовые сообщения серии сохраняются
+вложениями тикета. Ключ tg:<chat_id>:<message_id> делает повторную
+доставку обновления Telegram идемпотентной.
+"""
+
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiogram import Bot, Dispatcher, F, Router, html
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import CallbackQuery, Message, InlineKeyboardMarkup, InlineKeyboardButton
+from aiogram.types import User as TelegramUser
+
+from tikethet.database import AsyncSessionLocal
+from tikethet.models.ticket import Ticket
+from tikethet.schemas.message import MessageCreate
+from tikethet.schemas.ticket import TicketCreate
+from tikethet.schemas.user import UserCreate
+from tikethet.services.category_service import category_cache
+from tikethet.services.message_service import MessageService
+from tikethet.services.ticket_service import TicketService
+from tikethet.services.user_service import UserService
+from tikethet.telegram.attachments import extract_media, ingest_media
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+# Окно объединения сообщений в один тикет (секунды с последнего сообщения)
+QUICK_SUPPORT_WINDOW = float(os.getenv("QUICK_SUPPORT_WINDOW", "60"))
+
+# Сколько последних message_id помнить для отбрасывания повторов
+QUICK_SUPPORT_MERGED_IDS = 50
+
+TITLE_MAX_LENGTH = 100
+
+# Категория быстрых обращений (ID или название) - участвует в маршрутизации
+# по специализациям, как и тикеты из Mini App
+QUICK_SUPPORT_CATEGORY = os.getenv("QUICK_SUPPORT_CATEGORY", "Общие вопросы")
+
+# Текст для сообщения, состоящего только из файла
+ATTACHMENT_PLACEHOLDER = "Вложение"
+
+# Сообщения, которые принимает быстрое обращение
+QUICK_SUPPORT_CONTENT = F.text | F.caption | F.photo | F.document | F.video | F.audio | F.voice
+
+
+class QuickSupport(StatesGroup):
+    """Состояния быстрого обращения."""
+
+    describing = State()
+    collecting = State()
+
+
+def _make_title(text: str) -> str:
+    title = text.strip().split("\n", 1)[0].strip()
+    if len(title) > TITLE_MAX_LENGTH:
+        title = title[:TITLE_MAX_LENGTH - 3] + "..."
+    return title or "Быстрое обращение"
+
+
+def _pick_category(categories: List[Dict[str, Any]], requested: Optional[str]) -> Dict[str, Any]:
+    for wanted in (requested, QUICK_SUPPORT_CATEGORY):
+        key = (wanted or "").strip().lower()
+        if not key:
+            continue
+        for category in categories:
+            if str(category["id"]) == key or category["name"].strip().lower() == key:
+                return category
+
+    logger.warning(
+        f"Quick support: category {QUICK_SUPPORT_CATEGORY!r} not found, "
+        f"using {categories[0]['name']!r} - set QUICK_SUPPORT_CATEGORY"
+    )
+    return categories[0]
+
+
+async def create_quick_ticket(
+    from_user: TelegramUser,
+    external_id: str,
+    text: str,
+    title: Optional[str] = None,
+    category: Optional[str] = None
+) -> Tuple[Optional[Ticket], bool]:
+    """
+    Идемпотентное создание тикета из сообщения бота.
+
+    Категория - запрошенная (название или ID активной категории), иначе
+    QUICK_SUPPORT_CATEGORY.
+
+    Args:
+        from_user: Автор в Telegram
+        external_id: Ключ дедупликации
+        text: Описание проблемы
+        title: Заголовок (по умолчанию - первая строка текста); обрезается
+            до TITLE_MAX_LENGTH
+        category: Название или ID категории
+
+    Returns:
+        Tuple[Optional[Ticket], bool]: (тикет, был_ли_создан); тикет None,
+            если нет ни одной активной категории
+    """
+    async with AsyncSessionLocal() as session:
+        user, _ = await UserService(session).get_or_create_user(UserCreate(
+            telegram_id=from_user.id,
+            username=from_user.username,
+            first_name=from_user.first_name,
+            last_name=from_user.last_name,
+            language_code=from_user.language_code or "ru",
+            is_premium=bool(from_user.is_premium)
+        ))
+
+        categories = await category_cache.get_active(session)
+        if not categories:
+            logger.error("Quick support: no active categories")
+            return None, False
+
+        return await TicketService(session).create_ticket_once(
+            TicketCreate(
+                title=_make_title(title or text),
+                description=text,
+                category_id=_pick_category(categories, category)["id"]
+            ),
+            user,
+            external_id
+        )
+
+
+async def attach_to_ticket(
+    from_user: TelegramUser,
+    ticket_id: uuid.UUID,
+    attachment: Dict[str, Any],
+    text: Optional[str] = None
+) -> bool:
+    """
+    Добавление файла к активному тикету сообщением автора.
+
+    Args:
+        from_user: Автор в Telegram
+        ticket_id: ID тикета
+        attachment: Данные вложения
+        text: Подпись файла
+
+    Returns:
+        bool: False если тикет не найден или уже не активен
+    """
+    async with AsyncSessionLocal() as session:
+        user = await UserService(session).get_user_by_telegram_id(from_user.id)
+        ticket = await TicketService(session).get_ticket_by_id(ticket_id, load_relations=False)
+        if user is None or ticket is None or not ticket.is_active:
+            return False
+
+        await MessageService(session).create_message(
+            ticket,
+            user,
+            MessageCreate(content=text or ATTACHMENT_PLACEHOLDER, attachments=[attachment])
+        )
+    return True
+
+
+def _ticket_keyboard(ticket_id: uuid.UUID) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="Открыть тикет",
+                    callback_data=f"open_ticket_{ticket_id}"
+                )
+            ]
+        ]
+    )
+
+
+@router.callback_query(F.data == "quick_support")
+async def callback_quick_support(callback_query: CallbackQuery, state: FSMContext) -> None:
+    """
+    Callback для быстрого создания тикета поддержки.
+    """
+    await state.set_state(QuickSupport.describing)
+    await callback_query.message.edit_text(
+        text="""
+Опишите вашу проблему в следующем сообщении.
+
+Включите максимум деталей:
+• Что произошло?
+• Когда это случилось?
+• Что вы пытались сделать?
+• Какие сообщения об ошибках видели?
+
+Ваше сообщение будет автоматически преобразовано в тикет поддержки.
+"""
+    )
+    await callback_query.answer()
+
+
+@router.message(QuickSupport.describing, QUICK_SUPPORT_CONTENT)
+async def quick_support_first_message(message: Message, state: FSMContext, bot: Bot) -> None:
+    """
+    Первое сообщение быстрого обращения - создание тикета.
+    """
+    if not message.from_user:
+        return
+
+    text = message.text or message.caption
+    ticket, created = await create_quick_ticket(
+        message.from_user,
+        f"tg:{message.chat.id}:{message.message_id}",
+        text or ATTACHMENT_PLACEHOLDER
+    )
+
+    if ticket is None:
+        await state.clear()
+        await message.answer("Не удалось создать тикет. Попробуйте позже или откройте Mini App.")
+        return
+
+    await state.set_state(QuickSupport.collecting)
+    await state.update_data(
+        ticket_id=str(ticket.id),
+        user_id=str(ticket.user_id),
+        last_at=time.time(),
+        merged=[message.message_id]
+    )
+
+    if created:
+        await message.answer(
+            text=f"Тикет создан: {html.quote(ticket.title)}\n\n"
+                 f"Следующие сообщения серии будут добавлены к его описанию.",
+            reply_markup=_ticket_keyboard(ticket.id)
+        )
+
+    # Повторная доставка не создала тикет - файл уже приложен
+    media = extract_media(message)
+    if created and media is not None:
+        attachment = await ingest_media(bot, media, ticket.user_id)
+        if attachment is not None:
+            await attach_to_ticket(message.from_user, ticket.id, attachment, text)
+
+
+async def _append(ticket_id: uuid.UUID, text: str) -> bool:
+    async with AsyncSessionLocal() as session:
+        return await TicketService(session).append_description(ticket_id, text)
+
+
+@router.message(QuickSupport.collecting, QUICK_SUPPORT_CONTENT)
+async def quick_support_next_message(message: Message, state: FSMContext, bot: Bot) -> None:
+    """
+    Следующие сообщения серии - дополнение описания созданного тикета.
+    """
+    data = await state.get_data()
+    merged = data.get("merged", [])
+
+    # Повторная доставка уже учтенного сообщения
+    if message.message_id in merged:
+        return
+
+    if time.time() - data.get("last_at", 0) > QUICK_SUPPORT_WINDOW:
+        await state.clear()
+        raise SkipHandler()
+
+    ticket_id = uuid.UUID(data["ticket_id"])
+    text = message.text or message.caption
+    media = extract_media(message)
+
+    if media is not None:
+        # Файл с подписью - сообщение тикета, описание не дополняется
+        user_id = data.get("user_id")
+        attachment = await ingest_media(bot, media, uuid.UUID(user_id) if user_id else None)
+        if attachment is not None:
+            appended = await attach_to_ticket(message.from_user, ticket_id, attachment, text)
+        else:
+            appended = await _append(ticket_id, text or f"{ATTACHMENT_PLACEHOLDER}: {media.filename}")
+    else:
+        appended = await _append(ticket_id, text)
+
+    if not appended:
+        # Тикет уже закрыт - серия завершена
+        await state.clear()
+        raise SkipHandler()
+
+    merged.append(message.message_id)
+    await state.update_data(
+        last_at=time.time(),
+        merged=merged[-QUICK_SUPPORT_MERGED_IDS:]
+    )
+
+
+def register_handlers(dp: Dispatcher) -> None:
+    """
+    Регистрация handlers быстрого обращения.
+
+    Args:
+        dp: Dispatcher для регистрации handlers
+    """
+    dp.include_router(router)
+    logger.info("Quick support handlers registered")
@@ -6,12 +6,13 @@ import json
 import logging
 from typing import Optional, Dict, Any
 
-from aiogram import Dispatcher, Router
+from aiogram import Dispatcher, Router, html
 from aiogram.types import Message, CallbackQuery, WebAppData, WebAppInfo
 from aiogram.filters import Filter
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from tikethet.config import get_settings
+from tikethet.telegram.handlers.support import create_quick_ticket
 
 logger = logging.getLogger(__name__)
 router = Router()
@@ -130,16 +131,31 @@ async def handle_support_request(message: Message, data: Dict[str, Any]) -> None
         message: Сообщение от пользователя
         data: Данные запроса поддержки
     """
-    problem_type = data.get("problem_type", "Общий вопрос")
-    description = data.get("description", "")
+    problem_type = str(data.get("problem_type") or "Общий вопрос")
+    description = str(data.get("description") or "")
     
-    # TODO: Интеграция с API для создания тикета
+    if not message.from_user or not description.strip():
+        await message.answer("Опишите проблему, чтобы отправить запрос поддержки.")
+        return
+    
+    # Ключ по сообщению с данными Web App: повтор доставки не создаст дубликат
+    ticket, _ = await create_quick_ticket(
+        message.from_user,
+        f"tg:{message.chat.id}:{message.message_id}",
+        description,
+        title=problem_type,
+        category=problem_type
+    )
+    
+    if ticket is None:
+        await message.answer("Не удалось создать тикет. Попробуйте позже.")
+        return
     
     success_text = f"""
 Запрос поддержки отправлен!
 
-🎯 Тип проблемы: {problem_type}
-📝 Описание: {description[:100]}...
+🎯 Тип проблемы: {html.quote(ticket.title)}
+📝 Описание: {html.quote(ticket.short_description)}
 
 Наша команда ответит в ближайшее время.
 """
@@ -172,27 +188,6 @@ async def callback_create_ticket(callback_query: CallbackQuery) -> None:
     await callback_query.answer()
 
 
-@router.callback_query(lambda c: c.data and c.data.startswith("quick_support"))
-async def callback_quick_support(callback_query: CallbackQuery) -> None:
-    """
-    Callback для быстрого создания тикета поддержки.
-    """
-    await callback_query.message.edit_text(
-        text="""
-Опишите вашу проблему в следующем сообщении.
-
-Включите максимум деталей:
-• Что произошло?
-• Когда это случилось?
-• Что вы пытались сделать?
-• Какие сообщения об ошибках видели?
-
-Ваше сообщение будет автоматически преобразовано в тикет поддержки.
-"""
-    )
-    await callback_query.answer()
-
-
 @router.callback_query(lambda c: c.data and c.data.startswith("open_ticket_"))
 async def callback_open_ticket(callback_query: CallbackQuery) -> None:
     """
@@ -0,0 +1,87 @@
+"""
+Выбор единственного процесса для фоновых задач бота.
+
+Лимит Bot API (~30 сообщений/с) общий для бота, а TelegramRateLimiter
+процессный: диспетчер outbox и рассылки должны работать ровно в одном
+процессе, иначе бюджет умножается на число воркеров API. Процесс
+становится ведущим, захватив advisory lock PostgreSQL на отдельном
+соединении; остальные ждут и перехватывают задачи, когда ведущий
+завершается или теряет соединение.
+
+Тот же механизм с отдельным ключом используют задачи обслуживания БД,
+которые при параллельном запуске в каждом воркере дублировали бы работу.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Ключ advisory lock фоновых задач бота
+LEADER_LOCK_KEY = 7_419_203_001
+
+# Ключ advisory lock задач обслуживания БД (аналитика, архивация)
+MAINTENANCE_LOCK_KEY = 7_419_203_002
+
+# Пауза между попытками захвата блокировки
+LEADER_RETRY_SECONDS = 15.0
+
+# Интервал проверки соединения, удерживающего блокировку
+LEADER_CHECK_SECONDS = 30.0
+
+
+async def _watch_connection(connection: AsyncConnection) -> None:
+    while True:
+        await asyncio.sleep(LEADER_CHECK_SECONDS)
+        await connection.execute(text("SELECT 1"))
+
+
+async def run_as_leader(
+    engine: AsyncEngine,
+    jobs: Callable[[], List[Awaitable[None]]],
+    key: int = LEADER_LOCK_KEY
+) -> None:
+    """
+    Выполнение задач только в процессе, удерживающем блокировку.
+
+    Блокировка сеансовая и живет на соединении в режиме AUTOCOMMIT,
+    поэтому открытой транзакции нет. При потере соединения задачи
+    останавливаются - блокировку к этому моменту может захватить
+    другой процесс. Соединение ведущего закрывается, а не возвращается
+    в пул, чтобы блокировка не осталась на чужом соединении.
+
+    Args:
+        engine: Движок БД
+        jobs: Фабрика корутин фоновых задач (вызывается при каждом захвате)
+        key: Ключ advisory lock группы задач
+    """
+    while True:
+        try:
+            async with engine.connect() as connection:
+                connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                result = await connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": key}
+                )
+                if result.scalar():
+                    logger.info(f"Background jobs {key}: this process is the leader")
+                    tasks = [asyncio.ensure_future(job) for job in jobs()]
+                    watchdog = asyncio.ensure_future(_watch_connection(connection))
+                    try:
+                        await asyncio.wait([watchdog, *tasks], return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        for task in (watchdog, *tasks):
+                            task.cancel()
+                        await asyncio.gather(watchdog, *tasks, return_exceptions=True)
+                        # Закрытие соединения снимает блокировку; в пул оно не вернется
+                        await connection.invalidate()
+                        logger.warning(f"Background jobs {key} stopped, leadership released")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background jobs {key} leadership failed: {e}", exc_info=True)
+
+        await asyncio.sleep(LEADER_RETRY_SECONDS)
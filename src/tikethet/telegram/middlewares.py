@@ -0,0 +1,54 @@
+"""
+Middlewares Telegram бота.
+"""
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject
+
+from tikethet.database import AsyncSessionLocal
+from tikethet.services.user_service import RoleResolver, role_resolver
+
+
+class RoleMiddleware(BaseMiddleware):
+    """
+    Роль пользователя для handlers: user_role и is_admin в данных события.
+
+    Регистрируется как inner middleware, поэтому роль определяется только
+    для событий, нашедших handler, и берется из общего кэша ролей.
+    """
+
+    def __init__(self, resolver: RoleResolver = role_resolver, session_factory=AsyncSessionLocal):
+        self.resolver = resolver
+        self.session_factory = session_factory
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get("event_from_user")
+        role = None
+        is_admin = False
+
+        if user is not None:
+            role = await self.resolver.get_role(user.id, self.session_factory)
+            is_admin = self.resolver.is_admin(user.id, role)
+
+        data["user_role"] = role
+        data["is_admin"] = is_admin
+        return await handler(event, data)
+
+
+def register_middlewares(dp: Dispatcher) -> None:
+    """
+    Подключение middlewares ко всем роутерам dispatcher.
+
+    Args:
+        dp: Dispatcher бота
+    """
+    role_middleware = RoleMiddleware()
+    dp.message.middleware(role_middleware)
+    dp.callback_query.middleware(role_middleware)
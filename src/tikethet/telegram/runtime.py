@@ -0,0 +1,146 @@
+"""
+Bot runtime внутри FastAPI приложения.
+
+В webhook режиме бот работает в процессе API: обновления принимает
+маршрут FastAPI, обрабатывает пул воркеров (telegram/webhook.py).
+Handlers делят с API движок БД, кэши (категории, назначения, SLA) и
+лимитер Telegram, поэтому команды бота отвечают из состояния процесса
+без обращений к API по HTTP. Отдельный процесс run_bot.py остается для
+polling режима разработки.
+
+Порядок обработки по чату, дедупликация update_id и блокировка FSM
+хранилища действуют внутри одного процесса, поэтому встроенный бот
+работает только с одним воркером API. При нескольких воркерах
+(WEB_CONCURRENCY > 1) бот в API не запускается - нужен BOT_EMBEDDED=false
+и отдельный run_bot.py.
+"""
+
+import hmac
+import logging
+import os
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.types import Update
+from fastapi import APIRouter, Request, Response
+
+from tikethet.telegram.bot import BOT_EMBEDDED, build_dispatcher, set_bot_commands
+from tikethet.telegram.webhook import UpdateWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Число воркеров API (gunicorn и uvicorn берут его значением по умолчанию)
+API_WORKERS = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+class BotRuntime:
+    """Бот, dispatcher и пул обработки обновлений процесса API."""
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.bot = Bot(
+            token=settings.telegram_bot_token,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+        )
+        self.dispatcher = build_dispatcher()
+        self.pool = UpdateWorkerPool(self.dispatcher)
+
+    async def start(self) -> None:
+        """Запуск обработки и регистрация webhook в Telegram."""
+        self.pool.start()
+        await self.dispatcher.emit_startup(bot=self.bot)
+
+        webhook_url = f"{self.settings.webhook_url}{self.settings.webhook_path}"
+        await self.bot.set_webhook(
+            url=webhook_url,
+            secret_token=self.settings.webhook_secret
+        )
+        await set_bot_commands(self.bot)
+
+        logger.info(f"Embedded bot started, webhook: {webhook_url}")
+
+    async def stop(self) -> None:
+        """
+        Остановка: обработка принятых обновлений, фоновые задачи, сессия.
+
+        Webhook не удаляется - при перезапуске Telegram копит обновления
+        и доставит их новому процессу.
+        """
+        await self.pool.stop()
+        await self.dispatcher.emit_shutdown(bot=self.bot)
+        await self.bot.session.close()
+
+        logger.info("Embedded bot stopped")
+
+    def verify_secret(self, secret_token: str) -> bool:
+        """Проверка заголовка X-Telegram-Bot-Api-Secret-Token."""
+        if not self.settings.webhook_secret:
+            return True
+        return hmac.compare_digest(secret_token, self.settings.webhook_secret)
+
+    async def feed_webhook(self, payload: dict) -> bool:
+        """
+        Постановка обновления из webhook в пул.
+
+        Args:
+            payload: Тело запроса Telegram
+
+        Returns:
+            bool: False если очереди заполнены
+        """
+        update = Update.model_validate(payload, context={"bot": self.bot})
+        return await self.pool.submit(self.bot, update)
+
+
+def create_webhook_router(runtime: BotRuntime) -> APIRouter:
+    """
+    Маршрут webhook Telegram для FastAPI приложения.
+
+    Args:
+        runtime: Bot runtime процесса
+
+    Returns:
+        APIRouter: Роутер с POST {webhook_path}
+    """
+    router = APIRouter()
+
+    @router.post(runtime.settings.webhook_path, include_in_schema=False)
+    async def telegram_webhook(request: Request) -> Response:
+        secret_token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not runtime.verify_secret(secret_token):
+            return Response(status_code=401)
+
+        if not await runtime.feed_webhook(await request.json()):
+            # Telegram повторит доставку позже
+            return Response(status_code=503)
+
+        return Response(status_code=200)
+
+    return router
+
+
+def create_bot_runtime(settings) -> Optional[BotRuntime]:
+    """
+    Создание bot runtime, если бот должен работать в процессе API.
+
+    Args:
+        settings: Настройки приложения
+
+    Returns:
+        Optional[BotRuntime]: None если токена нет, режим polling,
+            BOT_EMBEDDED выключен или воркеров API больше одного
+    """
+    if not (BOT_EMBEDDED and settings.webhook_mode and settings.telegram_bot_token):
+        return None
+
+    if API_WORKERS > 1:
+        # Обновления одного чата попали бы в разные процессы
+        logger.error(
+            f"Embedded bot disabled: {API_WORKERS} API workers, "
+            "set BOT_EMBEDDED=false and run the bot as a separate process"
+        )
+        return None
+
+    return BotRuntime(settings)
@@ -0,0 +1,171 @@
+"""
+Постоянное хранилище FSM состояний бота.
+
+По умолчанию состояния хранятся в Redis (REDIS_URL): переживают
+перезапуск и общие для всех реплик. Ключ содержит hash tag
+{bot_id:chat_id}, поэтому состояние, данные и блокировка одного чата
+попадают в один слот Redis Cluster, а разные чаты распределяются по
+шардам. Без Redis используется локальный SQLite файл - замена для
+разработки и единственной реплики. В обоих вариантах записи истекают
+через FSM_TTL_SECONDS после последнего изменения.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Время жизни состояния без изменений
+FSM_TTL_SECONDS = int(os.getenv("FSM_TTL_SECONDS", str(24 * 3600)))
+
+# Файл локального хранилища (без Redis)
+FSM_SQLITE_PATH = os.getenv("FSM_SQLITE_PATH", "storage/data/fsm.sqlite3")
+
+# Интервал удаления истекших записей из SQLite
+FSM_CLEANUP_INTERVAL = 600.0
+
+
+class ShardedKeyBuilder(KeyBuilder):
+    """Ключи Redis с hash tag по чату: fsm:{bot_id:chat_id}:...:user_id:destiny:part."""
+
+    def __init__(self, prefix: str = "fsm"):
+        self.prefix = prefix
+
+    def build(self, key: StorageKey, part: Optional[Literal["data", "state", "lock"]] = None) -> str:
+        parts = [self.prefix, f"{{{key.bot_id}:{key.chat_id}}}"]
+        if key.business_connection_id:
+            parts.append(key.business_connection_id)
+        if key.thread_id:
+            parts.append(str(key.thread_id))
+        parts.append(str(key.user_id))
+        parts.append(key.destiny)
+        if part:
+            parts.append(part)
+        return ":".join(parts)
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    FSM хранилище в локальном SQLite файле.
+
+    Состояние и данные ключа хранятся одной строкой с временем
+    истечения. Запросы выполняются в потоке, чтобы не блокировать
+    цикл событий.
+    """
+
+    def __init__(self, path: str = FSM_SQLITE_PATH, ttl: int = FSM_TTL_SECONDS):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.key_builder = DefaultKeyBuilder(with_bot_id=True, with_destiny=True, with_business_connection_id=True)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._next_cleanup = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS fsm ("
+                "key TEXT PRIMARY KEY, state TEXT, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS ix_fsm_expires_at ON fsm (expires_at)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _read(self, key: str) -> tuple:
+        row = self._connect().execute(
+            "SELECT state, data FROM fsm WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None, {}
+        return row[0], json.loads(row[1])
+
+    def _write(self, key: str, state: Optional[str], data: Dict[str, Any]) -> None:
+        connection = self._connect()
+        now = time.time()
+
+        if state is None and not data:
+            connection.execute("DELETE FROM fsm WHERE key = ?", (key,))
+        else:
+            connection.execute(
+                "INSERT INTO fsm (key, state, data, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET state = excluded.state, data = excluded.data, "
+                "expires_at = excluded.expires_at",
+                (key, state, json.dumps(data, ensure_ascii=False), now + self.ttl)
+            )
+
+        if now >= self._next_cleanup:
+            deleted = connection.execute("DELETE FROM fsm WHERE expires_at <= ?", (now,)).rowcount
+            if deleted:
+                logger.debug(f"FSM storage: {deleted} expired states removed")
+            self._next_cleanup = now + FSM_CLEANUP_INTERVAL
+
+        connection.commit()
+
+    async def _update(self, key: StorageKey, **changes) -> None:
+        storage_key = self.key_builder.build(key)
+        async with self._lock:
+            state, data = await asyncio.to_thread(self._read, storage_key)
+            state = changes.get("state", state)
+            data = changes.get("data", data)
+            await asyncio.to_thread(self._write, storage_key, state, data)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._update(key, state=state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        async with self._lock:
+            state, _ = await asyncio.to_thread(self._read, self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self._update(key, data=dict(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        async with self._lock:
+            _, data = await asyncio.to_thread(self._read, self.key_builder.build(key))
+        return data
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._connection is not None:
+                await asyncio.to_thread(self._connection.close)
+                self._connection = None
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Хранилище FSM: Redis при заданном REDIS_URL, иначе SQLite файл.
+
+    Returns:
+        BaseStorage: Хранилище для Dispatcher
+    """
+    if REDIS_URL:
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        ttl = timedelta(seconds=FSM_TTL_SECONDS)
+        logger.info("FSM storage: Redis")
+        return RedisStorage.from_url(
+            REDIS_URL,
+            key_builder=ShardedKeyBuilder(),
+            state_ttl=ttl,
+            data_ttl=ttl
+        )
+
+    logger.info(f"FSM storage: SQLite {FSM_SQLITE_PATH}")
+    return SQLiteStorage()
@@ -0,0 +1,216 @@
+"""
+Конкурентная обработка webhook обновлений Telegram.
+
+Запрос Telegram подтверждается сразу после постановки обновления в
+очередь, обработка выполняется пулом воркеров. Обновления одного чата
+попадают в одну очередь (шард по chat_id) и обрабатываются строго по
+порядку, разные чаты - параллельно. Очереди ограничены: при их
+заполнении запрос ждет место недолго и затем получает 503, чтобы
+Telegram повторил доставку позже (backpressure). Повторы одного
+update_id отбрасываются.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from typing import List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Число воркеров (шардов) и емкость очереди каждого
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "16"))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "100"))
+
+# Сколько запрос webhook ждет место в очереди до ответа 503
+WEBHOOK_ENQUEUE_TIMEOUT = float(os.getenv("WEBHOOK_ENQUEUE_TIMEOUT", "2"))
+
+# Сколько последних update_id помнить для отбрасывания повторов
+WEBHOOK_DEDUP_SIZE = 10000
+
+# Время на обработку принятых обновлений при остановке
+WEBHOOK_DRAIN_TIMEOUT = 10.0
+
+
+def update_shard_key(update: Update) -> int:
+    """
+    Ключ упорядочивания обновления: чат, иначе пользователь, иначе update_id.
+
+    Args:
+        update: Обновление Telegram
+
+    Returns:
+        int: Ключ шарда
+    """
+    try:
+        event = update.event
+    except Exception:
+        return update.update_id
+
+    chat = getattr(event, "chat", None)
+    if chat is None and getattr(event, "message", None) is not None:
+        chat = getattr(event.message, "chat", None)
+    if chat is not None:
+        return chat.id
+
+    user = getattr(event, "from_user", None)
+    if user is not None:
+        return user.id
+
+    return update.update_id
+
+
+class RecentUpdateIds:
+    """Ограниченное множество последних update_id (LRU)."""
+
+    def __init__(self, capacity: int = WEBHOOK_DEDUP_SIZE):
+        self.capacity = capacity
+        self._ids: "OrderedDict[int, None]" = OrderedDict()
+
+    def add(self, update_id: int) -> bool:
+        """
+        Запоминание update_id.
+
+        Returns:
+            bool: False если update_id уже встречался
+        """
+        if update_id in self._ids:
+            return False
+
+        self._ids[update_id] = None
+        if len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
+        return True
+
+    def discard(self, update_id: int) -> None:
+        """Забыть update_id (обновление не принято, Telegram повторит)."""
+        self._ids.pop(update_id, None)
+
+
+class UpdateWorkerPool:
+    """Пул воркеров с шардированием обновлений по чатам."""
+
+    def __init__(
+        self,
+        dispatcher: Dispatcher,
+        workers: int = WEBHOOK_WORKERS,
+        queue_size: int = WEBHOOK_QUEUE_SIZE,
+        enqueue_timeout: float = WEBHOOK_ENQUEUE_TIMEOUT
+    ):
+        self.dispatcher = dispatcher
+        self.enqueue_timeout = enqueue_timeout
+        self._queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._workers: List[asyncio.Task] = []
+        self._recent = RecentUpdateIds()
+
+    @property
+    def pending(self) -> int:
+        """Принятые, но еще не обработанные обновления."""
+        return sum(queue.qsize() for queue in self._queues)
+
+    def start(self) -> None:
+        """Запуск воркеров."""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(queue)) for queue in self._queues
+            ]
+            logger.info(f"Webhook worker pool started: {len(self._workers)} workers")
+
+    async def stop(self, drain_timeout: float = WEBHOOK_DRAIN_TIMEOUT) -> None:
+        """
+        Остановка: обработка уже принятых обновлений, затем отмена воркеров.
+
+        Args:
+            drain_timeout: Максимальное время на обработку очередей
+        """
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)),
+                drain_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Webhook pool stopped with {self.pending} unprocessed updates")
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, bot: Bot, update: Update) -> bool:
+        """
+        Постановка обновления в очередь его чата.
+
+        Args:
+            bot: Бот, получивший обновление
+            update: Обновление
+
+        Returns:
+            bool: False если очередь заполнена (нужно ответить 503)
+        """
+        if not self._recent.add(update.update_id):
+            logger.debug(f"Duplicate update {update.update_id} skipped")
+            return True
+
+        queue = self._queues[hash(update_shard_key(update)) % len(self._queues)]
+        try:
+            await asyncio.wait_for(queue.put((bot, update)), self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self._recent.discard(update.update_id)
+            logger.warning(f"Webhook queue full, update {update.update_id} rejected")
+            return False
+
+        return True
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while True:
+            bot, update = await queue.get()
+            try:
+                await self.dispatcher.feed_update(bot, update)
+            except Exception as e:
+                logger.error(f"Update {update.update_id} handling failed: {e}", exc_info=True)
+            finally:
+                queue.task_done()
+
+
+class PooledRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler: проверка секрета и разбор в запросе, обработка - в пуле.
+
+    Отвечает 200 сразу после постановки в очередь, 503 при переполнении.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, pool: Optional[UpdateWorkerPool] = None, **kwargs):
+        super().__init__(dispatcher=dispatcher, bot=bot, **kwargs)
+        self.pool = pool or UpdateWorkerPool(dispatcher)
+
+    def register(self, app: web.Application, /, path: str, **kwargs) -> None:
+        super().register(app, path=path, **kwargs)
+
+        async def start_pool(_app: web.Application) -> None:
+            self.pool.start()
+
+        app.on_startup.append(start_pool)
+
+    async def close(self) -> None:
+        await self.pool.stop()
+        await super().close()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        bot = await self.resolve_bot(request)
+        if not self.verify_secret(request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), bot):
+            return web.Response(body="Unauthorized", status=401)
+
+        update = Update.model_validate(
+            await request.json(loads=bot.session.json_loads),
+            context={"bot": bot}
+        )
+
+        if not await self.pool.submit(bot, update):
+            return web.Response(body="Busy", status=503)
+
+        return web.json_response({}, dumps=bot.session.json_dumps)